@@ -8,9 +8,10 @@ import pathlib
 import sys
 import os
 from types import ModuleType
+from typing import Dict, List, Optional
 
-from .commands import sim, ip, misc, user, gen
-from .core.root_manager import RootManager
+from .core import daemon
+from .core.plugin_cache import PluginCache, COMMAND_PLUGIN_CACHE_FILE_NAME
 
 #######################################################################################################################
 # User Manual Top
@@ -23,7 +24,7 @@ HELP_TEXT = f"""
              https://mooreio.com - Copyright 2018-2026 Datum Technology Corporation - https://datumtc.ca
 Usage:
   mio [--version] [--help]
-  mio [--wd WD] [--dbg] CMD [OPTIONS]
+  mio [--wd WD] [--dbg] [--rescan] CMD [OPTIONS]
 
 Options:
   -v, --version
@@ -38,9 +39,18 @@ Options:
   --dbg
     Enables tracing outputs from mio.
 
+  --rescan
+    Ignores the IP discovery index and searches all IP locations in full.
+
+  --profile[=OUT]
+    Profiles each phase of the command and writes cProfile (.pstats) and collapsed stack (.collapsed, for flame graphs)
+    dumps to directory OUT (default: .mio/temp/profiles/<command>_<timestamp>).
+
 Full Command List (`mio help CMD` for help on a specific command):
    Help and Shell/Editor Integration
       help           Prints documentation for mio commands
+      serve          Keeps mio loaded in a daemon to speed up subsequent invocations
+      perf           Reports the duration of past mio invocations, per command and phase
       
    Project and Code Management
       init           Creates essential files necessary for new Projects/IPs
@@ -65,7 +75,30 @@ Full Command List (`mio help CMD` for help on a specific command):
 #######################################################################################################################
 TEST_MODE = False
 USER_HOME_PATH = pathlib.Path(os.path.expanduser("~/.mio"))
-root_manager: RootManager
+root_manager: 'RootManager'
+# Top-level options whose value can be passed as a separate argument
+TOP_LEVEL_OPTIONS_WITH_VALUE = ["-C", "--wd"]
+
+# Module (under `mio_client.commands`) defining each built-in command.  Modules are only imported once their command has
+# been selected: their dependencies (simulators, FuseSoC, etc.) are expensive to import.
+COMMAND_MODULES: Dict[str, str] = {
+    "sim"      : "sim",
+    "regr"     : "sim",
+    "list"     : "ip",
+    "package"  : "ip",
+    "publish"  : "ip",
+    "install"  : "ip",
+    "uninstall": "ip",
+    "clean"    : "ip",
+    "help"     : "misc",
+    "dox"      : "misc",
+    "serve"    : "misc",
+    "perf"     : "misc",
+    "login"    : "user",
+    "logout"   : "user",
+    "init"     : "gen",
+    "x"        : "gen",
+}
 
 
 #######################################################################################################################
@@ -74,60 +107,80 @@ root_manager: RootManager
 def main(args=None) -> int:
     """
     Main entry point. Performs the following steps in order:
-    - 1. Create CLI argument parser
-    - 2. Find all commands and register them
-    - 3. Parse CLI arguments
-    - 4. Find the command which matches the parsed arguments
+    - 1. Parse top-level CLI arguments and select the command
+    - 2. Forward to the daemon serving the working directory, if there is one (`mio serve`)
+    - 3. Import the selected command and register it
+    - 4. Parse CLI arguments
     - 5. Create the Root Manage instance
     - 6. Run the command via the Root instance
     :return: Exit code
     """
     global root_manager
-    # 1. Create CLI argument parser
+    if args is None:
+        args = sys.argv[1:]
+    args = attach_profile_option_value(list(args))
+    # 1. Parse top-level CLI arguments and select the command
     try:
-        parser = create_top_level_parser()
-        subparsers = parser.add_subparsers(dest='command', help='Sub-command help')
-        # 2. Find all commands and register them
-        commands = register_all_commands(subparsers)
-        # 3. Parse CLI arguments
-        args = parser.parse_args(args)
+        selection = create_command_selection_parser().parse_args(args)
     except Exception as e:
         print(f"Error during parsing of CLI arguments: {e}", file=sys.stderr)
         return 1
     # Version/Help (--version, --help) commands are handled here
-    if args.version:
+    if selection.version:
         print_version_text()
         return 0
-    if (not args.command) or args.help:
+    if (not selection.command_args) or selection.help:
         print_help_text()
         return 0
-    # 4. Find the command which matches the parsed arguments
-    command = next(
-        (
-            cmd for cmd in commands
-            if cmd.name().lower() == args.command
-        ),
-        None
-    )
-    if not command:
-        print(f"Unknown command '{args.command}' specified.", file=sys.stderr)
-        return 1
+    command_name: str = selection.command_args[0]
      # If we're using a custom Work Directory, ensure it exists
     wd = None
-    if args.wd is None:
+    if selection.wd is None:
         wd = pathlib.Path.cwd()
     else:
         try:
-            wd = pathlib.Path(args.wd).resolve()
+            wd = pathlib.Path(selection.wd).resolve()
         except Exception as e:
             print(f"Invalid path '{wd}' provided as working directory: {e}", file=sys.stderr)
             return 1
+    # 2. Forward to the daemon serving the working directory, if there is one
+    exit_code = forward_to_daemon(command_name, wd, args)
+    if exit_code is not None:
+        return exit_code
+    # 3. Import the selected command and register it
+    try:
+        parser = create_top_level_parser()
+        subparsers = parser.add_subparsers(dest='command', help='Sub-command help')
+        commands = register_selected_commands(command_name, subparsers, wd)
+        command = next(
+            (
+                cmd for cmd in commands
+                if cmd.name().lower() == command_name
+            ),
+            None
+        )
+        if not command:
+            print(f"Unknown command '{command_name}' specified.", file=sys.stderr)
+            return 1
+        # 4. Parse CLI arguments
+        args = parser.parse_args(args)
+    except Exception as e:
+        print(f"Error during parsing of CLI arguments: {e}", file=sys.stderr)
+        return 1
     # 5. Create the Root Manager instance
+    from .core.root_manager import RootManager
     root_manager = RootManager("Moore.io Client Root Manager", wd, TEST_MODE, USER_HOME_PATH)
     command.parsed_cli_arguments = args
     # Enable Moore.io debug output if specified
     if args.dbg:
         root_manager.print_trace = True
+    # Discard the IP discovery index if specified
+    if args.rescan:
+        root_manager.rescan_ip = True
+    # Profile the command's phases if specified
+    if args.profile is not None:
+        from .core.profiler import PhaseProfiler
+        root_manager.profiler = PhaseProfiler(pathlib.Path(args.profile).resolve() if args.profile else None)
     # 6. Run the command via the Root Manager instance
     return root_manager.run(command)
 
@@ -144,24 +197,70 @@ def create_top_level_parser():
     parser.add_argument("-h"   , "--help"   , help="Shows this help message and exits.", action="store_true", default=False, required=False)
     parser.add_argument("-v"   , "--version", help="Prints version and exit."          , action="store_true", default=False, required=False)
     parser.add_argument("--dbg",              help="Enable tracing output."            , action="store_true", default=False, required=False)
+    parser.add_argument("--rescan",           help="Ignore the IP discovery index."    , action="store_true", default=False, required=False)
+    parser.add_argument("--profile",          help="Profile each phase and write the dumps to <path>.", nargs="?", const="", metavar="OUT", required=False)
     parser.add_argument("-C"   , "--wd"     , help="Run as if mio was started in <path> instead of the current working directory.", type=pathlib.Path, required=False)
     return parser
 
-def register_all_commands(subparsers):
+def create_command_selection_parser():
+    """
+    Creates a parser for the top-level CLI arguments which leaves the command and its arguments unparsed.  Top-level
+    options are only recognized before the command: command options can re-use their names (ex: `mio sim -C`).
+    :return: argparse.ArgumentParser object
+    """
+    parser = create_top_level_parser()
+    parser.add_argument("command_args", nargs=argparse.REMAINDER)
+    return parser
+
+def attach_profile_option_value(args: List[str]) -> List[str]:
+    """
+    The value of `--profile` is optional and must be attached (`--profile=OUT`): a bare `--profile` is rewritten to
+    `--profile=` so that the command following it isn't parsed as its value.
+    :param args: CLI arguments
+    :return: CLI arguments, with top-level `--profile` options always carrying a value
+    """
+    args = list(args)
+    index = 0
+    while (index < len(args)) and args[index].startswith("-"):
+        if args[index] == "--profile":
+            args[index] = "--profile="
+        elif args[index] in TOP_LEVEL_OPTIONS_WITH_VALUE:
+            index += 1
+        index += 1
+    return args
+
+def forward_to_daemon(command_name: str, wd: pathlib.Path, args: List[str]) -> Optional[int]:
+    """
+    Runs the invocation in the daemon serving the working directory, if there is one.
+    :param command_name: Name of the selected command
+    :param wd: Working directory
+    :param args: CLI arguments
+    :return: Exit code, or None if the invocation must run in this process
+    """
+    if TEST_MODE or (command_name == "serve") or daemon.in_daemon() or os.environ.get("MIO_NO_DAEMON"):
+        return None
+    return daemon.run_in_daemon(wd, args)
+
+def register_selected_commands(command_name: str, subparsers, wd: pathlib.Path=None):
     """
-    Register all commands to the subparsers.
+    Imports the module defining the selected command and registers its commands to the subparsers.  Custom commands are
+    only searched for if `command_name` is not a built-in command.
+    :param command_name: Name of the selected command
     :param subparsers: An instance of argparse.ArgumentParser that contains the subparsers.
+    :param wd: Working directory, whose Moore.io work directory holds the custom command plugin cache
     :return: A list of registered commands.
     """
     commands = []
-    register_commands(commands, sim.get_commands())
-    register_commands(commands, ip.get_commands())
-    register_commands(commands, misc.get_commands())
-    register_commands(commands, user.get_commands())
-    register_commands(commands, gen.get_commands())
-    # Custom commands from env var
-    custom_cmds = _discover_commands_in_paths("MIO_CUSTOM_COMMANDS")
-    register_commands(commands, custom_cmds)
+    if command_name in COMMAND_MODULES:
+        module = importlib.import_module(f".commands.{COMMAND_MODULES[command_name]}", __package__)
+        register_commands(commands, module.get_commands())
+    else:
+        # Custom commands from env var
+        plugin_cache = None
+        if wd is not None:
+            plugin_cache = PluginCache(wd / ".mio" / COMMAND_PLUGIN_CACHE_FILE_NAME)
+        custom_cmds = _discover_commands_in_paths("MIO_CUSTOM_COMMANDS", command_name, plugin_cache)
+        register_commands(commands, custom_cmds)
     for command in commands:
         command.add_to_subparsers(subparsers)
     return commands
@@ -274,18 +373,23 @@ def _load_module_from_file(mod_name: str, file_path: pathlib.Path) -> ModuleType
         print(f"[mio] Skipping {file_path}: {e}", file=sys.stderr)
     return None
 
-def _discover_commands_in_paths(env_var: str = "MIO_CUSTOM_COMMANDS"):
+def _discover_commands_in_paths(env_var: str = "MIO_CUSTOM_COMMANDS", command_name: str = None,
+                                plugin_cache: PluginCache = None):
     """
     Scan directories from MIO_CUSTOM_COMMANDS for modules exposing get_commands().
 
     Strategy:
       1) If the path looks like a package directory (classic or namespace), import modules by dotted name.
       2) Otherwise, fall back to file-based import.
+
+    With a plugin cache and a command name, modules recorded in the cache are only imported if they provide the
+    command; new and modified modules are always imported (and recorded).
     """
     value = os.getenv(env_var, "") or ""
     cmd_classes = []
     if not value.strip():
         return cmd_classes
+    file_paths = []
 
     for root_str in value.split(os.pathsep):
         root_str = root_str.strip()
@@ -296,6 +400,11 @@ def _discover_commands_in_paths(env_var: str = "MIO_CUSTOM_COMMANDS"):
         is_pkg, sys_entry, pkg_name = _package_importable_root(root)
 
         for pyfile in _iter_python_files(root):
+            file_paths.append(pyfile)
+            if plugin_cache and command_name:
+                plugins = plugin_cache.get(pyfile)
+                if (plugins is not None) and (command_name not in [name.lower() for name, class_name in plugins]):
+                    continue
             mod = None
             if is_pkg and pkg_name:
                 mod = _import_module_dotted(sys_entry, pkg_name, pyfile)
@@ -313,6 +422,17 @@ def _discover_commands_in_paths(env_var: str = "MIO_CUSTOM_COMMANDS"):
                     cmd_classes.extend(cmds)
                 except Exception as e:
                     print(f"[mio] get_commands() failed in {pyfile}: {e}", file=sys.stderr)
+                else:
+                    if plugin_cache:
+                        try:
+                            plugin_cache.set(pyfile, [[cmd.name(), cmd.__name__] for cmd in cmds])
+                        except Exception:
+                            pass
+            elif plugin_cache:
+                plugin_cache.set(pyfile, [])
+    if plugin_cache:
+        plugin_cache.retain(file_paths)
+        plugin_cache.save()
     return cmd_classes
 
 def print_help_text():
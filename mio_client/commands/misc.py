@@ -1,15 +1,16 @@
 # Copyright 2020-2025 Datum Technology Corporation
 # All rights reserved.
 #######################################################################################################################
-from typing import Dict, List
+import importlib
+from typing import Dict, List, Tuple
 
 from ..services.doxygen import DoxygenServiceReport, DoxygenService, DoxygenServiceRequest
 from ..core.ip import IpLocationType, Ip
 from ..core.scheduler import JobScheduler
 from ..core.service import ServiceType
-from . import user, ip, sim, gen
-from ..core.phase import Phase
+from ..core.phase import Phase, get_percentile
 from ..core.command import Command
+from ..core import daemon
 
 
 
@@ -17,7 +18,7 @@ from ..core.command import Command
 # API Entry Point
 #######################################################################################################################
 def get_commands():
-    return [HelpCommand, DoxygenCommand]
+    return [HelpCommand, DoxygenCommand, ServeCommand, PerfCommand]
 
 
 #######################################################################################################################
@@ -35,10 +36,26 @@ Examples:
 
 Reference documentation: https://mooreio-client.rtfd.io//en/latest/commands.html#help"""
 
-ALL_COMMANDS = [
-    "help", "login", "logout", "list", "package", "publish", "install", "uninstall", "clean", "sim", "regr", "dox",
-    "init", "x"
-]
+# Module and variable holding the help text of each command
+HELP_TEXTS: Dict[str, Tuple[str, str]] = {
+    "help"     : ("misc", "HELP_TEXT"),
+    "login"    : ("user", "LOGIN_HELP_TEXT"),
+    "logout"   : ("user", "LOGOUT_HELP_TEXT"),
+    "list"     : ("ip"  , "LIST_HELP_TEXT"),
+    "package"  : ("ip"  , "PACKAGE_HELP_TEXT"),
+    "publish"  : ("ip"  , "PUBLISH_HELP_TEXT"),
+    "install"  : ("ip"  , "INSTALL_HELP_TEXT"),
+    "uninstall": ("ip"  , "UNINSTALL_HELP_TEXT"),
+    "clean"    : ("ip"  , "CLEAN_HELP_TEXT"),
+    "sim"      : ("sim" , "SIM_HELP_TEXT"),
+    "regr"     : ("sim" , "REGR_HELP_TEXT"),
+    "dox"      : ("misc", "DOX_HELP_TEXT"),
+    "init"     : ("gen" , "INIT_HELP_TEXT"),
+    "x"        : ("gen" , "UVMX_HELP_TEXT"),
+    "serve"    : ("misc", "SERVE_HELP_TEXT"),
+    "perf"     : ("misc", "PERF_HELP_TEXT"),
+}
+ALL_COMMANDS = list(HELP_TEXTS.keys())
 
 class HelpCommand(Command):
     @staticmethod
@@ -55,34 +72,10 @@ class HelpCommand(Command):
         phase.end_process = True
 
     def phase_init(self, phase):
-        if self.parsed_cli_arguments.cmd == "help":
-            self.print_text_and_exit(phase, HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "login":
-            self.print_text_and_exit(phase, user.LOGIN_HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "logout":
-            self.print_text_and_exit(phase, user.LOGOUT_HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "list":
-            self.print_text_and_exit(phase, ip.LIST_HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "package":
-            self.print_text_and_exit(phase, ip.PACKAGE_HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "publish":
-            self.print_text_and_exit(phase, ip.PUBLISH_HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "install":
-            self.print_text_and_exit(phase, ip.INSTALL_HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "uninstall":
-            self.print_text_and_exit(phase, ip.UNINSTALL_HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "clean":
-            self.print_text_and_exit(phase, ip.CLEAN_HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "sim":
-            self.print_text_and_exit(phase, sim.SIM_HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "regr":
-            self.print_text_and_exit(phase, sim.REGR_HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "dox":
-            self.print_text_and_exit(phase, DOX_HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "init":
-            self.print_text_and_exit(phase, gen.INIT_HELP_TEXT)
-        if self.parsed_cli_arguments.cmd == "x":
-            self.print_text_and_exit(phase, gen.UVMX_HELP_TEXT)
+        # Only the module documenting the command is imported
+        module_name, text_name = HELP_TEXTS[self.parsed_cli_arguments.cmd]
+        module = importlib.import_module(f".{module_name}", __package__)
+        self.print_text_and_exit(phase, getattr(module, text_name))
 
     @property
     def executes_main_phase(self) -> bool:
@@ -239,3 +232,188 @@ class DoxygenCommand(Command):
                     self.rmh.error(f" * {ip}")
         print(banner)
 
+
+#######################################################################################################################
+# Serve Command
+#######################################################################################################################
+SERVE_HELP_TEXT = """Moore.io Serve Command
+   Runs a daemon that keeps the Moore.io Client loaded for the current directory.  While it runs, `mio` invocations
+   from that directory are forwarded to the daemon over a Unix socket (.mio/mio.sock) and skip the start-up cost of
+   importing the client and parsing configuration and IP files.  Files are re-parsed when they change.
+   Set MIO_NO_DAEMON=1 to bypass a running daemon.
+   
+Usage:
+   mio serve [OPTIONS]
+   
+Options:
+   -t MINUTES, --idle-timeout MINUTES  Stops the daemon after MINUTES without requests (default: 60; 0: never)
+   -s, --stop                          Stops the daemon serving the current directory
+   
+Examples:
+   mio serve &       # Starts a daemon in the background
+   mio serve -t 0 &  # Starts a daemon which never times out
+   mio serve --stop  # Stops the daemon
+
+Reference documentation: https://mooreio-client.rtfd.io/en/latest/commands.html#serve"""
+
+class ServeCommand(Command):
+    def __init__(self):
+        super().__init__()
+        self._daemon: daemon.Daemon = None
+
+    @staticmethod
+    def name() -> str:
+        return "serve"
+
+    @property
+    def daemon(self) -> daemon.Daemon:
+        return self._daemon
+
+    @staticmethod
+    def add_to_subparsers(subparsers):
+        parser_serve = subparsers.add_parser('serve', help=SERVE_HELP_TEXT, add_help=False)
+        parser_serve.add_argument('-t', "--idle-timeout", help='Minutes without requests after which the daemon stops (0: never)', type=float, default=60, required=False)
+        parser_serve.add_argument('-s', "--stop", help='Stops the daemon serving the current directory', action="store_true", default=False, required=False)
+
+    @property
+    def executes_main_phase(self) -> bool:
+        return not self.parsed_cli_arguments.stop
+
+    @property
+    def perform_ip_discovery(self) -> bool:
+        return not self.parsed_cli_arguments.stop
+
+    def needs_authentication(self) -> bool:
+        return False
+
+    def phase_init(self, phase: Phase):
+        if not daemon.is_supported():
+            phase.error = Exception("'mio serve' requires a POSIX operating system")
+        elif self.parsed_cli_arguments.stop:
+            if daemon.stop_daemon(self.rmh.wd):
+                phase.end_process_message = f"Stopped daemon serving '{self.rmh.wd}'"
+            else:
+                phase.end_process_message = f"No daemon is serving '{self.rmh.wd}'"
+            phase.end_process = True
+        else:
+            # Configuration and IP files parsed from here on are kept warm for the daemon's children
+            daemon.enable_warm_file_cache()
+
+    def phase_main(self, phase: Phase):
+        self._daemon = daemon.Daemon(self.rmh, self.parsed_cli_arguments.idle_timeout)
+        try:
+            self.daemon.serve()
+        except Exception as e:
+            phase.error = e
+
+
+#######################################################################################################################
+# Perf Command
+#######################################################################################################################
+PERF_HELP_TEXT = """Moore.io Performance Report Command
+   Prints the duration percentiles of past mio invocations from the current Project, per command and per phase
+   (initialization, configuration loading, discovery, main, report, etc.).  Every invocation records the duration of
+   its phases to .mio/phase_history.jsonl.  Total durations are broken down by mio version to spot regressions across
+   upgrades.  Phases whose last run took more than twice their median are flagged as SLOW.
+   
+Usage:
+   mio perf [OPTIONS]
+   
+Options:
+   -c CMD, --command CMD  Only reports on command CMD
+   -n RUNS, --runs RUNS   Number of most recent runs considered per command (default: 100)
+   
+Examples:
+   mio perf         # Reports on all commands
+   mio perf -c sim  # Reports on the Logic Simulation command only
+
+Reference documentation: https://mooreio-client.rtfd.io/en/latest/commands.html#perf"""
+
+# Phases faster than this (ms, 90th percentile) are left out of the report
+MIN_REPORTED_PHASE_DURATION = 1.0
+# A phase is flagged as slow when its last run took more than SLOW_PHASE_RATIO times its median and at least
+# MIN_SLOW_PHASE_DELTA ms longer
+SLOW_PHASE_RATIO = 2.0
+MIN_SLOW_PHASE_DELTA = 10.0
+
+class PerfCommand(Command):
+    def __init__(self):
+        super().__init__()
+        self._runs: Dict[str, List[Dict]] = {}
+
+    @staticmethod
+    def name() -> str:
+        return "perf"
+
+    @property
+    def runs(self) -> Dict[str, List[Dict]]:
+        """
+        :return: Most recent recorded runs, per command, oldest first.
+        """
+        return self._runs
+
+    @staticmethod
+    def add_to_subparsers(subparsers):
+        parser_perf = subparsers.add_parser('perf', help=PERF_HELP_TEXT, add_help=False)
+        parser_perf.add_argument('-c', "--command", help='Only reports on this command', type=str, required=False)
+        parser_perf.add_argument('-n', "--runs", help='Number of most recent runs considered per command', type=int, default=100, required=False)
+
+    @property
+    def executes_main_phase(self) -> bool:
+        return True
+
+    @property
+    def perform_ip_discovery(self) -> bool:
+        return False
+
+    def needs_authentication(self) -> bool:
+        return False
+
+    def phase_init(self, phase: Phase):
+        if self.parsed_cli_arguments.runs < 1:
+            phase.error = Exception(f"Number of runs must be at least 1: {self.parsed_cli_arguments.runs}")
+
+    def phase_main(self, phase: Phase):
+        try:
+            history = self.rmh.phase_history.load()
+        except Exception as e:
+            phase.error = Exception(f"Failed to load phase history '{self.rmh.phase_history.path}': {e}")
+            return
+        for run in history:
+            command_name = run.get("command")
+            if self.parsed_cli_arguments.command and (command_name != self.parsed_cli_arguments.command):
+                continue
+            self._runs.setdefault(command_name, []).append(run)
+        for command_name in self.runs:
+            self._runs[command_name] = self.runs[command_name][-self.parsed_cli_arguments.runs:]
+
+    def phase_report(self, phase: Phase):
+        if len(self.runs) == 0:
+            self.rmh.info(f"No runs recorded in '{self.rmh.phase_history.path}'")
+            return
+        for command_name in sorted(self.runs):
+            runs = self.runs[command_name]
+            print(f"mio {command_name}: {len(runs)} run(s), last on {runs[-1].get('timestamp')}")
+            print(f"  {'Total (ms)':<44}{'runs':>6}{'p50':>10}{'p90':>10}")
+            versions: Dict[str, List[float]] = {}
+            for run in runs:
+                versions.setdefault(run.get("version"), []).append(run.get("duration", 0))
+            for version, durations in versions.items():
+                print(f"  {'v' + str(version):<44}{len(durations):>6}{get_percentile(durations, 50):>10.1f}"
+                      f"{get_percentile(durations, 90):>10.1f}")
+            phases: Dict[str, List[float]] = {}
+            for run in runs:
+                for phase_name, duration in run.get("phases", {}).items():
+                    phases.setdefault(phase_name, []).append(duration)
+            last_phases: Dict[str, float] = runs[-1].get("phases", {})
+            print(f"  {'Phase (ms)':<44}{'p50':>10}{'p90':>10}{'max':>10}{'last':>10}")
+            for phase_name, durations in phases.items():
+                p50 = get_percentile(durations, 50)
+                p90 = get_percentile(durations, 90)
+                if p90 < MIN_REPORTED_PHASE_DURATION:
+                    continue
+                last = last_phases.get(phase_name)
+                last_text = "-" if last is None else f"{last:.1f}"
+                slow = (last is not None) and (last > SLOW_PHASE_RATIO * p50) and (last - p50 >= MIN_SLOW_PHASE_DELTA)
+                print(f"  {phase_name:<44}{p50:>10.1f}{p90:>10.1f}{max(durations):>10.1f}{last_text:>10}"
+                      f"{'  SLOW' if slow else ''}")
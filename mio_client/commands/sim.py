@@ -65,6 +65,7 @@ Options:
    -c          , --cov                  Enable code & functional coverage capture.
    -g          , --gui                  Invokes simulator in graphical or 'GUI' mode.
    -d DEST     , --dry-run   DEST       Captures simulation command into tarball at DEST instead of invoking simulator.
+                 --scheduler NAME       Job Scheduler to use: sub_process, async_process, ssh, slurm, lsf, sge. [default: see configuration]
    
 Steps:
    -D   Prepare Device-Under-Test (DUT) for logic simulation. Ex: invoke FuseSoC to prepare core(s) for compilation.
@@ -132,6 +133,9 @@ class SimulateCommand(Command):
         parser_sim.add_argument('-d', "--dry-run",
                                 help='Captures simulation command into tarball at DEST instead of invoking simulator.',
                                 required=False)
+        parser_sim.add_argument("--scheduler",
+                                help='Job Scheduler to use (ex: sub_process, slurm).  Default: `scheduling.default_scheduler` from the Configuration.',
+                                required=False)
 
     def __init__(self):
         super().__init__()
@@ -405,8 +409,10 @@ class SimulateCommand(Command):
 
     def phase_post_scheduler_discovery(self, phase: Phase):
         try:
-            # TODO Add support for other schedulers
-            self._scheduler = self.rmh.scheduler_database.get_default_scheduler()
+            if self.parsed_cli_arguments.scheduler:
+                self._scheduler = self.rmh.scheduler_database.find_scheduler(self.parsed_cli_arguments.scheduler)
+            else:
+                self._scheduler = self.rmh.scheduler_database.get_default_scheduler()
         except Exception as e:
             phase.error = e
 
@@ -821,6 +827,7 @@ Usage:
 Options:
    -a, --app      Specifies which simulator to use: dsim, dsimc, vivado.
    -d, --dry-run  Compiles, elaborates, but only prints the tests mio would normally run (does not actually run them).
+       --scheduler  Job Scheduler to use: sub_process, async_process, ssh, slurm, lsf, sge. [default: see configuration]
    
 Examples:
    mio regr my_ip sanity            # Run sanity regression for IP 'uvm_my_ip', from test suite 'ts.yml'
@@ -841,6 +848,7 @@ class RegressionCommand(Command):
         parser_regr.add_argument('regr'       , help='Regression to be run.  For Test Bench IPs with multiple Test Suites, the suite must be specified. Ex: `mio regr my_ip apbxc.sanity`')
         parser_regr.add_argument('-a', "--app", help='Specifies which simulator to use: dsim, dsimc, vivado', choices=REGRESSION_SIMULATORS , required=False)
         parser_regr.add_argument('-d', "--dry", help='Compiles and elaborates target IP but only prints out the tests that would be run.', action="store_true", default=False , required=False)
+        parser_regr.add_argument("--scheduler", help='Job Scheduler to use (ex: sub_process, slurm).  Default: `scheduling.default_scheduler` from the Configuration.', required=False)
 
     def __init__(self):
         super().__init__()
@@ -1077,8 +1085,10 @@ class RegressionCommand(Command):
 
     def phase_post_scheduler_discovery(self, phase: Phase):
         try:
-            # TODO Add support for other schedulers
-            self._scheduler = self.rmh.scheduler_database.get_default_scheduler()
+            if self.parsed_cli_arguments.scheduler:
+                self._scheduler = self.rmh.scheduler_database.find_scheduler(self.parsed_cli_arguments.scheduler)
+            else:
+                self._scheduler = self.rmh.scheduler_database.get_default_scheduler()
         except Exception as e:
             phase.error = e
 
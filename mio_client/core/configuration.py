@@ -1,9 +1,9 @@
 # Copyright 2020-2025 Datum Technology Corporation
 # All rights reserved.
 #######################################################################################################################
-from typing import List, Optional
+from typing import List, Optional, Dict
 
-from pydantic import BaseModel, constr, FilePath, PositiveInt, PositiveFloat, conlist, StrictInt
+from pydantic import BaseModel, constr, FilePath, PositiveInt, PositiveFloat, NonNegativeFloat, conlist, StrictInt
 from .model import Model, VALID_NAME_REGEX, VALID_LOGIC_SIMULATION_TIMESCALE_REGEX, \
     VALID_POSIX_PATH_REGEX, VALID_POSIX_DIR_NAME_REGEX, UNDEFINED_CONST, PosixPathList, PosixPath, PosixDirName
 from enum import Enum
@@ -72,6 +72,7 @@ class LogicSimulation(Model):
     elaboration_timeout: PositiveFloat
     compilation_and_elaboration_timeout: PositiveFloat
     simulation_timeout: PositiveFloat
+    simulation_idle_timeout: Optional[NonNegativeFloat] = 0
     vscode_installation_path: Optional[PosixPath] = UNDEFINED_CONST
     altair_dsim_license_path: Optional[PosixPath] = UNDEFINED_CONST
     altair_dsim_cloud_max_compute_size: Optional[DSimCloudComputeSizes] = DSimCloudComputeSizes.S4
@@ -113,6 +114,20 @@ class Docs(Model):
     doxygen_installation_path: Optional[PosixPath] = UNDEFINED_CONST
 
 
+class Scheduling(Model):
+    default_scheduler: Optional[constr(pattern=VALID_NAME_REGEX)] = "sub_process"
+    batch_poll_interval: Optional[PositiveFloat] = 10
+    slurm_submit_arguments: Optional[List[str]] = []
+    lsf_submit_arguments: Optional[List[str]] = []
+    sge_submit_arguments: Optional[List[str]] = []
+    ssh_hosts: Optional[Dict[str, PositiveInt]] = {}
+    cpu_slots: Optional[PositiveInt] = None
+    memory: Optional[PositiveFloat] = None
+    license_tokens: Optional[Dict[str, PositiveInt]] = {}
+    job_cache: Optional[bool] = False
+    job_cache_max_entries: Optional[PositiveInt] = 16
+
+
 class Encryption(Model):
     altair_dsim_sv_key_path: Optional[PosixPath] = UNDEFINED_CONST
     altair_dsim_vhdl_key_path: Optional[PosixPath] = UNDEFINED_CONST
@@ -133,6 +148,7 @@ class Configuration(Model):
     encryption: Encryption
     authentication: Authentication
     applications: Applications
+    scheduling: Optional[Scheduling] = Scheduling()
 
     def check(self):
         pass
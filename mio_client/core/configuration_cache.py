@@ -0,0 +1,89 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+import os
+import pickle
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .configuration import Configuration
+
+
+#######################################################################################################################
+# Support Types
+#######################################################################################################################
+CACHE_FILE_NAME = "configuration.cache"
+CACHE_FORMAT_VERSION = 1
+SCHEMA_PATH = Path(__file__).parent / "configuration.py"
+
+
+#######################################################################################################################
+# Configuration Cache
+#######################################################################################################################
+class ConfigurationCache:
+    """
+    Stores the merged and validated configuration space under the Moore.io work directory.  Entries are keyed by the
+    client version and by the path, modification time and size of every configuration file as well as of the
+    configuration schema: editing any of them (or creating/deleting an optional one) invalidates the cache.  Hits are
+    unpickled as-is, without going through TOML parsing or pydantic validation.
+    """
+    def __init__(self, path: Path, version: str):
+        self._path: Path = path
+        self._version: str = version
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    @staticmethod
+    def get_stat_key(path: Optional[Path]) -> Optional[Tuple[str, int, int, int]]:
+        if path is None:
+            return None
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return str(path), 0, 0, -1
+        return str(path), file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size
+
+    def get_key(self, source_paths: List[Optional[Path]]) -> tuple:
+        """
+        :param source_paths: Configuration files in merge order.  None for files which do not apply.
+        :return: Key identifying the state of the configuration files.
+        """
+        return (CACHE_FORMAT_VERSION, self.version, self.get_stat_key(SCHEMA_PATH),
+                tuple(self.get_stat_key(path) for path in source_paths))
+
+    def load(self, key: tuple) -> Optional[Configuration]:
+        """
+        :param key: Key returned by `get_key()`.
+        :return: Cached configuration space, or None if there is no valid entry for the key.
+        """
+        try:
+            with open(self.path, "rb") as file:
+                cached_key, configuration = pickle.load(file)
+        except Exception:
+            return None
+        if (cached_key != key) or (not isinstance(configuration, Configuration)):
+            return None
+        return configuration
+
+    def save(self, key: tuple, configuration: Configuration):
+        """
+        Stores a validated configuration space.  Failures are ignored: the cache is only an optimization.
+        :param key: Key returned by `get_key()` before the configuration files were read.
+        :param configuration: Validated configuration space.
+        """
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "wb") as file:
+                pickle.dump((key, configuration), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
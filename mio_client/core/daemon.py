@@ -0,0 +1,432 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+import atexit
+import copy
+import json
+import os
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+#######################################################################################################################
+# Support Types
+#######################################################################################################################
+SOCKET_FILE_NAME = "mio.sock"
+MAX_SOCKET_PATH_LENGTH = 100
+FORWARDED_SIGNALS = [signal.SIGINT, signal.SIGTERM, signal.SIGHUP]
+
+
+def get_socket_path(wd: Path) -> Path:
+    return Path(wd) / ".mio" / SOCKET_FILE_NAME
+
+
+def is_supported() -> bool:
+    return hasattr(socket, "AF_UNIX") and hasattr(socket, "send_fds") and hasattr(os, "fork")
+
+
+#######################################################################################################################
+# Warm File Cache
+#######################################################################################################################
+class WarmFileCache:
+    """
+    Keeps parsed files in memory for the lifetime of a `mio serve` daemon.  Entries are checked against the file's
+    modification time and size on every lookup: callers always get the current contents, and only pay for parsing when
+    the file has changed.  Values are deep-copied on the way out as callers are free to modify them.
+    """
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int], Callable[[str], Any], Any]] = {}
+        self._directories: Dict[Tuple[str, str], Callable[[str], Any]] = {}
+
+    @property
+    def num_entries(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def get_stat_key(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return None
+        return file_stat.st_mtime_ns, file_stat.st_size
+
+    def load(self, path: Path, loader: Callable[[str], Any]) -> Any:
+        path = os.path.abspath(path)
+        entry = self._entries.get(path)
+        # The file is stat'ed before it is read: if it changes in-between, the next lookup will reload it
+        stat_key = self.get_stat_key(path)
+        if (entry is None) or (stat_key is None) or (entry[0] != stat_key) or (entry[1] != loader):
+            value = loader(path)
+            if stat_key is not None:
+                self._entries[path] = (stat_key, loader, value)
+        else:
+            value = entry[2]
+        return copy.deepcopy(value)
+
+    def track_directory(self, path: Path, file_name: str, loader: Callable[[str], Any]):
+        """
+        Registers a directory whose files named `file_name` are loaded ahead of time by refresh().
+        """
+        self._directories[(os.path.abspath(path), file_name)] = loader
+
+    def refresh(self):
+        """
+        Reloads changed files, forgets deleted ones and loads files added to tracked directories.  Loading errors are
+        ignored: they are reported to whoever loads the file next.
+        """
+        for path, (stat_key, loader, value) in list(self._entries.items()):
+            new_stat_key = self.get_stat_key(path)
+            if new_stat_key is None:
+                del self._entries[path]
+            elif new_stat_key != stat_key:
+                self.preload(path, loader)
+        for (directory, file_name), loader in list(self._directories.items()):
+            for root, dirs, files in os.walk(directory):
+                if file_name in files:
+                    path = os.path.join(root, file_name)
+                    if path not in self._entries:
+                        self.preload(path, loader)
+
+    def preload(self, path: str, loader: Callable[[str], Any]):
+        try:
+            stat_key = self.get_stat_key(path)
+            self._entries[path] = (stat_key, loader, loader(path))
+        except Exception:
+            self._entries.pop(path, None)
+
+
+# Only set in `mio serve` daemons: regular invocations parse files directly
+warm_file_cache: Optional[WarmFileCache] = None
+
+
+def enable_warm_file_cache() -> WarmFileCache:
+    global warm_file_cache
+    if warm_file_cache is None:
+        warm_file_cache = WarmFileCache()
+    return warm_file_cache
+
+
+def in_daemon() -> bool:
+    return warm_file_cache is not None
+
+
+def load_file(path: Path, loader: Callable[[str], Any]) -> Any:
+    if warm_file_cache is None:
+        return loader(str(path))
+    return warm_file_cache.load(path, loader)
+
+
+def track_directory(path: Path, file_name: str, loader: Callable[[str], Any]):
+    if warm_file_cache is not None:
+        warm_file_cache.track_directory(path, file_name, loader)
+
+
+#######################################################################################################################
+# Channel
+#######################################################################################################################
+class DaemonChannel:
+    """
+    Newline-delimited JSON messages over a Unix socket.  File descriptors can be attached to a message.
+    """
+    def __init__(self, sock: socket.socket):
+        self._socket: socket.socket = sock
+        self._buffer: bytearray = bytearray()
+
+    @property
+    def socket(self) -> socket.socket:
+        return self._socket
+
+    def send(self, message: Dict, fds: List[int]=None):
+        data: bytes = (json.dumps(message) + "\n").encode()
+        if fds:
+            num_bytes_sent: int = socket.send_fds(self._socket, [data], fds)
+            data = data[num_bytes_sent:]
+        if data:
+            self._socket.sendall(data)
+
+    def receive(self, max_fds: int=0) -> Tuple[Optional[Dict], List[int]]:
+        """
+        Returns the next message and the file descriptors that came with it, or None once the peer has hung up.
+        """
+        fds: List[int] = []
+        while b"\n" not in self._buffer:
+            if max_fds and not fds:
+                data, fds, flags, address = socket.recv_fds(self._socket, 64 * 1024, max_fds)
+            else:
+                data = self._socket.recv(64 * 1024)
+            if not data:
+                for fd in fds:
+                    os.close(fd)
+                return None, []
+            self._buffer += data
+        line, _, remainder = self._buffer.partition(b"\n")
+        self._buffer = bytearray(remainder)
+        return json.loads(line), fds
+
+    def close(self):
+        self._socket.close()
+
+
+#######################################################################################################################
+# Daemon
+#######################################################################################################################
+class Daemon:
+    """
+    Serves `mio` invocations for a single working directory.  The daemon imports the client once and keeps parsed
+    configuration and IP definition files warm; each request is run by a forked child which is handed the client's
+    stdin/stdout/stderr, working directory and environment, and whose exit code is sent back to the client.
+    """
+    poll_interval: float = 1
+
+    def __init__(self, rmh: 'RootManager', idle_timeout: float=60):
+        self._rmh: 'RootManager' = rmh
+        self._socket_path: Path = get_socket_path(rmh.wd)
+        self._idle_timeout: float = idle_timeout
+        self._server: socket.socket = None
+        self._socket_inode: int = 0
+        self._children: Set[int] = set()
+        self._stop_requested: bool = False
+        self._num_requests: int = 0
+
+    @property
+    def rmh(self) -> 'RootManager':
+        return self._rmh
+
+    @property
+    def socket_path(self) -> Path:
+        return self._socket_path
+
+    @property
+    def idle_timeout(self) -> float:
+        """
+        Minutes without requests after which the daemon stops.  0 means never.
+        """
+        return self._idle_timeout
+
+    @property
+    def num_requests(self) -> int:
+        return self._num_requests
+
+    def bind(self):
+        if len(str(self.socket_path)) > MAX_SOCKET_PATH_LENGTH:
+            raise Exception(f"Path to daemon socket '{self.socket_path}' is too long for a Unix socket")
+        if self.socket_path.exists():
+            if is_daemon_running(self.rmh.wd):
+                raise Exception(f"A daemon is already serving '{self.rmh.wd}'")
+            self.socket_path.unlink()
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        previous_umask = os.umask(0o077)
+        try:
+            self._server.bind(str(self.socket_path))
+        finally:
+            os.umask(previous_umask)
+        self._server.listen(64)
+        self._socket_inode = self.socket_path.stat().st_ino
+
+    def unbind(self):
+        if self._server:
+            self._server.close()
+            self._server = None
+        try:
+            # Another daemon may have replaced a socket that was deleted from under us
+            if self.socket_path.stat().st_ino == self._socket_inode:
+                self.socket_path.unlink()
+        except OSError:
+            pass
+
+    def request_stop(self, signum=None, frame=None):
+        self._stop_requested = True
+
+    def serve(self):
+        self.bind()
+        previous_handlers = {signum: signal.signal(signum, self.request_stop) for signum in [signal.SIGTERM, signal.SIGINT]}
+        self.rmh.info(f"Serving '{self.rmh.wd}' on '{self.socket_path}' (PID {os.getpid()})")
+        last_activity: float = time.monotonic()
+        try:
+            while not self._stop_requested:
+                self.reap_children()
+                if self._children:
+                    last_activity = time.monotonic()
+                elif self.idle_timeout and ((time.monotonic() - last_activity) > (self.idle_timeout * 60)):
+                    self.rmh.info(f"No requests in {self.idle_timeout} minute(s): stopping")
+                    break
+                try:
+                    readable, _, _ = select.select([self._server], [], [], self.poll_interval)
+                except InterruptedError:
+                    continue
+                if readable:
+                    connection, _ = self._server.accept()
+                    self.handle(DaemonChannel(connection))
+                    last_activity = time.monotonic()
+        finally:
+            self.unbind()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            self.reap_children()
+
+    def reap_children(self):
+        for pid in list(self._children):
+            try:
+                finished_pid, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                finished_pid = pid
+            if finished_pid:
+                self._children.discard(pid)
+
+    def handle(self, channel: DaemonChannel):
+        try:
+            message, fds = channel.receive(max_fds=3)
+        except Exception as e:
+            self.rmh.warning(f"Ignoring malformed daemon request: {e}")
+            channel.close()
+            return
+        if message is None:
+            channel.close()
+            return
+        if message.get("stop"):
+            channel.send({"pid": os.getpid()})
+            channel.close()
+            self.request_stop()
+            return
+        if message.get("ping"):
+            channel.send({"pid": os.getpid(), "num_requests": self.num_requests})
+            channel.close()
+            return
+        self._num_requests += 1
+        pid = os.fork()
+        if pid == 0:
+            self.run_request(channel, message, fds)
+        for fd in fds:
+            os.close(fd)
+        channel.close()
+        self._children.add(pid)
+        # Picks up edits while the child runs, so that the next request finds them already parsed
+        if warm_file_cache:
+            warm_file_cache.refresh()
+
+    def run_request(self, channel: DaemonChannel, message: Dict, fds: List[int]):
+        """
+        Runs in the forked child: takes over the client's standard streams and runs the CLI.  Never returns.
+        """
+        exit_code: int = 1
+        try:
+            self._server.close()
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            for target_fd, fd in enumerate(fds[:3]):
+                os.dup2(fd, target_fd)
+                if fd > 2:
+                    os.close(fd)
+            sys.stdin = open(0, "r", closefd=False)
+            sys.stdout = open(1, "w", buffering=1, closefd=False)
+            sys.stderr = open(2, "w", buffering=1, closefd=False)
+            os.chdir(message["cwd"])
+            os.environ.clear()
+            os.environ.update(message["env"])
+            channel.send({"pid": os.getpid()})
+            # Exit handlers registered by the daemon itself must not run in its children
+            atexit._clear()
+            from .. import cli
+            exit_code = cli.main(message["args"])
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            try:
+                atexit._run_exitfuncs()
+                sys.stdout.flush()
+                sys.stderr.flush()
+                channel.send({"exit_code": exit_code})
+            except BaseException:
+                pass
+            os._exit(exit_code)
+
+
+#######################################################################################################################
+# Client
+#######################################################################################################################
+def connect(wd: Path) -> Optional[DaemonChannel]:
+    socket_path: Path = get_socket_path(wd)
+    if (not is_supported()) or (not socket_path.exists()):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(socket_path))
+    except OSError:
+        # Left behind by a daemon that did not exit cleanly
+        client.close()
+        return None
+    return DaemonChannel(client)
+
+
+def is_daemon_running(wd: Path) -> bool:
+    channel: DaemonChannel = connect(wd)
+    if channel is None:
+        return False
+    try:
+        channel.send({"ping": True})
+        message, _ = channel.receive()
+        return message is not None
+    except OSError:
+        return False
+    finally:
+        channel.close()
+
+
+def stop_daemon(wd: Path) -> bool:
+    channel: DaemonChannel = connect(wd)
+    if channel is None:
+        return False
+    try:
+        channel.send({"stop": True})
+        message, _ = channel.receive()
+        return message is not None
+    except OSError:
+        return False
+    finally:
+        channel.close()
+
+
+def run_in_daemon(wd: Path, args: List[str], fds: List[int]=None) -> Optional[int]:
+    """
+    Runs a `mio` invocation in the daemon serving `wd`, if there is one.  Signals received by the client are forwarded
+    to the process running the request.
+    :return: Exit code, or None if no daemon is serving `wd`
+    """
+    channel: DaemonChannel = connect(wd)
+    if channel is None:
+        return None
+    if fds is None:
+        fds = [0, 1, 2]
+    child_pid: int = 0
+    def forward_signal(signum, frame):
+        if child_pid:
+            os.kill(child_pid, signum)
+    previous_handlers = {}
+    try:
+        channel.send({"args": list(args), "cwd": os.getcwd(), "env": dict(os.environ)}, fds)
+        if threading.current_thread() is threading.main_thread():
+            previous_handlers = {signum: signal.signal(signum, forward_signal) for signum in FORWARDED_SIGNALS}
+        while True:
+            message, _ = channel.receive()
+            if message is None:
+                # The request's process died without reporting back
+                return 1
+            if "pid" in message:
+                child_pid = message["pid"]
+            if "exit_code" in message:
+                return message["exit_code"]
+    except OSError:
+        return 1 if child_pid else None
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        channel.close()
@@ -0,0 +1,232 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+import errno
+import filecmp
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+#######################################################################################################################
+# Support Types
+#######################################################################################################################
+MANIFEST_FORMAT_VERSION = 1
+# Linux ioctl cloning a file's extents into another file (copy-on-write filesystems: Btrfs, XFS, etc.)
+FICLONE = 0x40049409
+# Files modified this recently may be modified again without their mtime changing (coarse timestamps): they are not
+# recorded until they have settled.
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+# Errors meaning that the filesystem(s) can't reflink/hardlink at all, as opposed to this file not being linkable
+UNSUPPORTED_LINK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.ENOSYS,
+                           errno.EMLINK}
+
+
+def get_stat_key(path: str) -> Optional[List[int]]:
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    return [file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino, file_stat.st_dev]
+
+
+#######################################################################################################################
+# Directory Sync
+#######################################################################################################################
+class DirectorySync:
+    """
+    Mirrors a source directory into a destination directory which only Moore.io writes to, like `rsync --delete`.  A
+    manifest stored next to the destination records the state (size, modification time, inode) of every source file
+    and of its copy: files whose source and copy are both unchanged are skipped, and so are files whose contents are
+    identical.  Files are cloned (reflinks) or hard-linked rather than copied where the filesystem supports it: copies
+    must therefore never be modified in place.
+    """
+    def __init__(self, source_path: Path, destination_path: Path, use_hardlinks: bool=True):
+        self._source_path: Path = Path(source_path)
+        self._destination_path: Path = Path(destination_path)
+        self._manifest_path: Path = self.destination_path.with_name(f".{self.destination_path.name}.manifest.json")
+        self._use_reflinks: bool = (fcntl is not None) and sys.platform.startswith("linux")
+        self._use_hardlinks: bool = use_hardlinks
+        self._num_copied_files: int = 0
+        self._num_unchanged_files: int = 0
+        self._num_removed_files: int = 0
+
+    @property
+    def source_path(self) -> Path:
+        return self._source_path
+
+    @property
+    def destination_path(self) -> Path:
+        return self._destination_path
+
+    @property
+    def manifest_path(self) -> Path:
+        return self._manifest_path
+
+    @property
+    def num_copied_files(self) -> int:
+        """
+        :return: Number of files copied (or linked) by the last sync.
+        """
+        return self._num_copied_files
+
+    @property
+    def num_unchanged_files(self) -> int:
+        """
+        :return: Number of files left untouched by the last sync.
+        """
+        return self._num_unchanged_files
+
+    @property
+    def num_removed_files(self) -> int:
+        """
+        :return: Number of files removed from the destination by the last sync.
+        """
+        return self._num_removed_files
+
+    def load_manifest(self) -> Dict[str, list]:
+        try:
+            with open(self.manifest_path, "r") as file:
+                data = json.load(file)
+            if (data["version"] == MANIFEST_FORMAT_VERSION) and (data["source"] == str(self.source_path)):
+                return data["files"]
+        except Exception:
+            pass
+        return {}
+
+    def save_manifest(self, files: Dict[str, list]):
+        """
+        Failures are ignored: without a manifest, the next sync compares file contents.
+        """
+        temp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "w") as file:
+                json.dump({"version": MANIFEST_FORMAT_VERSION, "source": str(self.source_path), "files": files}, file)
+            os.replace(temp_path, self.manifest_path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def sync(self):
+        """
+        Brings the destination directory up to date with the source directory.
+        :raises FileNotFoundError: if the source directory does not exist
+        """
+        if not os.path.isdir(self.source_path):
+            raise FileNotFoundError(f"Source directory '{self.source_path}' does not exist")
+        self._num_copied_files = 0
+        self._num_unchanged_files = 0
+        self._num_removed_files = 0
+        recorded_files: Dict[str, list] = self.load_manifest()
+        files: Dict[str, list] = {}
+        source_directories: Set[str] = set()
+        source_files: Set[str] = set()
+        racy_mtime_ns = time.time_ns() - RACY_MTIME_WINDOW_NS
+        # Symbolic links are followed, as with `shutil.copytree()`
+        for directory, sub_directories, file_names in os.walk(self.source_path, followlinks=True):
+            relative_directory = os.path.relpath(directory, self.source_path)
+            source_directories.add(relative_directory)
+            destination_directory = os.path.join(self.destination_path, relative_directory)
+            if not os.path.isdir(destination_directory):
+                if os.path.lexists(destination_directory):
+                    os.remove(destination_directory)
+                os.makedirs(destination_directory)
+            for file_name in file_names:
+                relative_path = os.path.normpath(os.path.join(relative_directory, file_name))
+                source_files.add(relative_path)
+                source_file = os.path.join(directory, file_name)
+                destination_file = os.path.join(self.destination_path, relative_path)
+                source_key = get_stat_key(source_file)
+                if source_key is None:
+                    continue
+                if self.is_up_to_date(source_file, destination_file, source_key, recorded_files.get(relative_path)):
+                    self._num_unchanged_files += 1
+                else:
+                    self.copy_file(source_file, destination_file)
+                    self._num_copied_files += 1
+                destination_key = get_stat_key(destination_file)
+                if (destination_key is not None) and (source_key[1] < racy_mtime_ns):
+                    files[relative_path] = [source_key, destination_key]
+        self.remove_extra_files(source_directories, source_files)
+        self.save_manifest(files)
+
+    def is_up_to_date(self, source_file: str, destination_file: str, source_key: List[int],
+                      entry: Optional[list]) -> bool:
+        destination_key = get_stat_key(destination_file)
+        if destination_key is None:
+            return False
+        if (entry is not None) and (entry[0] == source_key) and (entry[1] == destination_key):
+            return True
+        # Hard link
+        if destination_key[2:] == source_key[2:]:
+            return True
+        # Unrecorded or touched: compare contents
+        if destination_key[0] != source_key[0]:
+            return False
+        try:
+            return filecmp.cmp(source_file, destination_file, shallow=False)
+        except OSError:
+            return False
+
+    def copy_file(self, source_file: str, destination_file: str):
+        # Never write through an existing copy: it may be a hard link to a previous version of the source
+        if os.path.lexists(destination_file):
+            if os.path.isdir(destination_file) and not os.path.islink(destination_file):
+                shutil.rmtree(destination_file)
+            else:
+                os.remove(destination_file)
+        if self._use_reflinks and self.reflink_file(source_file, destination_file):
+            return
+        if self._use_hardlinks:
+            try:
+                os.link(source_file, destination_file)
+                return
+            except OSError as e:
+                if e.errno in UNSUPPORTED_LINK_ERRNOS:
+                    self._use_hardlinks = False
+        shutil.copy2(source_file, destination_file)
+
+    def reflink_file(self, source_file: str, destination_file: str) -> bool:
+        try:
+            with open(source_file, "rb") as source, open(destination_file, "wb") as destination:
+                fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+        except OSError as e:
+            if e.errno in UNSUPPORTED_LINK_ERRNOS:
+                self._use_reflinks = False
+            try:
+                os.remove(destination_file)
+            except OSError:
+                pass
+            return False
+        shutil.copystat(source_file, destination_file)
+        return True
+
+    def remove_extra_files(self, source_directories: Set[str], source_files: Set[str]):
+        """
+        Removes the destination files and directories which are not in the source directory anymore.
+        """
+        for directory, sub_directories, file_names in os.walk(self.destination_path, topdown=False):
+            relative_directory = os.path.relpath(directory, self.destination_path)
+            for file_name in file_names:
+                relative_path = os.path.normpath(os.path.join(relative_directory, file_name))
+                if relative_path not in source_files:
+                    os.remove(os.path.join(directory, file_name))
+                    self._num_removed_files += 1
+            for sub_directory in sub_directories:
+                relative_path = os.path.normpath(os.path.join(relative_directory, sub_directory))
+                path = os.path.join(directory, sub_directory)
+                if os.path.islink(path):
+                    os.remove(path)
+                elif relative_path not in source_directories:
+                    shutil.rmtree(path)
@@ -2,19 +2,24 @@
 # All rights reserved.
 #######################################################################################################################
 import base64
+import bisect
+import multiprocessing
 import os
 import tarfile
 from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from datetime import datetime
 from http import HTTPMethod
 from io import BytesIO
+from multiprocessing.context import BaseContext
 from pathlib import Path
-from typing import Optional, List, Union, Any, Dict, Literal
+from typing import Optional, List, Union, Any, Dict, Literal, Tuple
 
 import yaml
 from pydantic import constr, PositiveInt, ValidationError
-from semantic_version import SimpleSpec
+from semantic_version import SimpleSpec, Version
 
 from .model import Model, VALID_NAME_REGEX, VALID_IP_OWNER_NAME_REGEX, VALID_FSOC_NAMESPACE_REGEX, \
     VALID_POSIX_PATH_REGEX, UNDEFINED_CONST, PosixPath, PosixPathList, HdlNameList, HdlName, OrgName
@@ -24,12 +29,29 @@ from enum import Enum
 from .version import SemanticVersion, SemanticVersionSpec
 from .configuration import Ip, LogicSimulators
 from .service import ServiceType
+from .daemon import in_daemon, load_file, track_directory
 
 
 #######################################################################################################################
 # Support Types
 #######################################################################################################################
 MAX_DEPTH_DEPENDENCY_INSTALLATION = 50
+# IP descriptors are only parsed in worker processes if each worker gets at least this many: below that, starting the
+# workers costs more than it saves.
+MIN_IP_FILES_PER_WORKER = 64
+# libyaml-based loader, if PyYAML was built with it
+YamlSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+def load_yaml_file(file_path: str) -> Any:
+    with open(file_path, 'r') as f:
+        return yaml.load(f, Loader=YamlSafeLoader)
+
+def get_version_key(version: Version) -> tuple:
+    # Build metadata does not take part in version precedence
+    return version.precedence_key[:4]
+
+def get_validation_error_messages(e: ValidationError) -> str:
+    return "\n  ".join([f"{error['msg']}: {error['loc']}" for error in e.errors()])
 
 class IpPkgType(Enum):
     DV_LIBRARY = "dv_lib"
@@ -425,13 +447,12 @@ class Ip(Model):
 
     @classmethod
     def load_from_yaml(cls, file_path: Path):
-        with open(file_path, 'r') as f:
-            data = yaml.safe_load(f)
-            if data is None:
-                data = {}
-            instance = cls(**data)
-            instance.file_path = file_path
-            return instance
+        data = load_file(file_path, load_yaml_file)
+        if data is None:
+            data = {}
+        instance = cls(**data)
+        instance.file_path = file_path
+        return instance
     def save_to_yaml(self, file_path: Path):
         with open(file_path, 'w') as file:
             model_data: Dict = self.model_dump(exclude_defaults=True)
@@ -581,9 +602,7 @@ class Ip(Model):
             current_ip_root_path = self.file_path.parent
             new_ip_root_path = self.rmh.global_ip_local_copy_dir / self.installation_directory_name
             self.rmh.debug(f"Relocating GLOBAL IP '{self}' from '{current_ip_root_path}' to '{new_ip_root_path}' ...")
-            if self.rmh.directory_exists(new_ip_root_path):
-                self.rmh.remove_directory(new_ip_root_path)
-            self.rmh.copy_directory(current_ip_root_path, new_ip_root_path)
+            self.rmh.sync_directory(current_ip_root_path, new_ip_root_path)
             self.file_path = new_ip_root_path / self.file_path.name
         # Check hdl-src directories & files
         self._resolved_src_path = self.root_path / self.structure.hdl_src_path
@@ -865,12 +884,52 @@ class Ip(Model):
         return defines
 
 
+def load_ip_file(file_path: str) -> Tuple[Optional[Ip], str]:
+    """
+    Parses and validates an IP descriptor.  Runs in worker processes: validation errors are returned rather than raised.
+    :param file_path: Path to 'ip.yml' file
+    :return: IP model (None if the descriptor is malformed) and validation error messages
+    """
+    try:
+        return Ip.load_from_yaml(file_path), ""
+    except ValidationError as e:
+        return None, get_validation_error_messages(e)
+
+
+def get_num_ip_file_workers(num_ip_files: int) -> int:
+    """
+    :param num_ip_files: Number of 'ip.yml' files to parse
+    :return: Number of worker processes worth starting to parse them (1: parse them in-process)
+    """
+    if in_daemon():
+        return 1
+    return max(1, min(os.cpu_count() or 1, num_ip_files // MIN_IP_FILES_PER_WORKER))
+
+
+def get_ip_file_process_context() -> BaseContext:
+    """
+    Worker processes are started from a fork server (or spawned, where there is none) rather than forked from mio: other
+    threads may be running startup tasks, and forking a multi-threaded process can deadlock the child.
+    :return: Multiprocessing context for the workers parsing 'ip.yml' files
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
 #######################################################################################################################
 # IP Database Service
 #######################################################################################################################
 class IpDataBase():
     def __init__(self, rmh: 'RootManager'):
         self._ip_list: list[Ip] = []
+        # Indexes over `_ip_list`: lists are sorted by ascending version, IPs with identical versions in reverse order of
+        # addition (newest versions, then the earliest added, are found first when iterating in reverse)
+        self._ip_by_name: Dict[str, List[Ip]] = {}
+        self._ip_by_vendor_and_name: Dict[Tuple[str, str], List[Ip]] = {}
+        self._ip_by_sync_id: Dict[int, Ip] = {}
         self._rmh: 'RootManager' = rmh
         self._need_to_find_dependencies_on_remote: bool = False
         self._ip_with_missing_dependencies: Dict[int, Ip] = {}
@@ -880,6 +939,22 @@ class IpDataBase():
         self.rmh.debug(f"Discovered IP '{ip}'")
         self._ip_list.append(ip)
         ip.ip_database = self
+        version_key = lambda ip_in_list: get_version_key(ip_in_list.ip.version)
+        bisect.insort_left(self._ip_by_name.setdefault(ip.ip.name, []), ip, key=version_key)
+        bisect.insort_left(self._ip_by_vendor_and_name.setdefault((ip.ip.vendor, ip.ip.name), []), ip, key=version_key)
+        if ip.ip.sync and (ip.ip.sync_id not in self._ip_by_sync_id):
+            self._ip_by_sync_id[ip.ip.sync_id] = ip
+
+    def remove_ip(self, ip: Ip):
+        self._ip_list.remove(ip)
+        self._ip_by_name[ip.ip.name].remove(ip)
+        self._ip_by_vendor_and_name[(ip.ip.vendor, ip.ip.name)].remove(ip)
+        if self._ip_by_sync_id.get(ip.ip.sync_id) is ip:
+            del self._ip_by_sync_id[ip.ip.sync_id]
+            for other_ip in self._ip_list:
+                if other_ip.ip.sync and (other_ip.ip.sync_id == ip.ip.sync_id):
+                    self._ip_by_sync_id[ip.ip.sync_id] = other_ip
+                    break
     
     @property
     def rmh(self) -> 'RootManager':
@@ -921,48 +996,76 @@ class IpDataBase():
             ip.check_target(definition.target)
         return ip
 
+    def get_ip_versions(self, name: str, owner: str="*") -> List[Ip]:
+        """
+        :return: IPs with a given name (and owner, if not '*') sorted by ascending version
+        """
+        if owner == "*":
+            return self._ip_by_name.get(name, [])
+        return self._ip_by_vendor_and_name.get((owner, name), [])
+
     def find_ip(self, name: str, owner: str="*", version_spec: SimpleSpec=SimpleSpec("*"), raise_exception_if_not_found: bool=True) -> Ip:
-        for ip in self._ip_list:
-            if ip.ip.name == name and (owner == "*" or ip.ip.vendor == owner) and version_spec.match(ip.ip.version):
+        """
+        :return: IP with the highest version matching `version_spec`
+        """
+        for ip in reversed(self.get_ip_versions(name, owner)):
+            if version_spec.match(ip.ip.version):
                 return ip
         if raise_exception_if_not_found:
             raise ValueError(f"IP with name '{name}', owner '{owner}', version '{version_spec}' not found.")
 
+    def find_ip_version(self, name: str, owner: str, version: Version) -> Optional[Ip]:
+        """
+        :return: IP with exactly `version` (build metadata aside), or None
+        """
+        ip_versions = self.get_ip_versions(name, owner)
+        version_key = get_version_key(version)
+        index = bisect.bisect_left(ip_versions, version_key, key=lambda ip: get_version_key(ip.ip.version))
+        if (index < len(ip_versions)) and (get_version_key(ip_versions[index].ip.version) == version_key):
+            return ip_versions[index]
+        return None
+
     def find_ip_by_sync_id(self, sync_id: str, raise_exception_if_not_found: bool=True) -> Ip:
-        for ip in self._ip_list:
-            if ip.ip.sync and (ip.ip.sync_id == sync_id):
-                return ip
+        ip = self._ip_by_sync_id.get(sync_id)
+        if ip:
+            return ip
         if raise_exception_if_not_found:
             raise ValueError(f"IP with sync_id '{sync_id}' not found.")
 
-    def discover_ip(self, path: Path, ip_location_type: IpLocationType, error_on_malformed: bool=False, error_on_nothing_found: bool=False) -> List[Ip]:
+    def discover_ip(self, path: Path, ip_location_type: IpLocationType, error_on_malformed: bool=False, error_on_nothing_found: bool=False, scan: Tuple[List[str], Optional[List[Tuple[Optional[Ip], str]]]]=None) -> List[Ip]:
+        """
+        Finds, parses and adds the IPs under a directory.
+        :param scan: Result of `scan_ip_directory()` for `path`, if it was called ahead of time
+        :return: IPs added
+        """
         ip_list: List[Ip] = []
-        ip_files: List[str] = []
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                if file == 'ip.yml':
-                    ip_files.append(os.path.join(root, file))
+        if scan is None:
+            ip_files, ip_file_results = self.find_ip_files(path), None
+        else:
+            ip_files, ip_file_results = scan
         if len(ip_files) == 0:
             if error_on_nothing_found:
                 raise Exception(f"No 'ip.yml' files found in the '{ip_location_type}' directory.")
         else:
-            for file in ip_files:
+            if ip_file_results is None:
+                ip_file_results = self.load_ip_files(ip_files)
+            for file, (ip_model, error_messages) in zip(ip_files, ip_file_results):
+                if ip_model is None:
+                    if error_on_malformed:
+                        raise Exception(f"IP definition at '{file}' is malformed: {error_messages}")
+                    self.rmh.warning(f"Skipping IP definition at '{file}': {error_messages}")
+                    continue
                 try:
-                    ip_model = Ip.load_from_yaml(file)
-                    if ip_model.ip.vendor == UNDEFINED_CONST:
-                        if self.find_ip(ip_model.ip.name, "*", SimpleSpec(str(ip_model.ip.version)), raise_exception_if_not_found=False):
-                            continue
-                    else:
-                        if self.find_ip(ip_model.ip.name, ip_model.ip.vendor, SimpleSpec(str(ip_model.ip.version)), raise_exception_if_not_found=False):
-                            continue
+                    owner = "*" if ip_model.ip.vendor == UNDEFINED_CONST else ip_model.ip.vendor
+                    if self.find_ip_version(ip_model.ip.name, owner, ip_model.ip.version):
+                        continue
                     ip_model.rmh = self.rmh
                     ip_model.file_path = file
                     ip_model.uid = self.num_ips
                     ip_model.location_type = ip_location_type
                     ip_model.check()
                 except ValidationError as e:
-                    errors = e.errors()
-                    error_messages = "\n  ".join([f"{error['msg']}: {error['loc']}" for error in errors])
+                    error_messages = get_validation_error_messages(e)
                     if error_on_malformed:
                         raise Exception(f"IP definition at '{file}' is malformed: {error_messages}")
                     else:
@@ -972,6 +1075,44 @@ class IpDataBase():
                     ip_list.append(ip_model)
         return ip_list
 
+    def find_ip_files(self, path: Path) -> List[str]:
+        """
+        :param path: Directory to search
+        :return: Paths of the 'ip.yml' files under `path`
+        """
+        track_directory(path, 'ip.yml', load_yaml_file)
+        ip_files: List[str] = self.rmh.ip_index.find_ip_files(path)
+        self.rmh.ip_index.save()
+        return ip_files
+
+    def scan_ip_directory(self, path: Path) -> Tuple[List[str], Optional[List[Tuple[Optional[Ip], str]]]]:
+        """
+        Finds and parses the 'ip.yml' files under a directory without adding them to the database, ahead of
+        `discover_ip()`.  Can run on a worker thread.
+        :param path: Directory to search
+        :return: Paths of the 'ip.yml' files and results of `load_ip_file()` for each
+        """
+        ip_files: List[str] = self.find_ip_files(path)
+        return ip_files, self.load_ip_files(ip_files)
+
+    def load_ip_files(self, ip_files: List[str]) -> List[Tuple[Optional[Ip], str]]:
+        """
+        Parses and validates IP descriptors, across worker processes if there are enough of them.  Results are returned
+        in the order of `ip_files`, which keeps IP UIDs stable.  The `mio serve` daemon parses them in-process, where
+        they are cached.
+        :param ip_files: Paths to 'ip.yml' files
+        :return: Results of `load_ip_file()` for each file
+        """
+        num_workers = get_num_ip_file_workers(len(ip_files))
+        if num_workers > 1:
+            chunk_size = max(1, len(ip_files) // (num_workers * 4))
+            try:
+                with ProcessPoolExecutor(max_workers=num_workers, mp_context=get_ip_file_process_context()) as executor:
+                    return list(executor.map(load_ip_file, ip_files, chunksize=chunk_size))
+            except (BrokenProcessPool, OSError) as e:
+                self.rmh.debug(f"Failed to parse IP descriptors in parallel, falling back to serial parsing: {e}")
+        return [load_ip_file(file) for file in ip_files]
+
     def resolve_local_dependencies(self, reset_list_of_dependencies_to_find_online: bool=True):
         if reset_list_of_dependencies_to_find_online:
             self._dependencies_to_find_online = []
@@ -1165,7 +1306,7 @@ class IpDataBase():
             ip.uninstall()
             if ip.location_type == IpLocationType.PROJECT_INSTALLED:
                 try: # HACK!
-                    self._ip_list.remove(ip)
+                    self.remove_ip(ip)
                 except:
                     pass
 
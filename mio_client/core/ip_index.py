@@ -0,0 +1,149 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+#######################################################################################################################
+# Support Types
+#######################################################################################################################
+INDEX_FILE_NAME = "ip_index.json"
+INDEX_FORMAT_VERSION = 1
+IP_FILE_NAME = "ip.yml"
+# Directories modified this recently may be modified again without their mtime changing (coarse timestamps): they are
+# recorded as such and listed again on the next run.
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+RACY_MTIME = -1
+
+
+#######################################################################################################################
+# IP Discovery Index
+#######################################################################################################################
+class IpIndex:
+    """
+    Records, for each IP discovery root, every directory under it along with its modification time, the 'ip.yml' files
+    it contains and its sub-directories.  A directory's modification time changes whenever an entry is added to,
+    removed from or renamed in it: discovery only has to stat recorded directories and list the ones which have
+    changed, instead of walking every root.  Files are returned in the same order as a top-down `os.walk()`.
+    """
+    def __init__(self, path: Path):
+        self._path: Path = path
+        self._roots: Dict[str, Dict[str, list]] = {}
+        self._loaded: bool = False
+        self._modified: bool = False
+        self._num_listed_directories: int = 0
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def num_listed_directories(self) -> int:
+        """
+        :return: Number of directories whose contents had to be listed since this object was created.
+        """
+        return self._num_listed_directories
+
+    def load(self):
+        self._loaded = True
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+            if data["version"] == INDEX_FORMAT_VERSION:
+                self._roots = data["roots"]
+        except Exception:
+            self._roots = {}
+
+    def save(self):
+        """
+        Writes the index if it has changed.  Failures are ignored: the index is only an optimization.
+        """
+        if not self._modified:
+            return
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "w") as file:
+                json.dump({"version": INDEX_FORMAT_VERSION, "roots": self._roots}, file)
+            os.replace(temp_path, self.path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        else:
+            self._modified = False
+
+    def clear(self):
+        """
+        Forgets every recorded directory: the next lookups walk their roots in full.
+        """
+        self._loaded = True
+        self._roots = {}
+        self._modified = True
+
+    def find_ip_files(self, root: Path) -> List[str]:
+        """
+        :param root: Directory to search.
+        :return: Paths of all 'ip.yml' files under `root`.
+        """
+        if not self._loaded:
+            self.load()
+        root = str(root)
+        recorded_directories: Dict[str, list] = self._roots.get(root, {})
+        directories: Dict[str, list] = {}
+        ip_files: List[str] = []
+        scan_start_ns = time.time_ns()
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            entry = recorded_directories.get(directory)
+            if (entry is None) or (entry[0] != mtime_ns):
+                entry = self.list_directory(directory, mtime_ns, scan_start_ns)
+                if entry is None:
+                    continue
+            directories[directory] = entry
+            ip_files.extend(os.path.join(directory, file) for file in entry[1])
+            stack.extend(os.path.join(directory, sub_directory) for sub_directory in reversed(entry[2]))
+        if directories != recorded_directories:
+            self._roots[root] = directories
+            self._modified = True
+        return ip_files
+
+    def list_directory(self, directory: str, mtime_ns: int, scan_start_ns: int) -> Optional[list]:
+        """
+        Lists a directory the way `os.walk()` does: symbolic links to directories are not followed.
+        :return: [modification time, 'ip.yml' files, sub-directories to walk], or None if the directory can't be read
+        """
+        files: List[str] = []
+        sub_directories: List[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        if entry.name == IP_FILE_NAME:
+                            files.append(entry.name)
+                        continue
+                    try:
+                        is_symlink = entry.is_symlink()
+                    except OSError:
+                        is_symlink = False
+                    if not is_symlink:
+                        sub_directories.append(entry.name)
+        except OSError:
+            return None
+        self._num_listed_directories += 1
+        if mtime_ns >= scan_start_ns - RACY_MTIME_WINDOW_NS:
+            mtime_ns = RACY_MTIME
+        return [mtime_ns, files, sub_directories]
@@ -1,9 +1,18 @@
 # Copyright 2020-2025 Datum Technology Corporation
 # All rights reserved.
 #######################################################################################################################
+import json
+import math
+import os
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict
+from pathlib import Path
+from typing import Dict, List
+
+
+PHASE_HISTORY_FILE_NAME = "phase_history.jsonl"
+# The history is trimmed to its most recent half once the file grows past this size
+MAX_PHASE_HISTORY_FILE_SIZE = 2 * 1024 * 1024
 
 
 class State(Enum):
@@ -26,7 +35,6 @@ class State(Enum):
     ERROR = 'error'
 
 
-# TODO Turn this into a pydantic model and use a FileModel to store phase info to disk for performance data
 class Phase:
     """
     Initialize a Phase object.
@@ -175,3 +183,58 @@ class Phase:
         :return: True if the phase has finished, False otherwise.
         """
         return self.state == State.FINISHED
+
+
+class PhaseHistory:
+    """
+    Durations of the phases of past runs, stored one run per line (JSON) so that recording a run is a single append.
+    Each run is a dictionary: {"timestamp", "version", "command", "success", "duration", "phases": {name: duration}}, with
+    durations in milliseconds.
+    """
+    def __init__(self, path: Path, max_file_size: int=MAX_PHASE_HISTORY_FILE_SIZE):
+        self._path: Path = path
+        self._max_file_size: int = max_file_size
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def append(self, run: Dict):
+        with open(self.path, "a") as file:
+            file.write(json.dumps(run, separators=(",", ":")) + "\n")
+        if os.path.getsize(self.path) > self._max_file_size:
+            self.trim()
+
+    def trim(self):
+        with open(self.path, "r") as file:
+            lines = file.readlines()
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w") as file:
+            file.writelines(lines[len(lines) // 2:])
+        os.replace(temp_path, self.path)
+
+    def load(self) -> List[Dict]:
+        """
+        :return: Recorded runs, oldest first.  Lines which can't be parsed (ex: partially written) are skipped.
+        """
+        runs: List[Dict] = []
+        if not self.path.exists():
+            return runs
+        with open(self.path, "r") as file:
+            for line in file:
+                try:
+                    runs.append(json.loads(line))
+                except ValueError:
+                    continue
+        return runs
+
+
+def get_percentile(values: List[float], percentile: float) -> float:
+    """
+    :param values: Samples (unsorted)
+    :param percentile: Percentile in [0, 100]
+    :return: Nearest-rank percentile of `values`
+    """
+    sorted_values = sorted(values)
+    rank = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
@@ -0,0 +1,116 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+#######################################################################################################################
+# Support Types
+#######################################################################################################################
+SCHEDULER_PLUGIN_CACHE_FILE_NAME = "scheduler_plugins.json"
+COMMAND_PLUGIN_CACHE_FILE_NAME = "command_plugins.json"
+PLUGIN_CACHE_FORMAT_VERSION = 1
+# Files modified this recently may be modified again without their mtime changing (coarse timestamps): they are not
+# recorded until they have settled.
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+
+#######################################################################################################################
+# Plugin Cache
+#######################################################################################################################
+class PluginCache:
+    """
+    Records the plugins (scheduler/command names and the classes implementing them) provided by each plugin module,
+    keyed by the module file's path, modification time and size.  Discovery only needs to import the modules which
+    have changed and the module providing the plugin actually requested.
+    """
+    def __init__(self, path: Path):
+        self._path: Path = path
+        self._entries: Dict[str, list] = {}
+        self._loaded: bool = False
+        self._modified: bool = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self):
+        self._loaded = True
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+            if data["version"] == PLUGIN_CACHE_FORMAT_VERSION:
+                self._entries = data["entries"]
+        except Exception:
+            self._entries = {}
+
+    def save(self):
+        """
+        Writes the cache if it has changed.  Failures are ignored: the cache is only an optimization.
+        """
+        if not self._modified:
+            return
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "w") as file:
+                json.dump({"version": PLUGIN_CACHE_FORMAT_VERSION, "entries": self._entries}, file)
+            os.replace(temp_path, self.path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        else:
+            self._modified = False
+
+    @staticmethod
+    def get_stat_key(file_path: Path) -> Optional[List[int]]:
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return None
+        return [file_stat.st_mtime_ns, file_stat.st_size]
+
+    def get(self, file_path: Path) -> Optional[List[List[str]]]:
+        """
+        :param file_path: Plugin module file
+        :return: [name, class name] of each plugin provided by the module, or None if the module has changed since it
+                 was recorded
+        """
+        if not self._loaded:
+            self.load()
+        entry = self._entries.get(str(file_path))
+        if (entry is None) or (entry[0] != self.get_stat_key(file_path)):
+            return None
+        return entry[1]
+
+    def set(self, file_path: Path, plugins: List[List[str]]):
+        """
+        :param file_path: Plugin module file
+        :param plugins: [name, class name] of each plugin provided by the module
+        """
+        if not self._loaded:
+            self.load()
+        stat_key = self.get_stat_key(file_path)
+        if (stat_key is None) or (stat_key[0] >= time.time_ns() - RACY_MTIME_WINDOW_NS):
+            self._entries.pop(str(file_path), None)
+        else:
+            self._entries[str(file_path)] = [stat_key, plugins]
+        self._modified = True
+
+    def retain(self, file_paths: Iterable[Path]):
+        """
+        Forgets modules which are no longer present.
+        :param file_paths: Plugin module files found by the last discovery
+        """
+        if not self._loaded:
+            self.load()
+        file_paths = {str(file_path) for file_path in file_paths}
+        for file_path in list(self._entries.keys()):
+            if file_path not in file_paths:
+                del self._entries[file_path]
+                self._modified = True
@@ -0,0 +1,157 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+import cProfile
+import os
+import pstats
+import signal
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+#######################################################################################################################
+# Support Types
+#######################################################################################################################
+PROFILES_DIRECTORY_NAME = "profiles"
+# Interval (seconds, wall-clock) between two stack samples
+SAMPLING_INTERVAL = 0.001
+# Phases shorter than this (seconds) only appear in the run-wide dumps
+MIN_DUMPED_PHASE_DURATION = 0.001
+
+
+class PhaseProfile:
+    """
+    Profiling data of a single phase: deterministic (cProfile) function statistics and stack samples.
+    """
+    def __init__(self, index: int, name: str):
+        self.index: int = index
+        self.name: str = name
+        self.profile: cProfile.Profile = cProfile.Profile()
+        self.samples: Dict[str, int] = {}
+        self.duration: float = 0
+
+    @property
+    def file_name(self) -> str:
+        return f"{self.index:02d}_{self.name}"
+
+
+#######################################################################################################################
+# Phase Profiler
+#######################################################################################################################
+class PhaseProfiler:
+    """
+    Profiles each phase of a run separately.  Two kinds of dumps are written per phase:
+    - `.pstats`: cProfile statistics, for `python -m pstats`, snakeviz, etc.
+    - `.collapsed`: sampled stacks in the collapsed format ("outer;inner count") used by flamegraph.pl and speedscope.
+    The same data is also aggregated for the whole run (`run.pstats` and `run.collapsed`, whose stacks are rooted at
+    their phase).  Stacks are sampled with a wall-clock interval timer, which is only available on POSIX operating
+    systems and from the main thread: the collapsed dumps are skipped otherwise.
+    """
+    def __init__(self, path: Optional[Path]=None):
+        self._path: Optional[Path] = path
+        self._phases: List[PhaseProfile] = []
+        self._current_phase: Optional[PhaseProfile] = None
+        self._current_phase_start: float = 0
+        self._sampling: bool = False
+        self._previous_signal_handler = None
+
+    @property
+    def path(self) -> Optional[Path]:
+        """
+        :return: Directory where the dumps are written.  None until the run directory is known.
+        """
+        return self._path
+
+    @path.setter
+    def path(self, value: Path):
+        self._path = value
+
+    @property
+    def phases(self) -> List[PhaseProfile]:
+        return self._phases
+
+    @property
+    def sampling(self) -> bool:
+        """
+        :return: Whether stacks are being sampled (for the collapsed dumps).
+        """
+        return self._sampling
+
+    def start(self):
+        if not hasattr(signal, "setitimer"):
+            return
+        try:
+            self._previous_signal_handler = signal.signal(signal.SIGALRM, self.sample)
+        except ValueError:
+            # Not the main thread
+            return
+        signal.setitimer(signal.ITIMER_REAL, SAMPLING_INTERVAL, SAMPLING_INTERVAL)
+        self._sampling = True
+
+    def stop(self):
+        self.stop_phase()
+        if self.sampling:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous_signal_handler)
+            self._sampling = False
+
+    def start_phase(self, name: str):
+        self.stop_phase()
+        self._current_phase = PhaseProfile(len(self.phases), name)
+        self._current_phase_start = time.perf_counter()
+        self._current_phase.profile.enable()
+
+    def stop_phase(self):
+        phase = self._current_phase
+        if phase is None:
+            return
+        phase.profile.disable()
+        phase.duration = time.perf_counter() - self._current_phase_start
+        self._current_phase = None
+        self._phases.append(phase)
+
+    def sample(self, signum, frame):
+        phase = self._current_phase
+        if (phase is None) or (frame is None):
+            return
+        stack: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        key = ";".join(reversed(stack))
+        phase.samples[key] = phase.samples.get(key, 0) + 1
+
+    def save(self) -> Path:
+        """
+        Writes the dumps of every profiled phase to `path`.
+        :return: Directory where the dumps were written.
+        """
+        self.stop()
+        os.makedirs(self.path, exist_ok=True)
+        run_stats: Optional[pstats.Stats] = None
+        run_samples: Dict[str, int] = {}
+        for phase in self.phases:
+            phase_stats = pstats.Stats(phase.profile)
+            if run_stats is None:
+                run_stats = phase_stats
+            else:
+                run_stats.add(phase_stats)
+            for stack, count in phase.samples.items():
+                run_samples[f"{phase.name};{stack}"] = count
+            if phase.duration >= MIN_DUMPED_PHASE_DURATION:
+                phase.profile.dump_stats(self.path / f"{phase.file_name}.pstats")
+                if phase.samples:
+                    self.write_collapsed_stacks(self.path / f"{phase.file_name}.collapsed", phase.samples)
+        if run_stats is not None:
+            run_stats.dump_stats(self.path / "run.pstats")
+        if run_samples:
+            self.write_collapsed_stacks(self.path / "run.collapsed", run_samples)
+        return self.path
+
+    @staticmethod
+    def write_collapsed_stacks(path: Path, samples: Dict[str, int]):
+        with open(path, "w") as file:
+            for stack, count in samples.items():
+                file.write(f"{stack} {count}\n")
@@ -3,27 +3,32 @@
 #######################################################################################################################
 import re
 import sys
+from datetime import datetime
 from http import HTTPMethod
 from pathlib import Path
-from typing import List, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 import shutil
 import jinja2
-import requests
 import toml
 from pydantic import ValidationError
 import os
 import getpass
 from rich.console import Console
-from rich.markdown import Markdown
-from rich.pager import SystemPager
 
+from ..cli import VERSION
 from .command import Command
 from .configuration import Configuration
+from .configuration_cache import CACHE_FILE_NAME, ConfigurationCache
+from .daemon import in_daemon, load_file
+from .directory_sync import DirectorySync
 from .ip import IpDataBase, IpLocationType
-from .phase import Phase
+from .ip_index import INDEX_FILE_NAME, IpIndex
+from .phase import Phase, PhaseHistory, PHASE_HISTORY_FILE_NAME
+from .profiler import PhaseProfiler, PROFILES_DIRECTORY_NAME
 from .scheduler import JobSchedulerDatabase
 from .service import ServiceDataBase
+from .startup import StartupEngine
 from .user import User
 
 
@@ -85,11 +90,19 @@ class RootManager:
         self._project_configuration: Dict = {}
         self._cli_configuration: Dict = {}
         self._configuration: Configuration = None
+        self._configuration_cache: ConfigurationCache = ConfigurationCache(self.md / CACHE_FILE_NAME, VERSION)
         self._scheduler_database: JobSchedulerDatabase = None
         self._service_database: ServiceDataBase = None
         self._ip_database: IpDataBase = None
+        self._ip_index: IpIndex = IpIndex(self.md / INDEX_FILE_NAME)
+        self._rescan_ip: bool = False
+        self._profiler: PhaseProfiler = None
+        # Files are already warm in the daemon
+        self._concurrent_startup: bool = not in_daemon()
+        self._startup_engine: StartupEngine = None
         self._j2_env: jinja2.Environment = None
         self._current_phase: Phase = None
+        self._phase_durations: Dict[str, float] = {}
 
     def __str__(self):
         """
@@ -157,6 +170,43 @@ class RootManager:
         """
         return self._user_home_path
 
+    @property
+    def rescan_ip(self) -> bool:
+        """
+        :return: Whether to ignore the IP discovery index and search all IP locations in full
+        """
+        return self._rescan_ip
+    @rescan_ip.setter
+    def rescan_ip(self, value: bool):
+        self._rescan_ip = value
+
+    @property
+    def profiler(self) -> PhaseProfiler:
+        """
+        :return: Profiler of each phase, or None if profiling is disabled
+        """
+        return self._profiler
+    @profiler.setter
+    def profiler(self, value: PhaseProfiler):
+        self._profiler = value
+
+    @property
+    def concurrent_startup(self) -> bool:
+        """
+        :return: Whether to run the I/O of independent startup phases ahead of time (see `StartupEngine`)
+        """
+        return self._concurrent_startup
+    @concurrent_startup.setter
+    def concurrent_startup(self, value: bool):
+        self._concurrent_startup = value
+
+    @property
+    def startup_engine(self) -> StartupEngine:
+        """
+        :return: Engine running startup tasks for the current run, or None if concurrent startup is disabled
+        """
+        return self._startup_engine
+
     @property
     def print_trace(self) -> bool:
         """
@@ -231,6 +281,13 @@ class RootManager:
         """
         return self._configuration
 
+    @property
+    def configuration_cache(self) -> ConfigurationCache:
+        """
+        :return: Cache of the validated configuration space.
+        """
+        return self._configuration_cache
+
     @property
     def scheduler_database(self) -> JobSchedulerDatabase:
         """
@@ -252,6 +309,13 @@ class RootManager:
         """
         return self._ip_database
 
+    @property
+    def ip_index(self) -> IpIndex:
+        """
+        :return: The IP discovery index.
+        """
+        return self._ip_index
+
     @property
     def j2_env(self) -> jinja2.Environment:
         return self._j2_env
@@ -260,6 +324,7 @@ class RootManager:
         self._console.print(f"[MIO] {message}", style="")
 
     def info_md(self, message: str):
+        from rich.markdown import Markdown
         md = Markdown(message)
         self._console.print(md)
 
@@ -288,7 +353,153 @@ class RootManager:
         """
         return self._current_phase
     
+    @property
+    def phase_history(self) -> PhaseHistory:
+        """
+        :return: History of the phase durations of past runs in this directory.
+        """
+        return PhaseHistory(self.md / PHASE_HISTORY_FILE_NAME)
+
+    @property
+    def phase_durations(self) -> Dict[str, float]:
+        """
+        :return: Duration (ms) of each phase finished so far.
+        """
+        return self._phase_durations
+
     def run(self, command: Command) -> int:
+        start_timestamp: datetime = datetime.now()
+        return_code: int = 1
+        if self.profiler:
+            self.profiler.start()
+        if self.concurrent_startup:
+            self._startup_engine = self.create_startup_engine()
+            self.startup_engine.start()
+        try:
+            return_code = self.run_and_handle_errors(command)
+        finally:
+            if self.startup_engine:
+                self.startup_engine.shutdown()
+            if self.profiler:
+                self.save_profiles(start_timestamp)
+            else:
+                # Profiling overhead would skew the history
+                self.record_phase_durations(start_timestamp, return_code == 0)
+        return return_code
+
+    def save_profiles(self, start_timestamp: datetime):
+        """
+        Writes the profile dumps of each phase, by default to a new directory under the Moore.io temporary directory.
+        """
+        if not self.profiler.path:
+            command_name = self.command.name() if self.command else "mio"
+            self.profiler.path = (self.temp_dir / PROFILES_DIRECTORY_NAME /
+                                  f"{command_name}_{start_timestamp.strftime('%Y%m%d_%H%M%S_%f')}")
+        try:
+            self.info(f"Wrote profiles to '{self.profiler.save()}'")
+        except Exception as e:
+            self.error(f"Failed to write profiles to '{self.profiler.path}': {e}")
+
+    def record_phase_durations(self, start_timestamp: datetime, success: bool):
+        """
+        Appends the phase durations of this run to the phase history, if the Moore.io work directory exists and this is
+        not a test run.  Failures are ignored: the history is only informative.
+        """
+        if self.test_mode or (not self.command) or (not self.directory_exists(self.md)):
+            return
+        run = {
+            "timestamp": start_timestamp.isoformat(timespec="seconds"),
+            "version": VERSION,
+            "command": self.command.name(),
+            "success": success,
+            "duration": round((datetime.now() - start_timestamp).total_seconds() * 1000, 3),
+            "phases": self.phase_durations,
+        }
+        try:
+            self.phase_history.append(run)
+        except Exception as e:
+            self.debug(f"Failed to record phase durations to '{self.phase_history.path}': {e}")
+
+    def create_startup_engine(self) -> StartupEngine:
+        """
+        Declares the work of startup phases which can be done ahead of time, and which phases it depends on.
+        """
+        startup_engine = StartupEngine()
+        startup_engine.add_task("user_data", self.load_user_data_file)
+        startup_engine.add_task("configuration", self.load_configuration_space,
+                                ["load_default_configuration", "locate_project_file"])
+        startup_engine.add_task("scheduler_discovery", self.import_scheduler_modules, ["post_validate_configuration_space"])
+        startup_engine.add_task("ip_discovery", self.scan_ip_locations, ["post_validate_configuration_space"])
+        return startup_engine
+
+    def get_startup_result(self, name: str) -> Any:
+        """
+        :param name: Startup task name
+        :return: Result of the startup task, or None if it wasn't run or failed: the phase must then do the work itself,
+                 which reports errors as usual.
+        """
+        if not self.startup_engine:
+            return None
+        try:
+            return self.startup_engine.get_result(name)
+        except Exception as e:
+            self.debug(f"Startup task '{name}' failed: {e}")
+            return None
+
+    def load_user_data_file(self) -> Optional[Tuple[tuple, User]]:
+        """
+        Startup task for `phase_load_user_data()`.
+        :return: State of the user data file when it was read and the user data, or None if there is no file
+        """
+        file_stat_key = ConfigurationCache.get_stat_key(self._user_data_file_path)
+        if not self.file_exists(self._user_data_file_path):
+            return None
+        return file_stat_key, User.load(self._user_data_file_path)
+
+    def load_configuration_space(self) -> Tuple[tuple, Configuration]:
+        """
+        Startup task for `phase_validate_configuration_space()`: loads the configuration space from the cache, or parses
+        and validates the configuration files.
+        :return: Configuration cache key and configuration space
+        """
+        source_paths = [self.default_configuration_path, self.user_home_path / "mio.toml", self.project_configuration_path]
+        configuration_cache_key = self.configuration_cache.get_key(source_paths)
+        configuration = self.configuration_cache.load(configuration_cache_key)
+        if configuration is None:
+            merged_configuration = load_file(self.default_configuration_path, toml.load)
+            if self.file_exists(source_paths[1]):
+                merged_configuration = self.merge_dictionaries(merged_configuration, load_file(source_paths[1], toml.load))
+            if self.project_configuration_path:
+                merged_configuration = self.merge_dictionaries(merged_configuration,
+                                                               load_file(self.project_configuration_path, toml.load))
+            configuration = Configuration.model_validate(merged_configuration)
+            self.configuration_cache.save(configuration_cache_key, configuration)
+        return configuration_cache_key, configuration
+
+    def scan_ip_locations(self) -> Optional[Dict[Tuple[str, IpLocationType], tuple]]:
+        """
+        Startup task for `phase_ip_discovery()`: searches (and parses) the IP locations.
+        :return: Results of `IpDataBase.scan_ip_directory()` for each location and location type, or None if the command
+                 does not perform IP discovery
+        """
+        if not self.command.perform_ip_discovery:
+            return None
+        if self.rescan_ip:
+            self.ip_index.clear()
+        ip_database = IpDataBase(self)
+        scans: Dict[Tuple[str, IpLocationType], tuple] = {}
+        local_paths, global_paths = self.get_ip_discovery_paths()
+        for path in local_paths:
+            scans[(path, IpLocationType.PROJECT_USER)] = ip_database.scan_ip_directory(Path(path))
+        if any(ip_files for ip_files, ip_file_results in scans.values()):
+            for path in global_paths:
+                scans[(path, IpLocationType.GLOBAL)] = ip_database.scan_ip_directory(Path(path))
+            if not self.configuration.authentication.offline:
+                scans[(str(self.locally_installed_ip_dir), IpLocationType.PROJECT_INSTALLED)] = \
+                    ip_database.scan_ip_directory(self.locally_installed_ip_dir)
+        return scans
+
+    def run_and_handle_errors(self, command: Command) -> int:
         if self.test_mode:
             try:
                 self.run_sequence(command)
@@ -442,6 +653,8 @@ class RootManager:
         :return: A `Phase` object representing the newly created phase.
         """
         self._current_phase = Phase(self, name)
+        if self.profiler:
+            self.profiler.start_phase(name)
         self.debug(f"Starting phase '{name}': {self._current_phase.init_timestamp}")
         return self._current_phase
     
@@ -451,6 +664,8 @@ class RootManager:
         :param phase: The phase to be checked.
         :return: None.
         """
+        if self.profiler:
+            self.profiler.stop_phase()
         if not phase.has_finished():
             if phase.error:
                 raise RuntimeError(f"Phase '{phase}' has encountered an error: {phase.error}")
@@ -458,6 +673,9 @@ class RootManager:
                 raise RuntimeError(f"Phase '{phase}' has not finished properly")
         else:
             self.debug(f"Finished phase '{phase}': {phase.duration.total_seconds()} seconds")
+            self._phase_durations[phase.name] = round(phase.duration.total_seconds() * 1000, 3)
+            if self.startup_engine:
+                self.startup_engine.set_finished(phase.name)
         if phase.end_process and phase.error:
             raise PhaseEndProcessException(phase.end_process_message)
         elif phase.end_process and not phase.error:
@@ -594,6 +812,22 @@ class RootManager:
         except OSError as e:
             print(f"An error occurred while copying directory from '{src}' to '{dst}': {e}")
 
+    def sync_directory(self, src: Path, dst: Path):
+        """
+        Mirror a directory from src to dst, only copying the files which have changed since the last sync.
+        :param src: Path to the source directory.
+        :param dst: Path to the destination, which must not be modified by anything else.
+        """
+        self.debug(f"Syncing directory from '{src}' to '{dst}'")
+        directory_sync = DirectorySync(src, dst)
+        try:
+            directory_sync.sync()
+        except OSError as e:
+            print(f"An error occurred while syncing directory from '{src}' to '{dst}': {e}")
+        else:
+            self.debug(f"Synced directory '{dst}': {directory_sync.num_copied_files} file(s) copied, "
+                       f"{directory_sync.num_unchanged_files} unchanged, {directory_sync.num_removed_files} removed")
+
     def remove_directory(self, path: Path):
         """
         Remove a directory at the specified path.
@@ -1064,18 +1298,15 @@ class RootManager:
         self._j2_env = jinja2.Environment(loader=template_loader)
 
     def phase_load_default_configuration(self, phase: Phase):
+        # Configuration files are only parsed if the configuration cache misses (see `phase_validate_configuration_space`)
         self._default_configuration_path = self._install_path / 'data' / 'defaults.toml'
-        try:
-            with open(self.default_configuration_path, 'r') as f:
-                self._default_configuration = toml.load(f)
-        except ValidationError as e:
-            phase.error = Exception(
-                f"Failed to load default configuration file at '{self.default_configuration_path}': {e}")
-        else:
-            self.debug(f"Loaded default configuration from '{self.default_configuration_path}':\n{self._default_configuration}")
 
     def phase_load_user_data(self, phase: Phase):
         if self.file_exists(self._user_data_file_path):
+            prefetched_user_data = self.get_startup_result("user_data")
+            if prefetched_user_data and (prefetched_user_data[0] == ConfigurationCache.get_stat_key(self._user_data_file_path)):
+                self._user = prefetched_user_data[1]
+                return
             try:
                 self._user = User.load(self._user_data_file_path)
             except ValidationError as e:
@@ -1106,6 +1337,7 @@ class RootManager:
                 }
                 final_url: str = f"{self.url_api}/auth/login/"
                 try:
+                    import requests
                     session = requests.Session()
                     response = session.post(final_url, data=credentials)
                     response.raise_for_status()  # Raise an error for bad status codes
@@ -1118,6 +1350,7 @@ class RootManager:
 
     def deauthenticate(self, phase: Phase):
         final_url: str = f"{self.url_api}/auth/logout/"
+        import requests
         try:
             session = requests.Session()
             session.cookies = requests.utils.cookiejar_from_dict(self.user.session_cookies)
@@ -1135,6 +1368,7 @@ class RootManager:
 
         final_url = f"{self.url_api}/{path}" if use_api_as_base else f"{self.url_base}/{path}"
 
+        import requests
         session = requests.Session()
         session.cookies = requests.utils.cookiejar_from_dict(self.user.session_cookies)
         session.headers.update(self.user.session_headers)
@@ -1187,6 +1421,10 @@ class RootManager:
             raise Exception(f"Error during Web API {method} to '{final_url}': {e}") from e
 
     def phase_save_user_data(self, phase: Phase):
+        # Home directories may be shared (NFS) by many concurrent invocations: only write when necessary
+        if not self._user.dirty:
+            self.debug(f"User data at '{self._user_data_file_path}' is unchanged")
+            return
         try:
             self._user.save(self._user_data_file_path)
             self.debug(f"Saved user data to '{self._user_data_file_path}'")
@@ -1222,60 +1460,94 @@ class RootManager:
             if self.command.executes_main_phase:
                 phase.error = Exception("Could not find project root path")
             return
-        try:
-            with open(self.project_configuration_path, 'r') as f:
-                self._project_configuration = toml.load(f)
-        except ValidationError as e:
-            phase.error = Exception(
-                f"Failed to load Project configuration file at '{self.project_configuration_path}': {e}")
-        else:
-            self._project_root_path = self.project_configuration_path.parent
-            self.debug(f"Loaded project configuration from '{self.project_configuration_path}':\n{self._project_configuration}")
+        self._project_root_path = self.project_configuration_path.parent
 
     def phase_load_user_configuration(self, phase: Phase):
+        # Optional: the home directory is not written to if it doesn't exist
         self._user_configuration_path = self.user_home_path / "mio.toml"
-        if self.file_exists(self.user_configuration_path):
+
+    def phase_validate_configuration_space(self, phase):
+        # The cache key is computed before reading the files: edits made while they are being read invalidate the entry
+        source_paths = [self.default_configuration_path, self.user_configuration_path, self.project_configuration_path]
+        configuration_cache_key = self.configuration_cache.get_key(source_paths)
+        prefetched_configuration = self.get_startup_result("configuration")
+        if prefetched_configuration and (prefetched_configuration[0] == configuration_cache_key):
+            self._configuration = prefetched_configuration[1]
+            self.debug(f"Loaded configuration space ahead of time")
+        else:
+            self._configuration = self.configuration_cache.load(configuration_cache_key)
+            if self.configuration is not None:
+                self.debug(f"Loaded configuration space from cache '{self.configuration_cache.path}'")
+        if self.configuration is None:
+            self.load_configuration_files(phase)
+            if phase.error:
+                return
+            merged_configuration = self.merge_dictionaries(self._default_configuration, self._user_configuration)
+            merged_configuration = self.merge_dictionaries(merged_configuration, self._project_configuration)
             try:
-                with open(self.user_configuration_path, 'r') as f:
-                    self._user_configuration = toml.load(f)
+                self._configuration = Configuration.model_validate(merged_configuration)
             except ValidationError as e:
-                phase.error = Exception(f"Failed to load User configuration at '{self.user_configuration_path}': {e}")
+                errors = e.errors()
+                error_messages = "\n  ".join([f"{error['msg']}: {error['loc']}" for error in errors])
+                phase.error = Exception(f"Failed to validate Configuration Space: {error_messages}")
+                return
+            self.configuration_cache.save(configuration_cache_key, self.configuration)
+            self.debug(f"Final configuration tree:\n{merged_configuration}")
+        self.configuration.check()
+        if self._test_mode:
+            self._url_base = "http://localhost:8000"
+            self._url_api = f"{self._url_base}/api"
         else:
-            self.create_file(self.user_configuration_path)
-            self.debug(f"Loaded user configuration from '{self.user_configuration_path}':\n{self._user_configuration}")
+            self._url_base = self.configuration.authentication.server_url
+            self._url_api = self.configuration.authentication.server_api_url
 
-    def phase_validate_configuration_space(self, phase):
-        merged_configuration = self.merge_dictionaries(self._default_configuration, self._user_configuration)
-        merged_configuration = self.merge_dictionaries(merged_configuration, self._project_configuration)
+    def load_configuration_files(self, phase: Phase):
+        """
+        Parses the default, User and Project configuration files.
+        :param phase: Phase in which errors are reported
+        """
         try:
-            self._configuration = Configuration.model_validate(merged_configuration)
-        except ValidationError as e:
-            errors = e.errors()
-            error_messages = "\n  ".join([f"{error['msg']}: {error['loc']}" for error in errors])
-            phase.error = Exception(f"Failed to validate Configuration Space: {error_messages}")
-        else:
-            self.configuration.check()
-            if self._test_mode:
-                self._url_base = "http://localhost:8000"
-                self._url_api = f"{self._url_base}/api"
-            else:
-                self._url_base = self.configuration.authentication.server_url
-                self._url_api = self.configuration.authentication.server_api_url
-            self.debug(f"Final configuration tree:\n{merged_configuration}")
+            self._default_configuration = load_file(self.default_configuration_path, toml.load)
+        except Exception as e:
+            phase.error = Exception(
+                f"Failed to load default configuration file at '{self.default_configuration_path}': {e}")
+            return
+        self.debug(f"Loaded default configuration from '{self.default_configuration_path}':\n{self._default_configuration}")
+        if self.file_exists(self.user_configuration_path):
+            try:
+                self._user_configuration = load_file(self.user_configuration_path, toml.load)
+            except Exception as e:
+                phase.error = Exception(f"Failed to load User configuration at '{self.user_configuration_path}': {e}")
+                return
+            self.debug(f"Loaded user configuration from '{self.user_configuration_path}':\n{self._user_configuration}")
+        if self.project_configuration_path:
+            try:
+                self._project_configuration = load_file(self.project_configuration_path, toml.load)
+            except Exception as e:
+                phase.error = Exception(
+                    f"Failed to load Project configuration file at '{self.project_configuration_path}': {e}")
+                return
+            self.debug(f"Loaded project configuration from '{self.project_configuration_path}':\n{self._project_configuration}")
 
     def relocate_data_files(self, phase: Phase):
         if self.configuration.project.local_mode:
             self.debug(f"Relocating MIO data files to project")
             new_data_files_path = self.temp_dir / "mio_data_files"
-            if self.directory_exists(new_data_files_path):
-                self.remove_directory(new_data_files_path)
-            self.copy_directory(self._data_files_path, new_data_files_path)
+            self.sync_directory(self._data_files_path, new_data_files_path)
             self._data_files_path = new_data_files_path
 
     def phase_scheduler_discovery(self, phase: Phase):
+        # Schedulers are constructed here, on the main thread: only their modules are imported ahead of time
+        self.get_startup_result("scheduler_discovery")
         self._scheduler_database = JobSchedulerDatabase(self)
         self.scheduler_database.discover_schedulers()
 
+    def import_scheduler_modules(self):
+        """
+        Startup task for `phase_scheduler_discovery()`: imports the scheduler modules.
+        """
+        JobSchedulerDatabase(self).import_scheduler_modules()
+
     def phase_service_discovery(self, phase: Phase):
         self._service_database = ServiceDataBase(self)
         self.service_database.discover_services()
@@ -1287,19 +1559,35 @@ class RootManager:
         :return: None
         """
         self._ip_database = IpDataBase(self)
-        local_paths = [os.path.join(self.project_root_path, path) for path in self.configuration.ip.local_paths]
-        global_paths = [os.path.expanduser(path) for path in self.configuration.ip.global_paths]
+        # Locations which were searched ahead of time, in case the configuration has changed since
+        scans = self.get_startup_result("ip_discovery")
+        if scans is None:
+            scans = {}
+            if self.rescan_ip:
+                self.ip_index.clear()
+        local_paths, global_paths = self.get_ip_discovery_paths()
         for path in local_paths:
-            self.ip_database.discover_ip(Path(path), IpLocationType.PROJECT_USER)
+            self.ip_database.discover_ip(Path(path), IpLocationType.PROJECT_USER,
+                                         scan=scans.get((path, IpLocationType.PROJECT_USER)))
         if not self.ip_database.has_ip:
             phase.warning = Exception("No IP definitions found in the project")
         else:
             for path in global_paths:
-                self.ip_database.discover_ip(Path(path), IpLocationType.GLOBAL)
+                self.ip_database.discover_ip(Path(path), IpLocationType.GLOBAL,
+                                             scan=scans.get((path, IpLocationType.GLOBAL)))
             if not self.configuration.authentication.offline:
-                self.ip_database.discover_ip(self.locally_installed_ip_dir, IpLocationType.PROJECT_INSTALLED)
+                self.ip_database.discover_ip(self.locally_installed_ip_dir, IpLocationType.PROJECT_INSTALLED,
+                                             scan=scans.get((str(self.locally_installed_ip_dir), IpLocationType.PROJECT_INSTALLED)))
                 self.ip_database.resolve_local_dependencies()
 
+    def get_ip_discovery_paths(self) -> Tuple[List[str], List[str]]:
+        """
+        :return: Project and global IP locations
+        """
+        local_paths = [os.path.join(self.project_root_path, path) for path in self.configuration.ip.local_paths]
+        global_paths = [os.path.expanduser(path) for path in self.configuration.ip.global_paths]
+        return local_paths, global_paths
+
     def phase_check(self, phase: Phase):
         pass
 
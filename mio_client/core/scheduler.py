@@ -1,17 +1,28 @@
 # Copyright 2020-2025 Datum Technology Corporation
 # All rights reserved.
 #######################################################################################################################
+import hashlib
 import importlib
 import os
+import shlex
+import shutil
+import subprocess
 import sys
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import List
+from typing import List, IO, BinaryIO, Tuple, Dict, Optional, Set
 from datetime import datetime
+
+import yaml
 from semantic_version import Version
 import atexit
 import signal
 
+from .plugin_cache import PluginCache, SCHEDULER_PLUGIN_CACHE_FILE_NAME
+
 
 class Job:
     def __init__(self, rmh: 'RootManager', wd: Path, name: str, binary: Path, arguments: List[str]):
@@ -29,8 +40,18 @@ class Job:
         self._dry_run:bool = False
         self._is_part_of_set:bool = False
         self._parent_set:'JobSet' = None
+        self._cpu_slots:int = 1
+        self._memory:float = 0
+        self._license_tokens:Dict[str, int] = {}
+        self._input_files:List[Path] = []
+        self._input_file_lists:List[Path] = []
+        self._output_files:List[Path] = []
+        self._dependencies:List['Job'] = []
+        self._use_shell:bool = True
 
     def __str__(self):
+        if not self.use_shell:
+            return shlex.join([self._binary.name] + [str(arg) for arg in self.arguments])
         string: str = f"{self._binary.name}"
         for arg in self.arguments:
             string += f" {arg}"
@@ -114,6 +135,105 @@ class Job:
             self._is_part_of_set = True
         self._parent_set = value
 
+    @property
+    def cpu_slots(self) -> int:
+        return self._cpu_slots
+    @cpu_slots.setter
+    def cpu_slots(self, value: int):
+        self._cpu_slots = value
+
+    @property
+    def memory(self) -> float:
+        """
+        Memory (in GiB) needed by the job.
+        """
+        return self._memory
+    @memory.setter
+    def memory(self, value: float):
+        self._memory = value
+
+    @property
+    def license_tokens(self) -> Dict[str, int]:
+        return self._license_tokens
+    @license_tokens.setter
+    def license_tokens(self, value: Dict[str, int]):
+        self._license_tokens = value
+
+    @property
+    def input_files(self) -> List[Path]:
+        """
+        Files and directories read by the job.  Used to determine if the job's cached results can be re-used.
+        """
+        return self._input_files
+    @input_files.setter
+    def input_files(self, value: List[Path]):
+        self._input_files = value
+
+    @property
+    def input_file_lists(self) -> List[Path]:
+        """
+        File lists (.flist) read by the job.  The files and include directories they reference are inputs as well.
+        """
+        return self._input_file_lists
+    @input_file_lists.setter
+    def input_file_lists(self, value: List[Path]):
+        self._input_file_lists = value
+
+    @property
+    def output_files(self) -> List[Path]:
+        """
+        Files and directories produced by the job.  Restored when the job's cached results are re-used.
+        """
+        return self._output_files
+    @output_files.setter
+    def output_files(self, value: List[Path]):
+        self._output_files = value
+
+    @property
+    def dependencies(self) -> List['Job']:
+        """
+        Jobs that must succeed before this job can run when dispatched as part of a JobGraph.
+        """
+        return self._dependencies
+
+    @property
+    def use_shell(self) -> bool:
+        """
+        If True, the arguments are shell fragments and the job is run via '/bin/sh -c'.  If False, each argument is a
+        single argv entry and the binary is executed directly, without quoting and without an intermediate shell.
+        """
+        return self._use_shell
+    @use_shell.setter
+    def use_shell(self, value: bool):
+        self._use_shell = value
+
+    @property
+    def is_cacheable(self) -> bool:
+        return (len(self.input_files) + len(self.input_file_lists)) > 0
+
+    @property
+    def command_line(self) -> str:
+        """
+        Command line suitable for execution by a shell, for both shell and direct jobs.
+        """
+        if self.use_shell:
+            return "  ".join(self.pre_arguments + [str(self.binary)] + self.arguments)
+        return shlex.join(self.pre_arguments + [str(self.binary)] + [str(arg) for arg in self.arguments])
+
+    def get_argv(self, path: str) -> List[str]:
+        """
+        Returns the argv of a direct job, with the binary resolved against `path` if it is a bare name.
+        """
+        if self.pre_arguments:
+            raise Exception(f"Job '{self.name}' has pre-arguments and must be run via a shell")
+        binary: str = str(self.binary)
+        if os.sep not in binary:
+            resolved_binary: str = shutil.which(binary, path=path)
+            if resolved_binary is None:
+                raise Exception(f"Could not find binary '{binary}' for job '{self.name}'")
+            binary = resolved_binary
+        return [binary] + [str(arg) for arg in self.arguments]
+
     def write_to_file(self, file_path: Path):
         with file_path.open('w') as file:
             file.write(str(self))
@@ -133,11 +253,48 @@ class JobSet:
     def name(self) -> str:
         return self._name
 
+    @property
+    def tasks(self) -> List[Job]:
+        return self._tasks
+
     def add_task(self, task: Job):
         task.parent_set = self
         self._tasks.append(task)
 
 
+class JobGraph:
+    """
+    Jobs and the dependencies between them.  Jobs must be added after the jobs they depend on, which guarantees that the
+    graph has no cycles and that `tasks` is in a valid execution order.
+    """
+    def __init__(self, rmh: 'RootManager', name: str):
+        self._rmh:'RootManager' = rmh
+        self._name: str = name
+        self._tasks: List[Job] = []
+
+    @property
+    def rmh(self) -> 'RootManager':
+        return self._rmh
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def tasks(self) -> List[Job]:
+        return self._tasks
+
+    def add_task(self, task: Job, dependencies: List[Job]=None):
+        if dependencies:
+            for dependency in dependencies:
+                if dependency not in task.dependencies:
+                    task.dependencies.append(dependency)
+        for dependency in task.dependencies:
+            if dependency not in self._tasks:
+                raise Exception(f"Job '{dependency.name}' must be added to job graph '{self.name}' before job '{task.name}'")
+        self._tasks.append(task)
+
+
 class JobSchedulerConfiguration:
     def __init__(self, rmh: 'RootManager'):
         self._output_to_terminal: bool = True
@@ -147,6 +304,14 @@ class JobSchedulerConfiguration:
         self._job_set: JobSet
         self._timeout: float = 60
         self._kill_job_on_termination = True
+        self._tee_output_to_terminal: bool = False
+        self._output_log_directory: Path = None
+        self._output_log_max_size: int = 64 * 1024 * 1024
+        self._output_log_max_count: int = 3
+        self._output_tail_size: int = 1024 * 1024
+        self._use_job_cache: bool = False
+        self._idle_timeout: float = 0
+        self._termination_grace_period: float = 5
 
     @property
     def output_to_terminal(self) -> bool:
@@ -196,6 +361,552 @@ class JobSchedulerConfiguration:
     def kill_job_on_termination(self, value: bool):
         self._kill_job_on_termination = value
 
+    @property
+    def tee_output_to_terminal(self) -> bool:
+        return self._tee_output_to_terminal
+    @tee_output_to_terminal.setter
+    def tee_output_to_terminal(self, value: bool):
+        self._tee_output_to_terminal = value
+
+    @property
+    def output_log_directory(self) -> Path:
+        return self._output_log_directory
+    @output_log_directory.setter
+    def output_log_directory(self, value: Path):
+        self._output_log_directory = value
+
+    @property
+    def output_log_max_size(self) -> int:
+        return self._output_log_max_size
+    @output_log_max_size.setter
+    def output_log_max_size(self, value: int):
+        self._output_log_max_size = value
+
+    @property
+    def output_log_max_count(self) -> int:
+        return self._output_log_max_count
+    @output_log_max_count.setter
+    def output_log_max_count(self, value: int):
+        self._output_log_max_count = value
+
+    @property
+    def output_tail_size(self) -> int:
+        return self._output_tail_size
+    @output_tail_size.setter
+    def output_tail_size(self, value: int):
+        self._output_tail_size = value
+
+    @property
+    def idle_timeout(self) -> float:
+        """
+        Jobs whose captured output does not grow for this many minutes are considered hung and are killed.  0 disables
+        the watchdog, which does not apply to jobs whose output goes directly to the terminal.
+        """
+        return self._idle_timeout
+    @idle_timeout.setter
+    def idle_timeout(self, value: float):
+        self._idle_timeout = value
+
+    @property
+    def termination_grace_period(self) -> float:
+        """
+        Seconds given to the processes of a job to exit after SIGTERM before they are sent SIGKILL.
+        """
+        return self._termination_grace_period
+    @termination_grace_period.setter
+    def termination_grace_period(self, value: float):
+        self._termination_grace_period = value
+
+    @property
+    def use_job_cache(self) -> bool:
+        """
+        Replay the cached results of jobs whose inputs have not changed instead of running them again.  Only applies to
+        jobs that declare their inputs.
+        """
+        return self._use_job_cache
+    @use_job_cache.setter
+    def use_job_cache(self, value: bool):
+        self._use_job_cache = value
+
+
+class JobOutputSink:
+    """
+    Receives the output of a job as it is produced: writes it to a rotating log file, optionally tees it to the
+    terminal and keeps only the last `tail_size` bytes in memory.
+    """
+    def __init__(self, log_file_path: Path=None, max_log_size: int=0, max_log_count: int=0, tail_size: int=0,
+                 tee_stream: IO=None):
+        self._log_file_path: Path = log_file_path
+        self._max_log_size: int = max_log_size
+        self._max_log_count: int = max_log_count
+        self._tail_size: int = tail_size
+        self._tee_stream: IO = tee_stream
+        self._tail: bytearray = bytearray()
+        self._log_file: BinaryIO = None
+        self._log_size: int = 0
+        self._last_write_time: float = time.monotonic()
+        if self._log_file_path:
+            self._log_file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._log_file = self._log_file_path.open('wb')
+
+    @property
+    def log_file_path(self) -> Path:
+        return self._log_file_path
+
+    @property
+    def tail(self) -> str:
+        return self._tail.decode(errors="replace")
+
+    @property
+    def last_write_time(self) -> float:
+        """
+        time.monotonic() of the last output received (or of the sink's creation).
+        """
+        return self._last_write_time
+
+    def write(self, data: bytes):
+        if not data:
+            return
+        self._last_write_time = time.monotonic()
+        if self._log_file:
+            if self._max_log_size and (self._log_size + len(data) > self._max_log_size) and (self._log_size > 0):
+                self.rotate()
+            self._log_file.write(data)
+            self._log_size += len(data)
+        if self._tee_stream:
+            self._tee_stream.write(data.decode(errors="replace"))
+            self._tee_stream.flush()
+        self._tail.extend(data)
+        if len(self._tail) > self._tail_size:
+            del self._tail[:len(self._tail) - self._tail_size]
+
+    def rotate(self):
+        self._log_file.close()
+        for index in range(self._max_log_count - 1, 0, -1):
+            source = self._log_file_path.with_name(f"{self._log_file_path.name}.{index}")
+            if source.exists():
+                source.replace(self._log_file_path.with_name(f"{self._log_file_path.name}.{index + 1}"))
+        if self._max_log_count > 0:
+            self._log_file_path.replace(self._log_file_path.with_name(f"{self._log_file_path.name}.1"))
+        self._log_file = self._log_file_path.open('wb')
+        self._log_size = 0
+
+    def drain(self, pipe: BinaryIO, chunk_size: int=64 * 1024):
+        """
+        Reads `pipe` until EOF.  Meant to be run in its own thread while the job is running.
+        """
+        for chunk in iter(lambda: pipe.read1(chunk_size), b""):
+            self.write(chunk)
+        pipe.close()
+
+    def drain_in_thread(self, pipe: BinaryIO) -> threading.Thread:
+        thread = threading.Thread(target=self.drain, args=(pipe,), daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+
+
+
+class JobAdmissionController:
+    """
+    Only lets a job start once the resources it declares (CPU slots, memory and named license tokens) are available
+    in the configured pools.  Pools that are not configured (None) are unlimited, as are license tokens without a
+    configured count.
+    """
+    def __init__(self, cpu_slots: int=None, memory: float=None, license_tokens: Dict[str, int]=None):
+        self._cpu_slots: int = cpu_slots
+        self._memory: float = memory
+        self._license_tokens: Dict[str, int] = dict(license_tokens) if license_tokens else {}
+        self._cpu_slots_in_use: int = 0
+        self._memory_in_use: float = 0
+        self._license_tokens_in_use: Dict[str, int] = {}
+        self._condition: threading.Condition = threading.Condition()
+
+    @classmethod
+    def from_configuration(cls, rmh: 'RootManager') -> 'JobAdmissionController':
+        if rmh.configuration and rmh.configuration.scheduling:
+            scheduling = rmh.configuration.scheduling
+            return cls(scheduling.cpu_slots, scheduling.memory, scheduling.license_tokens)
+        return cls()
+
+    @property
+    def cpu_slots(self) -> int:
+        return self._cpu_slots
+
+    @property
+    def memory(self) -> float:
+        return self._memory
+
+    @property
+    def license_tokens(self) -> Dict[str, int]:
+        return self._license_tokens
+
+    def check(self, job: Job, local_resources: bool=True):
+        if local_resources:
+            if (self.cpu_slots is not None) and (job.cpu_slots > self.cpu_slots):
+                raise Exception(f"Job '{job.name}' needs {job.cpu_slots} CPU slots but only {self.cpu_slots} are configured")
+            if (self.memory is not None) and (job.memory > self.memory):
+                raise Exception(f"Job '{job.name}' needs {job.memory}GiB of memory but only {self.memory}GiB is configured")
+        for token, count in job.license_tokens.items():
+            if (token in self.license_tokens) and (count > self.license_tokens[token]):
+                raise Exception(f"Job '{job.name}' needs {count} '{token}' license token(s) but only {self.license_tokens[token]} are configured")
+
+    def fits(self, job: Job, local_resources: bool=True) -> bool:
+        if local_resources:
+            if (self.cpu_slots is not None) and (self._cpu_slots_in_use + job.cpu_slots > self.cpu_slots):
+                return False
+            if (self.memory is not None) and (self._memory_in_use + job.memory > self.memory):
+                return False
+        for token, count in job.license_tokens.items():
+            if token in self.license_tokens:
+                if self._license_tokens_in_use.get(token, 0) + count > self.license_tokens[token]:
+                    return False
+        return True
+
+    def acquire(self, job: Job, local_resources: bool=True):
+        """
+        Blocks until the job's resources are available and reserves them.
+        """
+        self.check(job, local_resources)
+        with self._condition:
+            while not self.fits(job, local_resources):
+                self._condition.wait()
+            if local_resources:
+                self._cpu_slots_in_use += job.cpu_slots
+                self._memory_in_use += job.memory
+            for token, count in job.license_tokens.items():
+                self._license_tokens_in_use[token] = self._license_tokens_in_use.get(token, 0) + count
+
+    def release(self, job: Job, local_resources: bool=True):
+        with self._condition:
+            if local_resources:
+                self._cpu_slots_in_use -= job.cpu_slots
+                self._memory_in_use -= job.memory
+            for token, count in job.license_tokens.items():
+                self._license_tokens_in_use[token] -= count
+            self._condition.notify_all()
+
+
+class JobResultCache:
+    """
+    Content-addressed store of the results of successful jobs.  The key of a job is a hash of its command line, its
+    environment and the contents of its declared inputs; each entry holds the job's return code, the tail of its output
+    and a copy of its declared outputs.
+    """
+    def __init__(self, directory: Path, max_entries: int=16):
+        self._directory: Path = directory
+        self._max_entries: int = max_entries
+        self._lock: threading.Lock = threading.Lock()
+        self._file_hashes: Dict[Tuple[str, int, int], str] = {}
+
+    @classmethod
+    def from_configuration(cls, rmh: 'RootManager') -> 'JobResultCache':
+        if rmh.configuration and rmh.configuration.scheduling:
+            return cls(rmh.md / "job_cache", rmh.configuration.scheduling.job_cache_max_entries)
+        return cls(rmh.md / "job_cache")
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries
+
+    def get_key(self, job: Job) -> str:
+        digest = hashlib.sha256()
+        def add(value: str):
+            digest.update(value.encode(errors="replace"))
+            digest.update(b"\0")
+        add(str(job.wd))
+        binary_path = Path(job.binary)
+        if binary_path.is_file():
+            binary_stat = binary_path.stat()
+            add(f"{binary_path}:{binary_stat.st_size}:{binary_stat.st_mtime_ns}")
+        else:
+            add(str(binary_path))
+        for argument in job.pre_arguments + job.arguments:
+            add(str(argument))
+        for variable in sorted(job.env_vars):
+            add(f"{variable}={os.environ.get(variable, job.env_vars[variable])}")
+        add(job.pre_path)
+        add(job.post_path)
+        for input_path in job.input_files:
+            self.add_path_to_digest(add, self.resolve_path(job, input_path))
+        for file_list_path in job.input_file_lists:
+            self.add_file_list_to_digest(add, job, self.resolve_path(job, file_list_path), [])
+        return digest.hexdigest()
+
+    def resolve_path(self, job: Job, path: Path) -> Path:
+        path = Path(path)
+        if not path.is_absolute():
+            path = Path(job.wd) / path
+        return path
+
+    def hash_file(self, file_path: Path) -> str:
+        file_stat = file_path.stat()
+        signature = (str(file_path), file_stat.st_size, file_stat.st_mtime_ns)
+        with self._lock:
+            if signature in self._file_hashes:
+                return self._file_hashes[signature]
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        with self._lock:
+            self._file_hashes[signature] = digest.hexdigest()
+        return self._file_hashes[signature]
+
+    def add_path_to_digest(self, add, path: Path, recursive: bool=True):
+        if path.is_file():
+            add(f"{path}:{self.hash_file(path)}")
+        elif path.is_dir():
+            if recursive:
+                files = sorted(file for file in path.rglob("*") if file.is_file())
+            else:
+                files = sorted(file for file in path.iterdir() if file.is_file())
+            add(f"{path}/")
+            for file in files:
+                add(f"{file}:{self.hash_file(file)}")
+        else:
+            raise Exception(f"Job input '{path}' does not exist")
+
+    def add_file_list_to_digest(self, add, job: Job, file_list_path: Path, visited: List[Path]):
+        if file_list_path in visited:
+            return
+        visited.append(file_list_path)
+        self.add_path_to_digest(add, file_list_path)
+        with open(file_list_path, 'r') as file_list:
+            for line in file_list:
+                line = line.strip()
+                if (not line) or line.startswith("#") or line.startswith("//"):
+                    continue
+                if line.startswith("+incdir+"):
+                    for directory in line[len("+incdir+"):].split("+"):
+                        if directory:
+                            # Included files are searched for in the directory itself, not its sub-directories
+                            self.add_path_to_digest(add, self.resolve_path(job, directory), recursive=False)
+                elif line.startswith("-f ") or line.startswith("-F "):
+                    self.add_file_list_to_digest(add, job, self.resolve_path(job, line[3:].strip()), visited)
+                elif line.startswith("+") or line.startswith("-"):
+                    continue
+                else:
+                    self.add_path_to_digest(add, self.resolve_path(job, line))
+
+    def get_signature(self, path: Path) -> str:
+        """
+        Cheap fingerprint of an output, used to skip restoring outputs that have not changed since they were cached.
+        """
+        if path.is_file():
+            file_stat = path.stat()
+            return f"{file_stat.st_size}:{file_stat.st_mtime_ns}"
+        elif path.is_dir():
+            digest = hashlib.sha256()
+            for file in sorted(file for file in path.rglob("*") if file.is_file()):
+                file_stat = file.stat()
+                digest.update(f"{file.relative_to(path)}:{file_stat.st_size}:{file_stat.st_mtime_ns}\0".encode())
+            return digest.hexdigest()
+        return ""
+
+    def replay(self, job: Job, key: str) -> 'JobResults':
+        """
+        Returns the cached results of the job (restoring its outputs) or None if there are none.
+        """
+        entry_path: Path = self.directory / key
+        results_file_path: Path = entry_path / "results.yml"
+        if not results_file_path.is_file():
+            return None
+        with open(results_file_path, 'r') as results_file:
+            data = yaml.safe_load(results_file)
+        outputs: List[Dict[str, str]] = data.get("outputs", [])
+        if len(outputs) != len(job.output_files):
+            return None
+        for index, output in enumerate(outputs):
+            output_path: Path = self.resolve_path(job, job.output_files[index])
+            if str(output_path) != output["path"]:
+                return None
+            if self.get_signature(output_path) != output["signature"]:
+                cached_output_path: Path = entry_path / "outputs" / str(index)
+                if output_path.is_dir():
+                    shutil.rmtree(output_path)
+                elif output_path.exists():
+                    output_path.unlink()
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                if cached_output_path.is_dir():
+                    shutil.copytree(cached_output_path, output_path)
+                elif cached_output_path.is_file():
+                    shutil.copy2(cached_output_path, output_path)
+        os.utime(entry_path)
+        results = JobResults()
+        results.return_code = data["return_code"]
+        results.stdout = data.get("stdout", "")
+        results.stderr = data.get("stderr", "")
+        results.timestamp_start = datetime.now()
+        results.timestamp_end = results.timestamp_start
+        return results
+
+    def store(self, job: Job, key: str, results: 'JobResults'):
+        """
+        Caches the results of the job.  Only successful jobs are cached.
+        """
+        if results.return_code != 0:
+            return
+        entry_path: Path = self.directory / key
+        if entry_path.exists():
+            return
+        temp_entry_path: Path = self.directory / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if temp_entry_path.exists():
+            shutil.rmtree(temp_entry_path)
+        (temp_entry_path / "outputs").mkdir(parents=True)
+        outputs: List[Dict[str, str]] = []
+        for index, output_path in enumerate(job.output_files):
+            output_path = self.resolve_path(job, output_path)
+            cached_output_path: Path = temp_entry_path / "outputs" / str(index)
+            if output_path.is_dir():
+                shutil.copytree(output_path, cached_output_path)
+            elif output_path.is_file():
+                shutil.copy2(output_path, cached_output_path)
+            outputs.append({"path": str(output_path), "signature": self.get_signature(output_path)})
+        data = {
+            "return_code": results.return_code,
+            "stdout": results.stdout if results.stdout else "",
+            "stderr": results.stderr if results.stderr else "",
+            "outputs": outputs,
+        }
+        with open(temp_entry_path / "results.yml", 'w') as results_file:
+            yaml.safe_dump(data, results_file)
+        try:
+            temp_entry_path.rename(entry_path)
+        except OSError:
+            # Another process cached the same job first
+            shutil.rmtree(temp_entry_path, ignore_errors=True)
+        self.prune()
+
+    def prune(self):
+        """
+        Removes the least recently used entries beyond `max_entries`.
+        """
+        with self._lock:
+            entries = [entry for entry in self.directory.iterdir() if entry.is_dir() and not entry.name.endswith(".tmp")]
+            entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+            for entry in entries[self.max_entries:]:
+                shutil.rmtree(entry, ignore_errors=True)
+
+
+class JobResourceUsage:
+    """
+    Operating system resource usage of a job's process and of all the processes it waited for.
+    """
+    def __init__(self):
+        self._user_cpu_time: float = 0
+        self._system_cpu_time: float = 0
+        self._max_rss: int = 0
+        self._block_input_operations: int = 0
+        self._block_output_operations: int = 0
+        self._voluntary_context_switches: int = 0
+        self._involuntary_context_switches: int = 0
+
+    @classmethod
+    def from_rusage(cls, rusage) -> 'JobResourceUsage':
+        usage = cls()
+        usage.user_cpu_time = rusage.ru_utime
+        usage.system_cpu_time = rusage.ru_stime
+        # Reported in bytes on macOS, in KiB everywhere else
+        usage.max_rss = (rusage.ru_maxrss // 1024) if sys.platform == "darwin" else rusage.ru_maxrss
+        usage.block_input_operations = rusage.ru_inblock
+        usage.block_output_operations = rusage.ru_oublock
+        usage.voluntary_context_switches = rusage.ru_nvcsw
+        usage.involuntary_context_switches = rusage.ru_nivcsw
+        return usage
+
+    @property
+    def user_cpu_time(self) -> float:
+        """
+        Seconds of CPU time spent in user mode.
+        """
+        return self._user_cpu_time
+    @user_cpu_time.setter
+    def user_cpu_time(self, value: float):
+        self._user_cpu_time = value
+
+    @property
+    def system_cpu_time(self) -> float:
+        """
+        Seconds of CPU time spent in the kernel on behalf of the job.
+        """
+        return self._system_cpu_time
+    @system_cpu_time.setter
+    def system_cpu_time(self, value: float):
+        self._system_cpu_time = value
+
+    @property
+    def cpu_time(self) -> float:
+        return self.user_cpu_time + self.system_cpu_time
+
+    @property
+    def max_rss(self) -> int:
+        """
+        Peak resident set size (in KiB) of the largest process.
+        """
+        return self._max_rss
+    @max_rss.setter
+    def max_rss(self, value: int):
+        self._max_rss = value
+
+    @property
+    def block_input_operations(self) -> int:
+        return self._block_input_operations
+    @block_input_operations.setter
+    def block_input_operations(self, value: int):
+        self._block_input_operations = value
+
+    @property
+    def block_output_operations(self) -> int:
+        return self._block_output_operations
+    @block_output_operations.setter
+    def block_output_operations(self, value: int):
+        self._block_output_operations = value
+
+    @property
+    def voluntary_context_switches(self) -> int:
+        return self._voluntary_context_switches
+    @voluntary_context_switches.setter
+    def voluntary_context_switches(self, value: int):
+        self._voluntary_context_switches = value
+
+    @property
+    def involuntary_context_switches(self) -> int:
+        return self._involuntary_context_switches
+    @involuntary_context_switches.setter
+    def involuntary_context_switches(self, value: int):
+        self._involuntary_context_switches = value
+
+    def add(self, other: 'JobResourceUsage'):
+        """
+        Accumulates the usage of another job: times and counts are summed, the peak memory is the largest of both.
+        """
+        self.user_cpu_time += other.user_cpu_time
+        self.system_cpu_time += other.system_cpu_time
+        self.max_rss = max(self.max_rss, other.max_rss)
+        self.block_input_operations += other.block_input_operations
+        self.block_output_operations += other.block_output_operations
+        self.voluntary_context_switches += other.voluntary_context_switches
+        self.involuntary_context_switches += other.involuntary_context_switches
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "user_cpu_time": self.user_cpu_time,
+            "system_cpu_time": self.system_cpu_time,
+            "max_rss": self.max_rss,
+            "block_input_operations": self.block_input_operations,
+            "block_output_operations": self.block_output_operations,
+            "voluntary_context_switches": self.voluntary_context_switches,
+            "involuntary_context_switches": self.involuntary_context_switches,
+        }
 
 
 class JobResults:
@@ -204,6 +915,10 @@ class JobResults:
     _stderr: str = ""
     _timestamp_start: datetime = None
     _timestamp_end: datetime = None
+    _stdout_log_path: Path = None
+    _stderr_log_path: Path = None
+    _resource_usage: JobResourceUsage = None
+    _termination_reason: str = ""
 
     @property
     def return_code(self) -> int:
@@ -245,18 +960,68 @@ class JobResults:
     def timestamp_end(self, value: datetime):
         self._timestamp_end = value
 
+    @property
+    def stdout_log_path(self) -> Path:
+        return self._stdout_log_path
+
+    @stdout_log_path.setter
+    def stdout_log_path(self, value: Path):
+        self._stdout_log_path = value
+
+    @property
+    def stderr_log_path(self) -> Path:
+        return self._stderr_log_path
+
+    @stderr_log_path.setter
+    def stderr_log_path(self, value: Path):
+        self._stderr_log_path = value
+
+    @property
+    def resource_usage(self) -> JobResourceUsage:
+        """
+        None if the scheduler cannot measure it (ex: jobs running on other machines).
+        """
+        return self._resource_usage
+
+    @resource_usage.setter
+    def resource_usage(self, value: JobResourceUsage):
+        self._resource_usage = value
+
+    @property
+    def termination_reason(self) -> str:
+        """
+        Why the scheduler killed the job (ex: timeout); empty if the job ended on its own.
+        """
+        return self._termination_reason
+
+    @termination_reason.setter
+    def termination_reason(self, value: str):
+        self._termination_reason = value
+
+    @property
+    def was_terminated(self) -> bool:
+        return self._termination_reason != ""
+
 
 class JobScheduler(ABC):
     _is_scheduler:bool = True
+    # Schedulers that hand jobs off to a system with its own resource management (ex: compute clusters) opt out of
+    # admission control; those running jobs elsewhere than this machine only use the license token pools
+    uses_admission_control: bool = True
+    uses_local_resources: bool = True
+
     def __init__(self, rmh: 'RootManager', name: str=""):
         self._rmh = rmh
         self._name = name
         self._version = None
         self._db = None
+        self._admission_controller: JobAdmissionController = None
+        self._job_result_cache: JobResultCache = None
         self._jobs_dispatched: List[Job] = []
         self._jobs_in_progress: List[Job] = []
-        signal.signal(signal.SIGINT, self._handle_signal)
-        signal.signal(signal.SIGTERM, self._handle_signal)
+        self._previous_signal_handlers: Dict[int, object] = {}
+        for signum in [signal.SIGINT, signal.SIGTERM]:
+            self._previous_signal_handlers[signum] = signal.signal(signum, self._handle_signal)
         atexit.register(self.cleanup)
 
     @property
@@ -281,6 +1046,28 @@ class JobScheduler(ABC):
     def rmh(self, value: 'RootManager'):
         self._rmh = value
 
+    @property
+    def admission_controller(self) -> JobAdmissionController:
+        if self.db:
+            return self.db.admission_controller
+        if not self._admission_controller:
+            self._admission_controller = JobAdmissionController.from_configuration(self.rmh)
+        return self._admission_controller
+    @admission_controller.setter
+    def admission_controller(self, value: JobAdmissionController):
+        self._admission_controller = value
+
+    @property
+    def job_result_cache(self) -> JobResultCache:
+        if self.db:
+            return self.db.job_result_cache
+        if not self._job_result_cache:
+            self._job_result_cache = JobResultCache.from_configuration(self.rmh)
+        return self._job_result_cache
+    @job_result_cache.setter
+    def job_result_cache(self, value: JobResultCache):
+        self._job_result_cache = value
+
     @property
     def jobs_dispatched(self) -> List[Job]:
         return self._jobs_dispatched
@@ -303,29 +1090,220 @@ class JobScheduler(ABC):
 
     def dispatch_job(self, job: Job, configuration: JobSchedulerConfiguration) -> JobResults:
         self.jobs_dispatched.append(job)
-        if not configuration.dry_run:
+        if configuration.dry_run:
+            return self.do_dispatch_job(job, configuration)
+        cache_key: str = None
+        if configuration.use_job_cache and job.is_cacheable:
+            try:
+                cache_key = self.job_result_cache.get_key(job)
+                cached_results: JobResults = self.job_result_cache.replay(job, cache_key)
+            except Exception as e:
+                self.rmh.debug(f"Job '{job}' cannot be cached: {e}")
+                cache_key = None
+                cached_results = None
+            if cached_results:
+                self.rmh.debug(f"Replayed cached results of job '{job}'")
+                return cached_results
+        self.admit_job(job)
+        try:
             self.jobs_in_progress.append(job)
             self.rmh.debug(f"Dispatching job '{job}'")
-        results: JobResults = self.do_dispatch_job(job, configuration)
-        if not configuration.dry_run:
+            results: JobResults = self.do_dispatch_job(job, configuration)
             self.jobs_in_progress.remove(job)
             self.rmh.debug(f"Finished job '{job}' with return code '{results.return_code}'")
+        finally:
+            self.retire_job(job)
+        if cache_key:
+            try:
+                self.job_result_cache.store(job, cache_key, results)
+            except Exception as e:
+                self.rmh.warning(f"Failed to cache results of job '{job}': {e}")
         return results
 
-    def dispatch_job_set(self, job_set: JobSet, configuration: JobSchedulerConfiguration):
-        return self.do_dispatch_job_set(job_set, configuration)
+    def admit_job(self, job: Job):
+        if self.uses_admission_control:
+            self.admission_controller.acquire(job, self.uses_local_resources)
+
+    def retire_job(self, job: Job):
+        if self.uses_admission_control:
+            self.admission_controller.release(job, self.uses_local_resources)
+
+    def dispatch_job_set(self, job_set: JobSet, configuration: JobSchedulerConfiguration) -> List[JobResults]:
+        configuration.job_set = job_set
+        self.rmh.debug(f"Dispatching job set '{job_set.name}' ({len(job_set.tasks)} jobs)")
+        results: List[JobResults] = self.do_dispatch_job_set(job_set, configuration)
+        self.rmh.debug(f"Finished job set '{job_set.name}'")
+        return results
+
+    def dispatch_job_graph(self, job_graph: JobGraph, configuration: JobSchedulerConfiguration) -> List[Optional[JobResults]]:
+        """
+        Dispatches each job of the graph as soon as all the jobs it depends on have succeeded, with up to
+        `max_number_of_parallel_processes` jobs running at once.  Jobs depending (directly or not) on a failed job are
+        not run: their results are None.  Results are in the same order as `job_graph.tasks`.
+        """
+        results: Dict[Job, JobResults] = {}
+        skipped: Set[Job] = set()
+        pending: List[Job] = list(job_graph.tasks)
+        running: Dict[Future, Job] = {}
+        self.rmh.debug(f"Dispatching job graph '{job_graph.name}' ({len(pending)} jobs)")
+        with ThreadPoolExecutor(max_workers=max(1, configuration.max_number_of_parallel_processes)) as executor:
+            while pending or running:
+                # Pending jobs are in execution order: a single pass propagates failures to all dependents
+                for job in list(pending):
+                    if any((dependency in skipped) or ((dependency in results) and (results[dependency].return_code != 0))
+                           for dependency in job.dependencies):
+                        self.rmh.debug(f"Skipping job '{job}': a job it depends on failed")
+                        pending.remove(job)
+                        skipped.add(job)
+                    elif all(dependency in results for dependency in job.dependencies):
+                        pending.remove(job)
+                        running[executor.submit(self.dispatch_job, job, configuration)] = job
+                if running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[running.pop(future)] = future.result()
+        self.rmh.debug(f"Finished job graph '{job_graph.name}'")
+        return [results.get(job) for job in job_graph.tasks]
+
+    def signal_process_group(self, pid: int, signum: int):
+        """
+        Sends `signum` to the process group led by `pid`.  Jobs are started in their own session so that this reaches
+        every process of the job (ex: the simulator started by the shell), not just the shell itself.
+        """
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(pid, signum)
+            else:
+                os.kill(pid, signum)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def terminate_process_groups(self, pids: List[int], grace_period: float):
+        """
+        Sends SIGTERM to the process groups and SIGKILL to those still alive after `grace_period` seconds.
+        """
+        for pid in pids:
+            self.signal_process_group(pid, signal.SIGTERM)
+        deadline: float = time.monotonic() + grace_period
+        while pids and (time.monotonic() < deadline):
+            time.sleep(0.05)
+            pids = [pid for pid in pids if self.process_group_exists(pid)]
+        for pid in pids:
+            self.signal_process_group(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+
+    def process_group_exists(self, pid: int) -> bool:
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(pid, 0)
+            else:
+                os.kill(pid, 0)
+            return True
+        except (ProcessLookupError, PermissionError):
+            return False
+
+    def reap_process(self, process: subprocess.Popen, results: JobResults) -> bool:
+        """
+        Collects the exit status and resource usage of `process` if it has ended.  Returns True if it has.
+        """
+        if not hasattr(os, "wait4"):
+            return process.poll() is not None
+        try:
+            pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        except ChildProcessError:
+            # Already reaped by Popen
+            process.wait()
+            return True
+        if pid == process.pid:
+            process.returncode = os.waitstatus_to_exitcode(status)
+            results.resource_usage = JobResourceUsage.from_rusage(rusage)
+            return True
+        return False
+
+    def get_termination_reason(self, timeout: float, deadline: float, idle_timeout: float,
+                               sinks: List[JobOutputSink]) -> str:
+        now: float = time.monotonic()
+        if now >= deadline:
+            return f"timed out after {timeout / 60:g} minute(s)"
+        if idle_timeout and sinks and ((now - max(sink.last_write_time for sink in sinks)) >= idle_timeout):
+            return f"produced no output for {idle_timeout / 60:g} minute(s)"
+        return ""
+
+    def wait_for_process(self, process: subprocess.Popen, timeout: float, results: JobResults, idle_timeout: float=0,
+                         sinks: List[JobOutputSink]=None, grace_period: float=5):
+        """
+        Waits for `process` to end and records its resource usage in `results`.  If it runs for longer than `timeout`
+        seconds, or if `sinks` receive no output for `idle_timeout` seconds, the job's whole process group is
+        terminated and `results.termination_reason` is set.
+        """
+        # Same polling as Popen.wait(), but reaping the process with wait4() to obtain its rusage
+        deadline: float = time.monotonic() + timeout
+        kill_deadline: float = None
+        delay: float = 0.0005
+        while not self.reap_process(process, results):
+            if kill_deadline is None:
+                reason: str = self.get_termination_reason(timeout, deadline, idle_timeout, sinks)
+                if reason:
+                    results.termination_reason = reason
+                    self.signal_process_group(process.pid, signal.SIGTERM)
+                    kill_deadline = time.monotonic() + grace_period
+            elif time.monotonic() >= kill_deadline:
+                self.signal_process_group(process.pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+                kill_deadline = float("inf")
+            delay = min(delay * 2, 0.05)
+            time.sleep(delay)
+
+    def get_job_environment(self, job: Job) -> Dict[str, str]:
+        path = os.environ['PATH']
+        path = f"{job.pre_path}:{path}:{job.post_path}"
+        final_env_vars = {**job.env_vars, **os.environ}
+        final_env_vars['PATH'] = path
+        return final_env_vars
+
+    def get_job_launch_arguments(self, job: Job, env_vars: Dict[str, str]) -> List[str]:
+        """
+        Returns the argv used to start a job locally: shell jobs go through '/bin/sh -c', direct jobs are exec'd as is.
+        """
+        if job.use_shell:
+            return ["/bin/sh", "-c", job.command_line]
+        return job.get_argv(env_vars['PATH'])
+
+    def create_output_sinks(self, job: Job, configuration: JobSchedulerConfiguration, results: JobResults) -> Tuple[JobOutputSink, JobOutputSink]:
+        """
+        Creates the stdout and stderr sinks for a job whose output is captured (i.e. not sent directly to the terminal).
+        """
+        log_directory: Path = configuration.output_log_directory
+        if not log_directory:
+            log_directory = self.rmh.temp_dir / "job_logs"
+        log_name: str = f"{job.name}.{results.timestamp_start.strftime('%Y%m%d_%H%M%S_%f')}"
+        if configuration.tee_output_to_terminal:
+            stdout_tee = sys.stdout
+            stderr_tee = sys.stderr
+        else:
+            stdout_tee = None
+            stderr_tee = None
+        stdout_sink = JobOutputSink(log_directory / f"{log_name}.stdout.log", configuration.output_log_max_size,
+                                    configuration.output_log_max_count, configuration.output_tail_size, stdout_tee)
+        stderr_sink = JobOutputSink(log_directory / f"{log_name}.stderr.log", configuration.output_log_max_size,
+                                    configuration.output_log_max_count, configuration.output_tail_size, stderr_tee)
+        results.stdout_log_path = stdout_sink.log_file_path
+        results.stderr_log_path = stderr_sink.log_file_path
+        return stdout_sink, stderr_sink
 
     @abstractmethod
     def do_dispatch_job(self, job: Job, configuration: JobSchedulerConfiguration) -> JobResults:
         pass
 
     @abstractmethod
-    def do_dispatch_job_set(self, job_set: JobSet, configuration: JobSchedulerConfiguration):
+    def do_dispatch_job_set(self, job_set: JobSet, configuration: JobSchedulerConfiguration) -> List[JobResults]:
         pass
 
     def _handle_signal(self, signum, frame):
         print(f"Received signal {signum}. Terminating subprocess...")
         self.cleanup()
+        # Every scheduler installs this handler: pass the signal on so that all of them clean up
+        previous_handler = self._previous_signal_handlers.get(signum)
+        if isinstance(getattr(previous_handler, "__self__", None), JobScheduler):
+            previous_handler(signum, frame)
         #raise SystemExit(0)
 
 
@@ -333,28 +1311,117 @@ class JobSchedulerDatabase:
     def __init__(self, rmh: 'RootManager'):
         self._rmh = rmh
         self._task_schedulers: list[JobScheduler] = []
+        self._registered_schedulers: Dict[str, Tuple[str, str]] = {}
+        self._admission_controller: JobAdmissionController = None
+        self._job_result_cache: JobResultCache = None
 
     @property
     def rmh(self) -> 'RootManager':
         return self._rmh
+
+    @property
+    def num_loaded_schedulers(self) -> int:
+        """
+        :return: Number of available schedulers which have been constructed so far.
+        """
+        return len(self._task_schedulers)
+
+    @property
+    def admission_controller(self) -> JobAdmissionController:
+        """
+        Shared by all schedulers so that license tokens are accounted for across them.
+        """
+        if not self._admission_controller:
+            self._admission_controller = JobAdmissionController.from_configuration(self.rmh)
+        return self._admission_controller
+
+    @property
+    def job_result_cache(self) -> JobResultCache:
+        if not self._job_result_cache:
+            self._job_result_cache = JobResultCache.from_configuration(self.rmh)
+        return self._job_result_cache
     
-    def discover_schedulers(self):
+    @staticmethod
+    def get_scheduler_modules() -> List[Tuple[str, str]]:
+        """
+        :return: Name and file path of every module in `schedulers/`
+        """
         scheduler_directory = os.path.join(os.path.dirname(__file__), '..', 'schedulers')
-        for filename in os.listdir(scheduler_directory):
-            if filename.endswith('.py') and not filename.startswith('__'):
-                module_name = f'.schedulers.{filename[:-3]}'
+        return [(f'.schedulers.{filename[:-3]}', os.path.join(scheduler_directory, filename))
+                for filename in sorted(os.listdir(scheduler_directory))
+                if filename.endswith('.py') and not filename.startswith('__')]
+
+    def import_scheduler_modules(self):
+        """
+        Imports the scheduler modules which `discover_schedulers()` will load, without constructing any scheduler: can
+        run on a worker thread (schedulers install signal handlers, which only the main thread can do).  Errors are
+        left to `discover_schedulers()` to report.
+        """
+        plugin_cache = PluginCache(self.rmh.md / SCHEDULER_PLUGIN_CACHE_FILE_NAME)
+        for module_name, file_path in self.get_scheduler_modules():
+            if plugin_cache.get(file_path) is None:
                 try:
-                    module = importlib.import_module(module_name, 'mio_client')
-                    new_schedulers = module.get_schedulers()
-                    for scheduler in new_schedulers:
-                        try:
-                            scheduler_instance = scheduler(self._rmh)
-                            self.add_scheduler(scheduler_instance)
-                        except Exception as e:
-                            print(f"Scheduler '{scheduler}' has errors and is not being loaded: {e}", file=sys.stderr)
-                except Exception as e:
-                    print(f"Scheduler module '{module_name}' has errors and is not being loaded: {e}", file=sys.stderr)
-                    continue
+                    importlib.import_module(module_name, 'mio_client')
+                except Exception:
+                    pass
+
+    def discover_schedulers(self):
+        """
+        Registers the schedulers of every module in `schedulers/`.  Modules recorded in the plugin cache are not
+        imported: their schedulers are only imported and constructed once they are looked up.  Must run on the main
+        thread.
+        """
+        plugin_cache = PluginCache(self.rmh.md / SCHEDULER_PLUGIN_CACHE_FILE_NAME)
+        file_paths: List[str] = []
+        for module_name, file_path in self.get_scheduler_modules():
+            file_paths.append(file_path)
+            plugins = plugin_cache.get(file_path)
+            if plugins is None:
+                plugins = self.load_scheduler_module(module_name)
+                if plugins is not None:
+                    plugin_cache.set(file_path, plugins)
+            else:
+                for name, class_name in plugins:
+                    self._registered_schedulers.setdefault(name, (module_name, class_name))
+        plugin_cache.retain(file_paths)
+        plugin_cache.save()
+
+    def load_scheduler_module(self, module_name: str) -> Optional[List[List[str]]]:
+        """
+        Imports a scheduler module and adds all of its schedulers.
+        :return: [name, class name] of each scheduler in the module, or None if the module has errors
+        """
+        try:
+            module = importlib.import_module(module_name, 'mio_client')
+            new_schedulers = module.get_schedulers()
+        except Exception as e:
+            print(f"Scheduler module '{module_name}' has errors and is not being loaded: {e}", file=sys.stderr)
+            return None
+        plugins: List[List[str]] = []
+        has_errors: bool = False
+        for scheduler in new_schedulers:
+            try:
+                scheduler_instance = scheduler(self._rmh)
+                self.add_scheduler(scheduler_instance)
+            except Exception as e:
+                print(f"Scheduler '{scheduler}' has errors and is not being loaded: {e}", file=sys.stderr)
+                has_errors = True
+            else:
+                plugins.append([scheduler_instance.name, scheduler.__name__])
+        return None if has_errors else plugins
+
+    def load_registered_scheduler(self, name: str):
+        """
+        Imports and constructs a scheduler registered from the plugin cache, if it hasn't been already.
+        """
+        if name not in self._registered_schedulers:
+            return
+        module_name, class_name = self._registered_schedulers.pop(name)
+        try:
+            scheduler = getattr(importlib.import_module(module_name, 'mio_client'), class_name)
+            self.add_scheduler(scheduler(self._rmh))
+        except Exception as e:
+            print(f"Scheduler '{name}' has errors and is not being loaded: {e}", file=sys.stderr)
 
     def add_scheduler(self, job_scheduler: 'JobScheduler'):
         self.rmh.debug(f"Added scheduler '{job_scheduler}'")
@@ -364,11 +1431,13 @@ class JobSchedulerDatabase:
             job_scheduler.init()
 
     def find_scheduler(self, name: str) -> 'JobScheduler':
+        self.load_registered_scheduler(name)
         for task_scheduler in self._task_schedulers:
             if task_scheduler.name == name:
                 return task_scheduler
         raise Exception(f"No Job Scheduler '{name}' exists in the Job Scheduler Database")
 
     def get_default_scheduler(self) -> 'JobScheduler':
-        # TODO Add support for other schedulers
+        if self.rmh.configuration and self.rmh.configuration.scheduling:
+            return self.find_scheduler(self.rmh.configuration.scheduling.default_scheduler)
         return self.find_scheduler("sub_process")
\ No newline at end of file
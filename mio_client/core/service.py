@@ -7,7 +7,7 @@ from enum import Enum
 import importlib
 import inspect
 import os
-from typing import List
+from typing import Dict, List, Set, Tuple
 
 import semantic_version
 from semantic_version import Version
@@ -33,6 +33,20 @@ class ServiceType(Enum):
     DOCUMENTATION_GENERATOR = "Documentation Generator"
 
 
+# Module (under `mio_client.services`) and class of each built-in service, by type and name.  Modules are only imported
+# once one of their services has been requested: their dependencies (FuseSoC, etc.) are expensive to import and service
+# constructors can have side effects.
+SERVICE_MODULES: Dict[Tuple[ServiceType, str], Tuple[str, str]] = {
+    (ServiceType.DOCUMENTATION_GENERATOR, "doxygen"            ): ("doxygen"   , "DoxygenService"        ),
+    (ServiceType.PACKAGE_MANAGEMENT     , "fsoc"               ): ("fsoc"      , "FuseSocService"        ),
+    (ServiceType.CODE_GENERATION        , "init"               ): ("init"      , "InitService"           ),
+    (ServiceType.REGRESSION             , "regression_database"): ("regression", "RegressionDatabase"    ),
+    (ServiceType.LOGIC_SIMULATION       , "dsim"               ): ("simulation", "SimulatorMetricsDSim"  ),
+    (ServiceType.LOGIC_SIMULATION       , "vivado"             ): ("simulation", "SimulatorXilinxVivado" ),
+    (ServiceType.CODE_GENERATION        , "uvmx"               ): ("uvmx"      , "UvmxService"           ),
+}
+
+
 class Service(ABC):
     def __init__(self, rmh: 'RootManager', vendor_name: str="", name: str="", full_name: str=""):
         self._rmh: 'RootManager' = rmh
@@ -88,56 +102,120 @@ class Service(ABC):
 
 
 class ServiceDataBase:
+    """
+    Registry of services.  Built-in services are registered from `SERVICE_MODULES` without importing their modules:
+    a service is only imported, constructed and initialized (which creates its directories) the first time it is looked
+    up.  Lookups do not check availability: commands requesting a service explicitly use it as configured (e.g. DSim
+    Cloud does not need a local DSim installation).
+    """
     def __init__(self, rmh: 'RootManager'):
         self._rmh: 'RootManager' = rmh
+        self._registered_services: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._loaded_modules: Set[str] = set()
         self._services: List[Service] = []
+        self._initialized_services: Set[int] = set()
 
     @property
     def rmh(self) -> 'RootManager':
         return self._rmh
 
+    @property
+    def num_loaded_services(self) -> int:
+        """
+        :return: Number of services which have been constructed so far.
+        """
+        return len(self._services)
+
     def discover_services(self):
+        for (service_type, name), (module_name, class_name) in SERVICE_MODULES.items():
+            self.register_service(service_type, name, module_name, class_name)
+        # Services in other modules can only be known by importing them
         service_directory = os.path.join(os.path.dirname(__file__), '..', 'services')
-        for filename in os.listdir(service_directory):
-            if filename.endswith('.py') and not filename.startswith('__'):
-                module_name = f'.services.{filename[:-3]}'
+        built_in_modules = [module_name for module_name, class_name in SERVICE_MODULES.values()]
+        for filename in sorted(os.listdir(service_directory)):
+            if filename.endswith('.py') and not filename.startswith('__') and (filename[:-3] not in built_in_modules):
+                self.load_service_module(filename[:-3])
+
+    def register_service(self, service_type: ServiceType, name: str, module_name: str, class_name: str):
+        """
+        Registers a service without importing it.
+        :param service_type: Service type
+        :param name: Service name
+        :param module_name: Module under `mio_client.services` defining the service
+        :param class_name: Name of the service class
+        """
+        self._registered_services[(service_type.value, name)] = (module_name, class_name)
+
+    def import_service_module(self, module_name: str):
+        return importlib.import_module(f'.services.{module_name}', 'mio_client')
+
+    def load_service_module(self, module_name: str):
+        """
+        Imports a service module and adds all of its services.
+        """
+        if module_name in self._loaded_modules:
+            return
+        self._loaded_modules.add(module_name)
+        try:
+            module = self.import_service_module(module_name)
+            new_services = module.get_services()
+            for service in new_services:
                 try:
-                    module = importlib.import_module(module_name, 'mio_client')
-                    new_services = module.get_services()
-                    for service in new_services:
-                        try:
-                            service_instance = service(self._rmh)
-                            self.add_service(service_instance)
-                        except Exception as e:
-                            self.rmh.warning(f"Service '{service}' has errors and is not being loaded: {e}")
+                    service_instance = service(self._rmh)
+                    self.add_service(service_instance)
                 except Exception as e:
-                    self.rmh.warning(f"Service module '{module_name}' has errors and is not being loaded: {e}")
-                    continue
+                    self.rmh.warning(f"Service '{service}' has errors and is not being loaded: {e}")
+        except Exception as e:
+            self.rmh.warning(f"Service module '{module_name}' has errors and is not being loaded: {e}")
+
+    def load_registered_service(self, service_type_value: str, name: str):
+        module_name, class_name = self._registered_services.pop((service_type_value, name))
+        try:
+            service = getattr(self.import_service_module(module_name), class_name)
+            self.add_service(service(self._rmh))
+        except Exception as e:
+            self.rmh.warning(f"Service '{name}' has errors and is not being loaded: {e}")
 
     def add_service(self, service: Service):
         self.rmh.debug(f"Added service '{service}'")
         service.db = self
-        if service.is_available:
-            self._services.append(service)
+        self._services.append(service)
+
+    def init_service(self, service: Service):
+        """
+        Initializes a service the first time it is looked up.
+        """
+        if id(service) not in self._initialized_services:
+            self._initialized_services.add(id(service))
             service.init()
 
-    def find_service(self, service_type: ServiceType, name: str) -> Service:
-        for service in self._services:
-            if (service.type.value == service_type.value) and (service.name == name):
-                return service
-        raise Exception(f"Service '{name}' of type '{service_type.value}' could not be found")
-
-    def find_all_services_by_type(self, service_type: ServiceType) -> List[Service]:
+    def get_services(self, service_type: ServiceType, name: str=None) -> List[Service]:
+        """
+        :param service_type: Service type
+        :param name: Service name, or None for all services of `service_type`
+        :return: Services matching the arguments, loaded and initialized if they weren't already
+        """
+        for (registered_type_value, registered_name) in list(self._registered_services.keys()):
+            if (registered_type_value == service_type.value) and ((name is None) or (registered_name == name)):
+                self.load_registered_service(registered_type_value, registered_name)
         services: List[Service] = []
         for service in self._services:
-            if service.type.value == service_type.value:
+            if (service.type.value == service_type.value) and ((name is None) or (service.name == name)):
+                self.init_service(service)
                 services.append(service)
         return services
 
-    def find_default_service(self, service_type: ServiceType) -> Service:
-        for service in self._services:
-            if service.type.value == service_type.value:
-                return service
-        raise Exception(f"Service type '{service_type.value}' could not be found")
+    def find_service(self, service_type: ServiceType, name: str) -> Service:
+        services = self.get_services(service_type, name)
+        if len(services) > 0:
+            return services[0]
+        raise Exception(f"Service '{name}' of type '{service_type.value}' could not be found")
 
+    def find_all_services_by_type(self, service_type: ServiceType) -> List[Service]:
+        return self.get_services(service_type)
 
+    def find_default_service(self, service_type: ServiceType) -> Service:
+        services = self.get_services(service_type)
+        if len(services) > 0:
+            return services[0]
+        raise Exception(f"Service type '{service_type.value}' could not be found")
@@ -0,0 +1,123 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
+
+
+#######################################################################################################################
+# Support Types
+#######################################################################################################################
+MAX_STARTUP_WORKERS = 4
+
+
+class StartupTask:
+    def __init__(self, name: str, function: Callable[[], Any], dependencies: List[str]):
+        self.name: str = name
+        self.function: Callable[[], Any] = function
+        self.dependencies: Set[str] = set(dependencies)
+        self.future: Optional[Future] = None
+
+
+#######################################################################################################################
+# Startup Engine
+#######################################################################################################################
+class StartupEngine:
+    """
+    Runs the I/O-bound work of startup phases (loading user data, configuration files, discovering schedulers and IP)
+    ahead of time on a thread pool.  Each task depends on the phases and/or other tasks which produce its inputs: it is
+    started as soon as all of them have finished.  Tasks must not modify the Root Manager: their results are consumed
+    by their phase, on the main thread and in the usual order, so that Command phase hooks keep running in sequence and
+    errors are reported by the same phase as without the engine.
+    """
+    def __init__(self, max_workers: int=MAX_STARTUP_WORKERS):
+        self._max_workers: int = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: Dict[str, StartupTask] = {}
+        self._finished: Set[str] = set()
+        # Re-entrant: callbacks of tasks which complete before being registered run in the submitting thread
+        self._lock: threading.RLock = threading.RLock()
+        self._shut_down: bool = False
+
+    @property
+    def tasks(self) -> Dict[str, StartupTask]:
+        return self._tasks
+
+    def add_task(self, name: str, function: Callable[[], Any], dependencies: List[str]=None):
+        """
+        :param name: Task name
+        :param function: Work to be done.  Its return value is the task's result.
+        :param dependencies: Names of the phases and tasks which must have finished before the task is started
+        """
+        if name in self.tasks:
+            raise Exception(f"Startup task '{name}' already exists")
+        self._tasks[name] = StartupTask(name, function, dependencies or [])
+
+    def start(self):
+        """
+        Starts the tasks which do not have any dependencies.
+        """
+        with self._lock:
+            self.submit_ready_tasks()
+
+    def set_finished(self, name: str):
+        """
+        Records the end of a phase or task and starts the tasks which depended on it.
+        :param name: Phase or task name
+        """
+        with self._lock:
+            self._finished.add(name)
+            self.submit_ready_tasks()
+
+    def submit_ready_tasks(self):
+        if self._shut_down:
+            return
+        for task in self.tasks.values():
+            if (task.future is None) and all(self.is_finished(dependency) for dependency in task.dependencies):
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="mio_startup")
+                task.future = self._executor.submit(task.function)
+                task.future.add_done_callback(lambda future, name=task.name: self.task_done(name, future))
+
+    def is_finished(self, name: str) -> bool:
+        """
+        :param name: Phase or task name
+        :return: Whether the phase has finished or the task has completed successfully
+        """
+        if name in self._finished:
+            return True
+        task = self.tasks.get(name)
+        if (task is None) or (task.future is None) or (not task.future.done()) or task.future.cancelled():
+            return False
+        return task.future.exception() is None
+
+    def task_done(self, name: str, future: Future):
+        if (not future.cancelled()) and (future.exception() is None):
+            self.set_finished(name)
+
+    def get_result(self, name: str) -> Any:
+        """
+        Waits for a task to complete.
+        :param name: Task name
+        :return: Result of the task, or None if there is no such task or it hasn't been started
+        :raises Exception: Error raised by the task
+        """
+        with self._lock:
+            # Tasks depending on tasks which have just completed may not have been started by their callback yet
+            self.submit_ready_tasks()
+            task = self.tasks.get(name)
+            future = None if task is None else task.future
+        if (future is None) or future.cancelled():
+            return None
+        return future.result()
+
+    def shutdown(self):
+        """
+        Cancels the tasks which haven't been started and waits for the others to complete.
+        """
+        with self._lock:
+            self._shut_down = True
+            executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -1,6 +1,7 @@
 # Copyright 2020-2025 Datum Technology Corporation
 # All rights reserved.
 #######################################################################################################################
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -16,6 +17,7 @@ class User(Model):
         self._pre_set_username = ""
         self._use_pre_set_password = False
         self._pre_set_password = ""
+        self._saved_data: Optional[dict] = None
     authenticated: bool = False
     username: Optional[constr(pattern=VALID_NAME_REGEX)] = "__ANONYMOUS__"
     session_cookies: Optional[dict] = {}
@@ -38,13 +40,36 @@ class User(Model):
             data = yaml.safe_load(f)
             if data is None:
                 data = {}
-            return cls(**data)
+            user = cls(**data)
+            user._saved_data = user.model_dump()
+            return user
 
     def save(self, file_path: Path):
-        """Save the current User instance to a YAML file."""
-        with open(file_path, 'w') as f:
-            model_data: dict = self.model_dump()
-            yaml.safe_dump(model_data, f)
+        """
+        Save the current User instance to a YAML file.  The file is replaced atomically: concurrent invocations never
+        read a partially written file.
+        """
+        model_data: dict = self.model_dump()
+        os.makedirs(Path(file_path).parent, exist_ok=True)
+        temp_path = Path(file_path).with_name(f"{Path(file_path).name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, 'w') as f:
+                yaml.safe_dump(model_data, f)
+            os.replace(temp_path, file_path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        self._saved_data = model_data
+
+    @property
+    def dirty(self) -> bool:
+        """
+        :return: Whether the user data has changed since it was loaded or saved (always True for new users).
+        """
+        return (self._saved_data is None) or (self.model_dump() != self._saved_data)
 
     @property
     def use_pre_set_username(self) -> bool:
@@ -0,0 +1,159 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+import asyncio
+import signal
+import threading
+import time
+from datetime import datetime
+from typing import List, Set
+
+from mio_client.core.scheduler import JobSchedulerConfiguration, JobScheduler, JobResults, Job, JobSet, JobOutputSink
+
+
+def get_schedulers():
+    return [AsyncProcessScheduler]
+
+
+class AsyncProcessSchedulerConfiguration(JobSchedulerConfiguration):
+    pass
+
+
+class AsyncProcessScheduler(JobScheduler):
+    """
+    Supervises all jobs from a single asyncio event loop running in a background thread.  Unlike the sub-process
+    scheduler, waiting on a job does not tie up an OS thread, which allows a single process to supervise a very large
+    number of concurrent jobs.
+    """
+    def __init__(self, rmh: 'RootManager'):
+        super().__init__(rmh, "async_process")
+        self._loop: asyncio.AbstractEventLoop = None
+        self._loop_thread: threading.Thread = None
+        self._loop_lock: threading.Lock = threading.Lock()
+        self._processes_in_progress: Set[asyncio.subprocess.Process] = set()
+
+    def is_available(self) -> bool:
+        return True
+
+    def init(self):
+        pass
+
+    def cleanup(self):
+        self.terminate_process_groups([process.pid for process in list(self._processes_in_progress)], 1)
+        if self._loop and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if not self._loop:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name="mio-async-scheduler",
+                                                     daemon=True)
+                self._loop_thread.start()
+        return self._loop
+
+    def do_dispatch_job(self, job: Job, configuration: AsyncProcessSchedulerConfiguration) -> JobResults:
+        if configuration.dry_run:
+            results = JobResults()
+            results.timestamp_start = datetime.now()
+            results.timestamp_end = datetime.now()
+            return results
+        future = asyncio.run_coroutine_threadsafe(self.run_job(job, configuration), self.loop)
+        return future.result()
+
+    def do_dispatch_job_set(self, job_set: JobSet, configuration: AsyncProcessSchedulerConfiguration) -> List[JobResults]:
+        future = asyncio.run_coroutine_threadsafe(self.run_job_set(job_set, configuration), self.loop)
+        return future.result()
+
+    async def run_job_set(self, job_set: JobSet, configuration: AsyncProcessSchedulerConfiguration) -> List[JobResults]:
+        semaphore = asyncio.Semaphore(max(1, configuration.max_number_of_parallel_processes))
+        async def run_bounded(job: Job) -> JobResults:
+            async with semaphore:
+                return await self.run_tracked_job(job, configuration)
+        return list(await asyncio.gather(*[run_bounded(job) for job in job_set.tasks]))
+
+    async def run_tracked_job(self, job: Job, configuration: AsyncProcessSchedulerConfiguration) -> JobResults:
+        # Mirrors the bookkeeping done by JobScheduler.dispatch_job() for jobs started from within the event loop
+        self.jobs_dispatched.append(job)
+        if configuration.dry_run:
+            results = JobResults()
+            results.timestamp_start = datetime.now()
+            results.timestamp_end = datetime.now()
+            return results
+        # Waiting for admission blocks, so it is done off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.admit_job, job)
+        try:
+            self.jobs_in_progress.append(job)
+            self.rmh.debug(f"Dispatching job '{job}'")
+            results: JobResults = await self.run_job(job, configuration)
+            self.jobs_in_progress.remove(job)
+            self.rmh.debug(f"Finished job '{job}' with return code '{results.return_code}'")
+        finally:
+            self.retire_job(job)
+        return results
+
+    async def drain(self, stream: asyncio.StreamReader, sink: JobOutputSink, chunk_size: int=64 * 1024):
+        while True:
+            chunk = await stream.read(chunk_size)
+            if not chunk:
+                break
+            sink.write(chunk)
+
+    async def supervise(self, process: asyncio.subprocess.Process, configuration: AsyncProcessSchedulerConfiguration,
+                        results: JobResults, sinks: List[JobOutputSink], interval: float=0.5):
+        """
+        Waits for the process and for its output to be drained; terminates its process group on timeout or when its
+        output stops growing for longer than the idle timeout.
+        """
+        drains = [self.drain(stream, sink) for stream, sink in zip([process.stdout, process.stderr], sinks)]
+        waiter = asyncio.ensure_future(asyncio.gather(process.wait(), *drains))
+        timeout: float = configuration.timeout * 60
+        deadline: float = time.monotonic() + timeout
+        while not waiter.done():
+            await asyncio.wait({waiter}, timeout=interval)
+            if waiter.done():
+                break
+            reason: str = self.get_termination_reason(timeout, deadline, configuration.idle_timeout * 60, sinks)
+            if reason:
+                results.termination_reason = reason
+                self.signal_process_group(process.pid, signal.SIGTERM)
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter), timeout=configuration.termination_grace_period)
+                except asyncio.TimeoutError:
+                    self.signal_process_group(process.pid, signal.SIGKILL)
+                break
+        await waiter
+
+    async def run_job(self, job: Job, configuration: AsyncProcessSchedulerConfiguration) -> JobResults:
+        results = JobResults()
+        results.timestamp_start = datetime.now()
+        final_env_vars = self.get_job_environment(job)
+        args: List[str] = self.get_job_launch_arguments(job, final_env_vars)
+        # Each job gets its own session so that its whole process tree can be terminated
+        if configuration.output_to_terminal:
+            process = await asyncio.create_subprocess_exec(*args, cwd=job.wd, env=final_env_vars,
+                                                           start_new_session=True)
+            sinks: List[JobOutputSink] = []
+        else:
+            stdout_sink, stderr_sink = self.create_output_sinks(job, configuration, results)
+            process = await asyncio.create_subprocess_exec(*args, cwd=job.wd,
+                                                           env=final_env_vars, stdout=asyncio.subprocess.PIPE,
+                                                           stderr=asyncio.subprocess.PIPE, start_new_session=True)
+            sinks = [stdout_sink, stderr_sink]
+        if configuration.kill_job_on_termination:
+            self._processes_in_progress.add(process)
+        try:
+            await self.supervise(process, configuration, results, sinks)
+        finally:
+            self._processes_in_progress.discard(process)
+        if results.was_terminated:
+            self.rmh.warning(f"Job '{job.name}' {results.termination_reason}: terminated")
+        if not configuration.output_to_terminal:
+            stdout_sink.close()
+            stderr_sink.close()
+            results.stdout = stdout_sink.tail
+            results.stderr = stderr_sink.tail
+        results.return_code = process.returncode
+        results.timestamp_end = datetime.now()
+        return results
@@ -0,0 +1,297 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import time
+from abc import abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from mio_client.core.scheduler import JobSchedulerConfiguration, JobScheduler, JobResults, Job, JobSet
+
+
+def get_schedulers():
+    return [SlurmScheduler, LsfScheduler, SgeScheduler]
+
+
+class BatchSchedulerConfiguration(JobSchedulerConfiguration):
+    pass
+
+
+#######################################################################################################################
+# Batch (cluster) scheduler base
+#######################################################################################################################
+class BatchJobScheduler(JobScheduler):
+    """
+    Base for schedulers that hand jobs off to a compute cluster.  Each job is written out as a shell script which
+    redirects its output to log files and records its exit code in a file; all of which must be on a filesystem shared
+    with the compute nodes.  The cluster's status command is polled until the job has left the queue.
+    Job Sets are submitted as a single job array.  Resources and licenses are left to the cluster's own management.
+    """
+    uses_admission_control = False
+    submit_binary: str = ""
+    status_binary: str = ""
+    cancel_binary: str = ""
+    array_index_variable: str = ""
+
+    def __init__(self, rmh: 'RootManager', name: str):
+        super().__init__(rmh, name)
+        self._job_ids_in_progress: List[str] = []
+        self._poll_interval: float = None
+
+    def is_available(self) -> bool:
+        return (shutil.which(self.submit_binary) is not None) and (shutil.which(self.status_binary) is not None)
+
+    def init(self):
+        pass
+
+    def cleanup(self):
+        for job_id in list(self._job_ids_in_progress):
+            self.cancel(job_id)
+
+    @property
+    def poll_interval(self) -> float:
+        if self._poll_interval is not None:
+            return self._poll_interval
+        if self.rmh.configuration and self.rmh.configuration.scheduling:
+            return self.rmh.configuration.scheduling.batch_poll_interval
+        return 10
+    @poll_interval.setter
+    def poll_interval(self, value: float):
+        self._poll_interval = value
+
+    @property
+    def submit_arguments(self) -> List[str]:
+        if self.rmh.configuration and self.rmh.configuration.scheduling:
+            return list(getattr(self.rmh.configuration.scheduling, f"{self.name}_submit_arguments"))
+        return []
+
+    @abstractmethod
+    def get_submit_arguments(self, name: str, array_size: int, max_parallel: int) -> List[str]:
+        """
+        Returns the scheduler-specific submission arguments.  An `array_size` of 0 denotes a single (non-array) job.
+        """
+        pass
+
+    @abstractmethod
+    def parse_job_id(self, output: str) -> str:
+        pass
+
+    @abstractmethod
+    def is_job_active(self, job_id: str) -> bool:
+        pass
+
+    def cancel(self, job_id: str):
+        try:
+            subprocess.run([self.cancel_binary, job_id], capture_output=True, text=True)
+        except Exception as e:
+            self.rmh.warning(f"Failed to cancel {self.name} job '{job_id}': {e}")
+
+    def get_job_directory(self, name: str, configuration: JobSchedulerConfiguration) -> Path:
+        log_directory: Path = configuration.output_log_directory
+        if not log_directory:
+            log_directory = self.rmh.temp_dir / "batch_jobs"
+        job_directory: Path = log_directory / f"{name}.{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        job_directory.mkdir(parents=True, exist_ok=True)
+        return job_directory
+
+    def write_task_script(self, job: Job, job_directory: Path, index: int) -> Path:
+        command_str = job.command_line
+        lines: List[str] = ["#!/bin/sh", f"cd {shlex.quote(str(job.wd))}"]
+        for variable, value in job.env_vars.items():
+            value = os.environ.get(variable, value)
+            lines.append(f"{variable}={shlex.quote(str(value))}; export {variable}")
+        lines.append(f"PATH={shlex.quote(job.pre_path)}:\"$PATH\":{shlex.quote(job.post_path)}; export PATH")
+        stdout_path = job_directory / f"{index}.stdout.log"
+        stderr_path = job_directory / f"{index}.stderr.log"
+        exit_path = job_directory / f"{index}.exit"
+        lines.append(f"{command_str} > {shlex.quote(str(stdout_path))} 2> {shlex.quote(str(stderr_path))}")
+        lines.append(f"echo $? > {shlex.quote(str(exit_path))}.tmp && mv {shlex.quote(str(exit_path))}.tmp {shlex.quote(str(exit_path))}")
+        script_path = job_directory / f"{index}.sh"
+        script_path.write_text("\n".join(lines) + "\n")
+        script_path.chmod(0o755)
+        return script_path
+
+    def write_array_script(self, job_directory: Path) -> Path:
+        script_path = job_directory / "array.sh"
+        script_path.write_text(f"#!/bin/sh\nexec /bin/sh {shlex.quote(str(job_directory))}/${{{self.array_index_variable}}}.sh\n")
+        script_path.chmod(0o755)
+        return script_path
+
+    def submit(self, script_path: Path, name: str, array_size: int, max_parallel: int) -> str:
+        args: List[str] = [self.submit_binary] + self.get_submit_arguments(name, array_size, max_parallel)
+        args += self.submit_arguments + [str(script_path)]
+        self.rmh.debug(f"Submitting to {self.name}: {' '.join(args)}")
+        result = subprocess.run(args, capture_output=True, text=True, cwd=script_path.parent)
+        if result.returncode != 0:
+            raise Exception(f"Failed to submit job '{name}' to {self.name}:\n{result.stderr}\n{result.stdout}")
+        return self.parse_job_id(result.stdout)
+
+    def wait(self, job_id: str, exit_paths: List[Path], configuration: JobSchedulerConfiguration):
+        self._job_ids_in_progress.append(job_id)
+        deadline = time.monotonic() + (configuration.timeout * 60)
+        try:
+            while not all(exit_path.exists() for exit_path in exit_paths):
+                if not self.is_job_active(job_id):
+                    # Give shared filesystems a chance to catch up before giving up on the remaining exit codes
+                    time.sleep(self.poll_interval)
+                    break
+                if time.monotonic() > deadline:
+                    self.rmh.warning(f"{self.name} job '{job_id}' timed out: cancelling")
+                    self.cancel(job_id)
+                    break
+                time.sleep(self.poll_interval)
+        finally:
+            self._job_ids_in_progress.remove(job_id)
+
+    def collect_results(self, job_directory: Path, index: int, configuration: JobSchedulerConfiguration, results: JobResults):
+        exit_path = job_directory / f"{index}.exit"
+        results.stdout_log_path = job_directory / f"{index}.stdout.log"
+        results.stderr_log_path = job_directory / f"{index}.stderr.log"
+        results.stdout = self.read_tail(results.stdout_log_path, configuration.output_tail_size)
+        results.stderr = self.read_tail(results.stderr_log_path, configuration.output_tail_size)
+        try:
+            results.return_code = int(exit_path.read_text().strip())
+        except (OSError, ValueError):
+            results.return_code = 1
+            results.stderr += f"\n{self.name} job did not report an exit code\n"
+        results.timestamp_end = datetime.now()
+
+    @staticmethod
+    def read_tail(file_path: Path, tail_size: int) -> str:
+        if not file_path.exists():
+            return ""
+        with file_path.open('rb') as file:
+            file.seek(0, os.SEEK_END)
+            file.seek(max(0, file.tell() - tail_size))
+            return file.read().decode(errors="replace")
+
+    def do_dispatch_job(self, job: Job, configuration: BatchSchedulerConfiguration) -> JobResults:
+        results = JobResults()
+        results.timestamp_start = datetime.now()
+        if not configuration.dry_run:
+            job_directory: Path = self.get_job_directory(job.name, configuration)
+            script_path: Path = self.write_task_script(job, job_directory, 1)
+            job_id: str = self.submit(script_path, job.name, 0, 1)
+            self.rmh.debug(f"Job '{job.name}' submitted to {self.name} as '{job_id}'")
+            self.wait(job_id, [job_directory / "1.exit"], configuration)
+            self.collect_results(job_directory, 1, configuration, results)
+        results.timestamp_end = datetime.now()
+        return results
+
+    def do_dispatch_job_set(self, job_set: JobSet, configuration: BatchSchedulerConfiguration) -> List[JobResults]:
+        all_results: List[JobResults] = []
+        for job in job_set.tasks:
+            results = JobResults()
+            results.timestamp_start = datetime.now()
+            all_results.append(results)
+            self.jobs_dispatched.append(job)
+        if configuration.dry_run or len(job_set.tasks) == 0:
+            return all_results
+        job_directory: Path = self.get_job_directory(job_set.name, configuration)
+        for index, job in enumerate(job_set.tasks, start=1):
+            self.write_task_script(job, job_directory, index)
+        array_script_path: Path = self.write_array_script(job_directory)
+        max_parallel = max(1, configuration.max_number_of_parallel_processes)
+        job_id: str = self.submit(array_script_path, job_set.name, len(job_set.tasks), max_parallel)
+        self.rmh.debug(f"Job set '{job_set.name}' submitted to {self.name} as array '{job_id}'")
+        self.jobs_in_progress.extend(job_set.tasks)
+        try:
+            exit_paths = [job_directory / f"{index}.exit" for index in range(1, len(job_set.tasks) + 1)]
+            self.wait(job_id, exit_paths, configuration)
+        finally:
+            for job in job_set.tasks:
+                self.jobs_in_progress.remove(job)
+        for index, results in enumerate(all_results, start=1):
+            self.collect_results(job_directory, index, configuration, results)
+        return all_results
+
+
+#######################################################################################################################
+# SLURM
+#######################################################################################################################
+class SlurmScheduler(BatchJobScheduler):
+    submit_binary = "sbatch"
+    status_binary = "squeue"
+    cancel_binary = "scancel"
+    array_index_variable = "SLURM_ARRAY_TASK_ID"
+
+    def __init__(self, rmh: 'RootManager'):
+        super().__init__(rmh, "slurm")
+
+    def get_submit_arguments(self, name: str, array_size: int, max_parallel: int) -> List[str]:
+        args: List[str] = ["--parsable", f"--job-name={name}", "--output=/dev/null", "--error=/dev/null"]
+        if array_size > 0:
+            args.append(f"--array=1-{array_size}%{max_parallel}")
+        return args
+
+    def parse_job_id(self, output: str) -> str:
+        return output.strip().split(";")[0]
+
+    def is_job_active(self, job_id: str) -> bool:
+        result = subprocess.run([self.status_binary, "-h", "-j", job_id, "-o", "%T"], capture_output=True, text=True)
+        if result.returncode != 0:
+            return False
+        return len(result.stdout.strip()) > 0
+
+
+#######################################################################################################################
+# IBM Spectrum LSF
+#######################################################################################################################
+class LsfScheduler(BatchJobScheduler):
+    submit_binary = "bsub"
+    status_binary = "bjobs"
+    cancel_binary = "bkill"
+    array_index_variable = "LSB_JOBINDEX"
+    active_states = ["PEND", "RUN", "PSUSP", "USUSP", "SSUSP", "WAIT", "PROV"]
+
+    def __init__(self, rmh: 'RootManager'):
+        super().__init__(rmh, "lsf")
+
+    def get_submit_arguments(self, name: str, array_size: int, max_parallel: int) -> List[str]:
+        if array_size > 0:
+            name = f"{name}[1-{array_size}]%{max_parallel}"
+        return ["-J", name, "-o", "/dev/null", "-e", "/dev/null"]
+
+    def parse_job_id(self, output: str) -> str:
+        match = re.search(r'Job <(\d+)>', output)
+        if not match:
+            raise Exception(f"Could not find job ID in bsub output: '{output}'")
+        return match.group(1)
+
+    def is_job_active(self, job_id: str) -> bool:
+        result = subprocess.run([self.status_binary, "-noheader", "-o", "stat", job_id], capture_output=True, text=True)
+        if result.returncode != 0:
+            return False
+        return any(state.strip() in self.active_states for state in result.stdout.splitlines())
+
+
+#######################################################################################################################
+# (Son of) Grid Engine
+#######################################################################################################################
+class SgeScheduler(BatchJobScheduler):
+    submit_binary = "qsub"
+    status_binary = "qstat"
+    cancel_binary = "qdel"
+    array_index_variable = "SGE_TASK_ID"
+
+    def __init__(self, rmh: 'RootManager'):
+        super().__init__(rmh, "sge")
+
+    def get_submit_arguments(self, name: str, array_size: int, max_parallel: int) -> List[str]:
+        args: List[str] = ["-terse", "-V", "-S", "/bin/sh", "-N", name, "-o", "/dev/null", "-e", "/dev/null"]
+        if array_size > 0:
+            args += ["-t", f"1-{array_size}", "-tc", str(max_parallel)]
+        return args
+
+    def parse_job_id(self, output: str) -> str:
+        return output.strip().split(".")[0]
+
+    def is_job_active(self, job_id: str) -> bool:
+        result = subprocess.run([self.status_binary, "-j", job_id], capture_output=True, text=True)
+        return result.returncode == 0
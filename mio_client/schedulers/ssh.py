@@ -0,0 +1,211 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+import os
+import shlex
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Tuple
+
+from mio_client.core.scheduler import JobSchedulerConfiguration, JobScheduler, JobResults, Job, JobSet, JobOutputSink
+
+
+def get_schedulers():
+    return [SshScheduler]
+
+
+class SshSchedulerConfiguration(JobSchedulerConfiguration):
+    pass
+
+
+class SshScheduler(JobScheduler):
+    """
+    Spreads jobs across the hosts listed in `scheduling.ssh_hosts` (host name -> number of job slots).  Jobs with a
+    `hostname` are pinned to that host; all others go to the host with the most free slots.  Connections to each host
+    are multiplexed over a persistent SSH ControlMaster so that jobs do not pay for connection setup.
+    The project must be at the same path on every host (ex: NFS home directories).
+    sshd runs each job's shell in a new session: the shell records its PID (i.e. the job's process group) on the remote
+    host, so that timed out and interrupted jobs can be terminated there.  Killing the local ssh client alone would leave
+    them running.
+    """
+    uses_local_resources = False
+    ssh_binary: str = "ssh"
+    control_persist_seconds: int = 600
+    # Delay between SIGTERM and SIGKILL of remote jobs: the remote host enforces it, in case mio exits in the meantime
+    remote_kill_delay_seconds: int = 5
+
+    def __init__(self, rmh: 'RootManager'):
+        super().__init__(rmh, "ssh")
+        self._hosts: Dict[str, int] = None
+        self._slots_in_use: Dict[str, int] = {}
+        self._slots_condition: threading.Condition = threading.Condition()
+        self._hosts_connected: List[str] = []
+        self._results_in_progress: List[subprocess.Popen] = []
+        # Host and remote process group file of each job in progress, by PID of its local ssh client
+        self._remote_jobs: Dict[int, Tuple[str, str]] = {}
+        self._results_lock: threading.Lock = threading.Lock()
+        self._control_directory: Path = Path(tempfile.gettempdir()) / f"mio-ssh-{os.getuid()}"
+
+    @property
+    def hosts(self) -> Dict[str, int]:
+        if self._hosts is None:
+            if self.rmh.configuration and self.rmh.configuration.scheduling:
+                return dict(self.rmh.configuration.scheduling.ssh_hosts)
+            return {}
+        return self._hosts
+    @hosts.setter
+    def hosts(self, value: Dict[str, int]):
+        self._hosts = value
+
+    @property
+    def total_slots(self) -> int:
+        return sum(self.hosts.values())
+
+    def is_available(self) -> bool:
+        return (shutil.which(self.ssh_binary) is not None) and (len(self.hosts) > 0)
+
+    def init(self):
+        pass
+
+    def cleanup(self):
+        with self._results_lock:
+            pids: List[int] = [result.pid for result in self._results_in_progress]
+        self.terminate_process_groups(pids, 1)
+        for host in self._hosts_connected:
+            subprocess.run(self.get_ssh_arguments(host) + ["-O", "exit"], capture_output=True)
+        self._hosts_connected = []
+
+    def get_ssh_arguments(self, host: str) -> List[str]:
+        return [
+            self.ssh_binary,
+            "-o", "BatchMode=yes",
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self._control_directory}/%C",
+            "-o", f"ControlPersist={self.control_persist_seconds}",
+            host
+        ]
+
+    def acquire_slot(self, job: Job) -> str:
+        with self._slots_condition:
+            while True:
+                if job.hostname:
+                    # Pinned jobs may target hosts that are not in the list: these get a single slot
+                    candidates = [job.hostname]
+                else:
+                    candidates = list(self.hosts.keys())
+                free_slots = {host: self.hosts.get(host, 1) - self._slots_in_use.get(host, 0) for host in candidates}
+                host = max(free_slots, key=free_slots.get, default=None)
+                if host is None:
+                    raise Exception(f"No hosts configured for the SSH scheduler (scheduling.ssh_hosts)")
+                if free_slots[host] > 0:
+                    self._slots_in_use[host] = self._slots_in_use.get(host, 0) + 1
+                    if host not in self._hosts_connected:
+                        self._hosts_connected.append(host)
+                    return host
+                self._slots_condition.wait()
+
+    def release_slot(self, host: str):
+        with self._slots_condition:
+            self._slots_in_use[host] -= 1
+            self._slots_condition.notify_all()
+
+    def get_remote_command(self, job: Job, process_group_file: str) -> str:
+        command_str = job.command_line
+        exports: List[str] = []
+        for variable, value in job.env_vars.items():
+            value = os.environ.get(variable, value)
+            exports.append(f"{variable}={shlex.quote(str(value))}; export {variable};")
+        exports.append(f"PATH={shlex.quote(job.pre_path)}:\"$PATH\":{shlex.quote(job.post_path)}; export PATH;")
+        process_group_file = shlex.quote(process_group_file)
+        return (f"echo $$ > {process_group_file}; cd {shlex.quote(str(job.wd))} && {' '.join(exports)} {command_str}; "
+                f"code=$?; rm -f {process_group_file}; exit $code")
+
+    def signal_process_group(self, pid: int, signum: int):
+        """
+        Signals the remote job of the local ssh client `pid`, which then exits on its own.  Remote jobs sent SIGTERM are
+        sent SIGKILL by the remote host after `remote_kill_delay_seconds`.  The client itself is only killed along with
+        the job, in case the connection is lost.
+        """
+        with self._results_lock:
+            remote_job = self._remote_jobs.get(pid)
+        if remote_job is not None:
+            host, process_group_file = remote_job
+            process_group_file = shlex.quote(process_group_file)
+            if signum == signal.SIGTERM:
+                script = (f"pgid=$(cat {process_group_file} 2>/dev/null) && {{ kill -TERM -$pgid; "
+                          f"(sleep {self.remote_kill_delay_seconds}; kill -KILL -$pgid; rm -f {process_group_file}) "
+                          f">/dev/null 2>&1 & }} 2>/dev/null")
+            else:
+                script = (f"pgid=$(cat {process_group_file} 2>/dev/null) && kill -KILL -$pgid 2>/dev/null; "
+                          f"rm -f {process_group_file}")
+            try:
+                subprocess.run(self.get_ssh_arguments(host) + [script], stdin=subprocess.DEVNULL,
+                               capture_output=True, timeout=30)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                self.rmh.debug(f"Failed to signal remote job on host '{host}': {e}")
+            if signum == signal.SIGTERM:
+                return
+        super().signal_process_group(pid, signum)
+
+    def do_dispatch_job(self, job: Job, configuration: SshSchedulerConfiguration) -> JobResults:
+        results = JobResults()
+        results.timestamp_start = datetime.now()
+        if not configuration.dry_run:
+            self._control_directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            host: str = self.acquire_slot(job)
+            try:
+                self.rmh.debug(f"Running job '{job}' on host '{host}'")
+                process_group_file: str = f"/tmp/mio-ssh-job-{uuid.uuid4().hex}.pgid"
+                args: List[str] = self.get_ssh_arguments(host) + [self.get_remote_command(job, process_group_file)]
+                # The ssh client gets its own session, like local jobs, so that signals to mio do not reach it
+                if configuration.output_to_terminal:
+                    sinks: List[JobOutputSink] = []
+                    result = subprocess.Popen(args=args, stdin=subprocess.DEVNULL, text=True, start_new_session=True)
+                else:
+                    stdout_sink, stderr_sink = self.create_output_sinks(job, configuration, results)
+                    sinks = [stdout_sink, stderr_sink]
+                    result = subprocess.Popen(args=args, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                              stderr=subprocess.PIPE, start_new_session=True)
+                    drain_threads = [stdout_sink.drain_in_thread(result.stdout),
+                                     stderr_sink.drain_in_thread(result.stderr)]
+                with self._results_lock:
+                    self._remote_jobs[result.pid] = (host, process_group_file)
+                    if configuration.kill_job_on_termination:
+                        self._results_in_progress.append(result)
+                try:
+                    self.wait_for_process(result, configuration.timeout * 60, results, configuration.idle_timeout * 60,
+                                          sinks, configuration.termination_grace_period)
+                    if results.was_terminated:
+                        self.rmh.warning(f"Job '{job.name}' {results.termination_reason}: terminated")
+                        # The ssh client may still be waiting on a lost connection
+                        self.terminate_process_groups([result.pid], 0)
+                finally:
+                    with self._results_lock:
+                        del self._remote_jobs[result.pid]
+                        if configuration.kill_job_on_termination:
+                            self._results_in_progress.remove(result)
+                if not configuration.output_to_terminal:
+                    for thread in drain_threads:
+                        thread.join()
+                    stdout_sink.close()
+                    stderr_sink.close()
+                    results.stdout = stdout_sink.tail
+                    results.stderr = stderr_sink.tail
+                results.return_code = result.returncode
+            finally:
+                self.release_slot(host)
+        results.timestamp_end = datetime.now()
+        return results
+
+    def do_dispatch_job_set(self, job_set: JobSet, configuration: SshSchedulerConfiguration) -> List[JobResults]:
+        max_workers = max(1, min(configuration.max_number_of_parallel_processes, max(1, self.total_slots)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.dispatch_job, job, configuration) for job in job_set.tasks]
+            return [future.result() for future in futures]
@@ -1,10 +1,12 @@
 # Copyright 2020-2025 Datum Technology Corporation
 # All rights reserved.
 #######################################################################################################################
-import os
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from mio_client.core.scheduler import JobSchedulerConfiguration, JobScheduler, JobResults, Job, JobSet
+from typing import List
+from mio_client.core.scheduler import JobSchedulerConfiguration, JobScheduler, JobResults, Job, JobSet, JobOutputSink
 
 
 def get_schedulers():
@@ -18,7 +20,8 @@ class SubProcessSchedulerConfiguration(JobSchedulerConfiguration):
 class SubProcessScheduler(JobScheduler):
     def __init__(self, rmh: 'RootManager'):
         super().__init__(rmh, "sub_process")
-        self._results_in_progress = []
+        self._results_in_progress: List[subprocess.Popen] = []
+        self._results_lock: threading.Lock = threading.Lock()
 
     def is_available(self) -> bool:
         return True
@@ -27,38 +30,55 @@ class SubProcessScheduler(JobScheduler):
         pass
 
     def cleanup(self):
-        for result in self._results_in_progress:
-            result.kill()
+        with self._results_lock:
+            pids: List[int] = [result.pid for result in self._results_in_progress]
+        self.terminate_process_groups(pids, 1)
 
     def do_dispatch_job(self, job: Job, configuration: SubProcessSchedulerConfiguration) -> JobResults:
         results = JobResults()
         results.timestamp_start = datetime.now()
-        command_list: list[str] = job.pre_arguments + [str(job.binary)] + job.arguments
-        command_str = "  ".join(command_list)
-        path = os.environ['PATH']
-        path = f"{job.pre_path}:{path}:{job.post_path}"
-        final_env_vars = {**job.env_vars, **os.environ}
-        final_env_vars['PATH'] = path
+        final_env_vars = self.get_job_environment(job)
         if not configuration.dry_run:
+            args: List[str] = self.get_job_launch_arguments(job, final_env_vars)
+            # Each job gets its own session so that its whole process tree can be terminated
             if configuration.output_to_terminal:
-                result = subprocess.Popen(args=command_str, cwd=job.wd, shell=True, env=final_env_vars, text=True)
+                sinks: List[JobOutputSink] = []
+                result = subprocess.Popen(args=args, cwd=job.wd, env=final_env_vars, text=True,
+                                          start_new_session=True)
             else:
-                result = subprocess.Popen(args=command_str, cwd=job.wd, shell=True, env=final_env_vars,
-                                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                stdout_sink, stderr_sink = self.create_output_sinks(job, configuration, results)
+                sinks = [stdout_sink, stderr_sink]
+                result = subprocess.Popen(args=args, cwd=job.wd, env=final_env_vars,
+                                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True)
+                drain_threads = [stdout_sink.drain_in_thread(result.stdout), stderr_sink.drain_in_thread(result.stderr)]
             if configuration.kill_job_on_termination:
-                self._results_in_progress.append(result)
-            result.wait(timeout=configuration.timeout * 60)
-            if configuration.kill_job_on_termination:
-                self._results_in_progress.append(result)
-            if result.stdout:
-                results.stdout = str(result.stdout.read())
-            if result.stderr:
-                results.stderr = str(result.stderr.read())
+                with self._results_lock:
+                    self._results_in_progress.append(result)
+            try:
+                self.wait_for_process(result, configuration.timeout * 60, results, configuration.idle_timeout * 60,
+                                      sinks, configuration.termination_grace_period)
+            finally:
+                if configuration.kill_job_on_termination:
+                    with self._results_lock:
+                        self._results_in_progress.remove(result)
+            if results.was_terminated:
+                self.rmh.warning(f"Job '{job.name}' {results.termination_reason}: terminated")
+                # Orphans of the shell may still hold the output pipes open
+                self.terminate_process_groups([result.pid], 0)
+            if not configuration.output_to_terminal:
+                for thread in drain_threads:
+                    thread.join()
+                stdout_sink.close()
+                stderr_sink.close()
+                results.stdout = stdout_sink.tail
+                results.stderr = stderr_sink.tail
             results.return_code = result.returncode
         results.timestamp_end = datetime.now()
         return results
 
-    def do_dispatch_job_set(self, job_set: JobSet, configuration: SubProcessSchedulerConfiguration):
-        pass
-        # TODO IMPLEMENT
+    def do_dispatch_job_set(self, job_set: JobSet, configuration: SubProcessSchedulerConfiguration) -> List[JobResults]:
+        max_workers = max(1, configuration.max_number_of_parallel_processes)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.dispatch_job, job, configuration) for job in job_set.tasks]
+            return [future.result() for future in futures]
 
@@ -7,7 +7,6 @@ import sys
 from pathlib import Path
 from typing import List, Dict, Optional
 
-import fusesoc.main
 import yaml
 
 from mio_client.core.configuration import LogicSimulators
@@ -217,6 +216,7 @@ class FuseSocService(Service):
             core_paths.append(str((self.rmh.project_root_path / path).absolute()))
         try:
             # Invoke FuseSoC
+            import fusesoc.main
             raw_args = []
             for path in core_paths:
                 raw_args.append("--cores-root")
@@ -23,7 +23,7 @@ from pydantic.types import constr
 from enum import Enum
 
 from ..core.configuration import LogicSimulators
-from ..core.scheduler import JobScheduler, Job, JobSchedulerConfiguration, JobResults
+from ..core.scheduler import JobScheduler, Job, JobSchedulerConfiguration, JobResults, JobResourceUsage
 from ..core.service import Service, ServiceType
 from ..core.ip import Ip
 from ..core.model import Model, VALID_NAME_REGEX
@@ -393,6 +393,74 @@ class TestSuite(Model):
                 self._resolved_regressions[regression_name].verbosity = self.ts.verbosity[regression_name]
 
 
+class SimulationDurationHistory(Model):
+    """
+    Wall-clock durations (in seconds) of past simulations, keyed by IP, target, test and arguments.  Used to dispatch
+    the longest simulations first.
+    """
+    durations: Dict[str, float] = {}
+
+    def __init__(self, **data: Any):
+        super().__init__(**data)
+        self._file_path: Path = None
+
+    @classmethod
+    def load(cls, file_path: Path) -> 'SimulationDurationHistory':
+        data = None
+        if os.path.isfile(file_path):
+            try:
+                with open(file_path, 'r') as f:
+                    data = yaml.safe_load(f)
+            except Exception:
+                data = None
+        if data is None:
+            data = {}
+        try:
+            instance = cls(**data)
+        except Exception:
+            instance = cls()
+        instance._file_path = Path(file_path)
+        return instance
+
+    def save(self, file_path: Path=None):
+        if file_path is None:
+            file_path = self._file_path
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+        with open(temp_file_path, 'w') as f:
+            yaml.safe_dump(self.model_dump(), f)
+        os.replace(temp_file_path, file_path)
+
+    @staticmethod
+    def get_key(ip_name: str, request: LogicSimulatorSimulationRequest) -> str:
+        args: List[str] = sorted(request.args_boolean)
+        args += sorted(f"{name}={value}" for name, value in request.args_value.items())
+        return f"{ip_name}#{request.target}/{request.test_name}/{','.join(args)}"
+
+    def record(self, key: str, duration: float, weight: float=0.5):
+        """
+        Folds a new measurement into the history as an exponential moving average.
+        """
+        if key in self.durations:
+            self.durations[key] = (weight * duration) + ((1 - weight) * self.durations[key])
+        else:
+            self.durations[key] = duration
+
+    def predict(self, key: str, default: float) -> float:
+        return self.durations.get(key, default)
+
+    def order_longest_first(self, ip_name: str, requests: List[LogicSimulatorSimulationRequest]) -> List[LogicSimulatorSimulationRequest]:
+        """
+        Returns `requests` sorted by predicted duration, longest first.  Simulations never seen before are predicted to
+        take as long as the average known simulation.
+        """
+        keys: Dict[LogicSimulatorSimulationRequest, str] = {request: self.get_key(ip_name, request) for request in requests}
+        known: List[float] = [self.durations[key] for key in keys.values() if key in self.durations]
+        default: float = (sum(known) / len(known)) if known else 0
+        return sorted(requests, key=lambda request: self.predict(keys[request], default), reverse=True)
+
+
 class RegressionRequest:
     def __init__(self):
         self.target: str = ""
@@ -407,6 +475,7 @@ class RegressionRequest:
 class RegressionSimulationReport:
     def __init__(self):
         self.test_spec: ResolvedTestSpec
+        self.sim_request: LogicSimulatorSimulationRequest = None
         self.sim_report: LogicSimulatorSimulationReport
 
 class TestGroupReport(Model):
@@ -470,6 +539,7 @@ class RegressionReport(Model):
     timestamp_start: Optional[datetime.datetime] = datetime.datetime.now()
     timestamp_end: Optional[datetime.datetime] = datetime.datetime.now()
     duration: Optional[datetime.timedelta] = datetime.timedelta()
+    resource_usage: Optional[JobResourceUsage] = None
 
     def __init__(self, rmh: 'RootManager', **data):
         super().__init__(**data)
@@ -514,6 +584,8 @@ class RegressionReport(Model):
         verbosity_property: SubElement = SubElement(root_testsuite_properties, 'property')
         verbosity_property.set('name', 'verbosity')
         verbosity_property.set('value', self.verbosity.value)
+        if self.resource_usage:
+            self.add_resource_usage_properties(root_testsuite_properties, self.resource_usage)
         for test_set in self.test_set_reports:
             test_set_testsuite: SubElement = SubElement(root_testsuite_properties, 'testsuite')
             test_set_testsuite.set('name', test_set.name)
@@ -533,6 +605,9 @@ class RegressionReport(Model):
                     seed_property: SubElement = SubElement(simulation_report_properties, 'property')
                     seed_property.set('name', 'seed')
                     seed_property.set('value', str(simulation_report.seed))
+                    if simulation_report.resource_usage:
+                        self.add_resource_usage_properties(simulation_report_properties,
+                                                           simulation_report.resource_usage)
                     for error_message in simulation_report.errors:
                         error_error: SubElement = SubElement(simulation_report_testcase, 'error')
                         error_error.set('message', error_message)
@@ -553,6 +628,12 @@ class RegressionReport(Model):
         tree = ElementTree.ElementTree(root)
         return tree
 
+    def add_resource_usage_properties(self, properties: SubElement, resource_usage: JobResourceUsage):
+        for name, value in resource_usage.as_dict().items():
+            usage_property: SubElement = SubElement(properties, 'property')
+            usage_property.set('name', name)
+            usage_property.set('value', str(value))
+
     def generate_junit_xml_report(self):
         xml_tree: ElementTree.ElementTree = self.generate_junit_xml_report_tree()
         xml_tree.write(self.junit_xml_report_file_name, encoding='utf-8', xml_declaration=True)
@@ -591,7 +672,7 @@ class RegressionRunner:
             if self.request.dsim_cloud_mode:
                 self.dsim_cloud_simulation()
             else:
-                self.regression.max_jobs = 1
+                # Concurrency is bounded by the 'dsim' license token pool (scheduling.license_tokens)
                 self.parallel_simulation()
         else:
             self.parallel_simulation()
@@ -603,9 +684,11 @@ class RegressionRunner:
     def parallel_simulation(self):
         if not self.request.dry_mode:
             timeout = self.regression.max_duration * 3600
+            duration_history: SimulationDurationHistory = self.db.duration_history
+            sim_requests = duration_history.order_longest_first(self.ip.lib_name, self.request.simulation_requests)
             with ThreadPoolExecutor(max_workers=self.regression.max_jobs) as executor:
                 future_simulations = [executor.submit(self.launch_simulation, sim_request) for sim_request in
-                                      self.request.simulation_requests]
+                                      sim_requests]
                 with tqdm(total=len(self.request.simulation_requests), desc="Simulations") as pbar:
                     for future in as_completed(future_simulations):
                         try:
@@ -618,12 +701,27 @@ class RegressionRunner:
             self.report.success = True
             for simulation_report in self.report.simulation_reports:
                 self.report.success &= simulation_report.sim_report.success
+            self.record_durations()
+
+    def record_durations(self):
+        # Failing simulations often end early: only passing ones are representative
+        duration_history: SimulationDurationHistory = self.db.duration_history
+        for simulation_report in self.report.simulation_reports:
+            sim_report: LogicSimulatorSimulationReport = simulation_report.sim_report
+            if sim_report.success:
+                key = SimulationDurationHistory.get_key(self.ip.lib_name, simulation_report.sim_request)
+                duration_history.record(key, sim_report.duration.total_seconds())
+        try:
+            duration_history.save()
+        except Exception as e:
+            self.rmh.warning(f"Failed to save simulation duration history: {e}")
     
     def launch_simulation(self, request: LogicSimulatorSimulationRequest):
         sim_report: LogicSimulatorSimulationReport = self.simulator.simulate(self.ip, request, self.scheduler)
         test_spec: ResolvedTestSpec = self.regression.test_specs[request]
         regression_sim_report: RegressionSimulationReport = RegressionSimulationReport()
         regression_sim_report.test_spec = test_spec
+        regression_sim_report.sim_request = request
         regression_sim_report.sim_report = sim_report
         self.report.simulation_reports.append(regression_sim_report)
     
@@ -752,6 +850,11 @@ class RegressionRunner:
                 else:
                     self.report.failing_tests.append(simulation_report)
             self.report.simulator = self.request.app
+            for simulation_report in self.report.simulation_reports:
+                if simulation_report.sim_report.resource_usage:
+                    if not self.report.resource_usage:
+                        self.report.resource_usage = JobResourceUsage()
+                    self.report.resource_usage.add(simulation_report.sim_report.resource_usage)
             self.report.num_tests = len(self.report.simulation_reports)
             self.report.num_passing_tests = len(self.report.passing_tests)
             self.report.num_passing_tests_with_no_warnings = len(self.report.passing_tests_with_no_warnings)
@@ -790,6 +893,7 @@ class RegressionDatabase(Service):
         super().__init__(rmh, 'datum', 'regression_database', 'Regression Database')
         self._type = ServiceType.REGRESSION
         self._test_suites: List[TestSuite] = []
+        self._duration_history: SimulationDurationHistory = None
 
     def is_available(self) -> bool:
         return True
@@ -802,6 +906,16 @@ class RegressionDatabase(Service):
 
     def get_version(self) -> Version:
         return Version('1.0.0')
+
+    @property
+    def duration_history_file_path(self) -> Path:
+        return self.rmh.md / "regression_durations.yml"
+
+    @property
+    def duration_history(self) -> SimulationDurationHistory:
+        if not self._duration_history:
+            self._duration_history = SimulationDurationHistory.load(self.duration_history_file_path)
+        return self._duration_history
     
     def discover_test_suites(self, path: Path):
         path = Path(path)  # Ensure `path` is a Path object
@@ -4,6 +4,7 @@
 import datetime
 import os
 import re
+import shlex
 import time
 from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
@@ -16,7 +17,7 @@ from jinja2 import Template
 from semantic_version import Version
 
 from ..core.configuration import DSimCloudComputeSizes
-from ..core.scheduler import JobScheduler, Job, JobSchedulerConfiguration, JobResults
+from ..core.scheduler import JobScheduler, Job, JobSchedulerConfiguration, JobResults, JobGraph, JobResourceUsage
 from ..core.service import Service, ServiceType
 from ..core.ip import Ip, IpLocationType, DutType
 from abc import ABC, abstractmethod
@@ -126,6 +127,7 @@ class LogicSimulatorSimulationReport(LogicSimulatorReport):
     simulation_success: Optional[bool] = False
     cmd_log_file_path: Optional[Path] = Path()
     shared_objects: Optional[list[Path]] = []
+    resource_usage: Optional[JobResourceUsage] = None
     def __hash__(self):
         return hash(self.seed)
     
@@ -324,7 +326,6 @@ class LogicSimulator(Service, ABC):
     def oldest_uvm_version_supported(self) -> Version:
         pass
 
-    @property
     def is_available(self) -> bool:
         return self.rmh.directory_exists(self.installation_path)
 
@@ -393,6 +394,7 @@ class LogicSimulator(Service, ABC):
         scheduler_config.dry_run = request.dry_mode
         scheduler_config.output_to_terminal = self.rmh.print_trace
         scheduler_config.timeout = self.rmh.configuration.logic_simulation.compilation_timeout
+        scheduler_config.use_job_cache = self.use_job_cache
         report.ordered_dependencies = ip.get_dependencies_in_order()
         self.build_sv_flist(ip, request, report)
         self.build_vhdl_flist(ip, request, report)
@@ -449,6 +451,7 @@ class LogicSimulator(Service, ABC):
         scheduler_config.dry_run = request.dry_mode
         scheduler_config.output_to_terminal = self.rmh.print_trace
         scheduler_config.timeout = self.rmh.configuration.logic_simulation.compilation_and_elaboration_timeout
+        scheduler_config.use_job_cache = self.use_job_cache
         report.ordered_dependencies = ip.get_dependencies_in_order()
         self.build_sv_flist(ip, request, report)
         if not report.has_files_to_compile:
@@ -480,6 +483,7 @@ class LogicSimulator(Service, ABC):
         scheduler_config = JobSchedulerConfiguration(self.rmh)
         scheduler_config.dry_run = request.dry_mode
         scheduler_config.timeout = self.rmh.configuration.logic_simulation.simulation_timeout
+        scheduler_config.idle_timeout = self.rmh.configuration.logic_simulation.simulation_idle_timeout
         scheduler_config.output_to_terminal = request.print_to_terminal
         # Create work dir
         report.work_directory = self.work_path / f"{ip.work_directory_name}"
@@ -707,6 +711,63 @@ class LogicSimulator(Service, ABC):
         report.num_fatals = len(report.fatals)
         report.success &= (report.num_errors == 0) and (report.num_fatals == 0)
 
+    @property
+    def use_job_cache(self) -> bool:
+        if self.rmh.configuration and self.rmh.configuration.scheduling:
+            return self.rmh.configuration.scheduling.job_cache
+        return False
+
+    def split_arguments(self, arguments: List[str]) -> List[str]:
+        """
+        Splits arguments from the configuration, which are shell fragments (ex: '-suppress A:B'), into argv entries for
+        jobs that are not run via a shell.
+        """
+        return [token for argument in arguments for token in shlex.split(argument)]
+
+    def declare_compilation_job_files(self, job: Job,
+                                      report: Union[LogicSimulatorCompilationReport, LogicSimulatorCompilationAndElaborationReport],
+                                      library_path: Path, log_path: Path):
+        """
+        Declares the inputs and outputs of a compilation job so that its results can be cached.  SystemVerilog and VHDL
+        compilation write to the same library: each job's inputs include both file lists.
+        """
+        if isinstance(report, LogicSimulatorCompilationReport):
+            if report.has_sv_files_to_compile:
+                job.input_file_lists.append(report.sv_file_list_path)
+            if report.has_vhdl_files_to_compile:
+                job.input_file_lists.append(report.vhdl_file_list_path)
+        else:
+            job.input_file_lists.append(report.file_list_path)
+        job.input_files += list(report.shared_objects)
+        job.output_files += [library_path, log_path]
+
+    def dispatch_compilation_jobs(self, report: LogicSimulatorCompilationReport, job_cmp_vhdl: Optional[Job],
+                                  job_cmp_sv: Optional[Job], scheduler: JobScheduler,
+                                  scheduler_config: JobSchedulerConfiguration):
+        """
+        Dispatches the VHDL and SystemVerilog compilation jobs as a job graph.  Neither depends on the other (design units
+        are bound during elaboration) but both write to the same library: they only run concurrently if
+        `scheduler_config` allows more than one job at a time.
+        """
+        job_graph = JobGraph(self.rmh, f"{self.name}_compilation")
+        if job_cmp_vhdl:
+            job_graph.add_task(job_cmp_vhdl)
+        if job_cmp_sv:
+            job_graph.add_task(job_cmp_sv)
+        if len(job_graph.tasks) == 0:
+            return
+        results: Dict[Job, JobResults] = dict(zip(job_graph.tasks,
+                                                  scheduler.dispatch_job_graph(job_graph, scheduler_config)))
+        if job_cmp_vhdl:
+            report.vhdl_compilation_success = (results[job_cmp_vhdl].return_code == 0)
+            report.timestamp_start = results[job_cmp_vhdl].timestamp_start
+            report.timestamp_end = results[job_cmp_vhdl].timestamp_end
+        if job_cmp_sv:
+            report.sv_compilation_success = (results[job_cmp_sv].return_code == 0)
+            if not job_cmp_vhdl:
+                report.timestamp_start = results[job_cmp_sv].timestamp_start
+            report.timestamp_end = results[job_cmp_sv].timestamp_end
+
     def build_sv_flist(self, ip:Ip,
                        request:Union[LogicSimulatorCompilationRequest, LogicSimulatorCompilationAndElaborationRequest],
                        report:Union[LogicSimulatorCompilationReport, LogicSimulatorCompilationAndElaborationReport]):
@@ -1322,6 +1383,7 @@ class SimulatorMetricsDSim(LogicSimulator):
         job.env_vars["LD_LIBRARY_PATH"] = f"{dsim_home}/lib:" +"${LD_LIBRARY_PATH}:" + f"{dsim_home}/llvm_small/lib"
         job.env_vars["UVM_HOME"] = f"{dsim_home}/uvm/" + self.rmh.configuration.logic_simulation.uvm_version.value
         job.env_vars["DSIM_LICENSE"] = self.rmh.configuration.logic_simulation.altair_dsim_license_path
+        job.license_tokens["dsim"] = 1
 
     def do_create_library(self, ip: Ip, request: LogicSimulatorLibraryCreationRequest, report: LogicSimulatorLibraryCreationReport, scheduler: JobScheduler, scheduler_config: JobSchedulerConfiguration):
         pass
@@ -1333,15 +1395,17 @@ class SimulatorMetricsDSim(LogicSimulator):
         report.success = True
 
     def do_compile(self, ip: Ip, request: LogicSimulatorCompilationRequest, report: LogicSimulatorCompilationReport, scheduler: JobScheduler, scheduler_config: JobSchedulerConfiguration):
-        defines_str = ""
+        defines_args: List[str] = []
         for define in report.user_defines_boolean:
-            defines_str += f" +define+{define}"
+            defines_args.append(f"+define+{define}")
         for define in report.user_defines_value:
-            defines_str += f" +define+{define}={report.user_defines_value[define]}"
-        so_str = ""
+            defines_args.append(f"+define+{define}={report.user_defines_value[define]}")
+        so_args: List[str] = []
         if os.name == 'nt':  # DSim for Windows requires SOs at compile time
             for so in report.shared_objects:
-                so_str += f" -sv_lib {so}"
+                so_args += ["-sv_lib", str(so)]
+        job_cmp_vhdl: Job = None
+        job_cmp_sv: Job = None
         if report.has_vhdl_files_to_compile:
             if request.use_relative_paths:
                 vhdl_file_list_path: str = str(os.path.relpath(report.vhdl_file_list_path, request.start_path))
@@ -1349,17 +1413,20 @@ class SimulatorMetricsDSim(LogicSimulator):
             else:
                 vhdl_file_list_path: str = str(report.vhdl_file_list_path)
                 vhdl_log_path: str = str(report.vhdl_log_path)
-            args = self.rmh.configuration.logic_simulation.altair_dsim_default_compilation_vhdl_arguments + [
-                defines_str,
-                f"-f {vhdl_file_list_path}",
-                f"-uvm {self.rmh.configuration.logic_simulation.uvm_version.value}",
-                so_str,
-                f"-lib {ip.lib_name}",
-                f"-l {vhdl_log_path}"
+            args = self.split_arguments(self.rmh.configuration.logic_simulation.altair_dsim_default_compilation_vhdl_arguments) + [
+                *defines_args,
+                "-f", vhdl_file_list_path,
+                "-uvm", self.rmh.configuration.logic_simulation.uvm_version.value,
+                *so_args,
+                "-lib", ip.lib_name,
+                "-l", vhdl_log_path
             ]
             job_cmp_vhdl = Job(self.rmh, report.work_directory, f"dsim_vhdl_compilation_{ip.lib_name}",
                                Path(os.path.join(self.installation_path, "bin", "dvhcom")), args)
+            job_cmp_vhdl.use_shell = False
             self.set_job_env(job_cmp_vhdl)
+            self.declare_compilation_job_files(job_cmp_vhdl, report, report.work_directory / "dsim_work",
+                                               report.vhdl_log_path)
             if self.cloud_mode:
                 self._cloud_sim_task_cmp_elab.commands.append(str(job_cmp_vhdl))
                 self._cloud_sim_task_cmp_elab.outputs.artifacts.append(
@@ -1368,11 +1435,6 @@ class SimulatorMetricsDSim(LogicSimulator):
                 report.jobs.append(job_cmp_vhdl)
                 if request.log_vhdl_cmd:
                     job_cmp_vhdl.write_to_file(report.vhdl_cmd_log_file_path)
-                results_cmp_vhdl = scheduler.dispatch_job(job_cmp_vhdl, scheduler_config)
-                report.vhdl_compilation_success = (results_cmp_vhdl.return_code == 0)
-                report.timestamp_start = results_cmp_vhdl.timestamp_start
-                if not report.has_sv_files_to_compile:
-                    report.timestamp_end = results_cmp_vhdl.timestamp_end
         else:
             report.vhdl_compilation_success = True
         if report.has_sv_files_to_compile:
@@ -1382,17 +1444,20 @@ class SimulatorMetricsDSim(LogicSimulator):
             else:
                 sv_file_list_path: str = str(report.sv_file_list_path)
                 sv_log_path: str = str(report.sv_log_path)
-            args = self.rmh.configuration.logic_simulation.altair_dsim_default_compilation_sv_arguments + [
-                defines_str,
-                f"-f {sv_file_list_path}",
-                f"-uvm {self.rmh.configuration.logic_simulation.uvm_version.value}",
-                so_str,
-                f"-lib {ip.lib_name}",
-                f"-l {sv_log_path}"
+            args = self.split_arguments(self.rmh.configuration.logic_simulation.altair_dsim_default_compilation_sv_arguments) + [
+                *defines_args,
+                "-f", sv_file_list_path,
+                "-uvm", self.rmh.configuration.logic_simulation.uvm_version.value,
+                *so_args,
+                "-lib", ip.lib_name,
+                "-l", sv_log_path
             ]
             job_cmp_sv = Job(self.rmh, report.work_directory, f"dsim_sv_compilation_{ip.lib_name}",
                              Path(os.path.join(self.installation_path, "bin", "dvlcom")), args)
+            job_cmp_sv.use_shell = False
             self.set_job_env(job_cmp_sv)
+            self.declare_compilation_job_files(job_cmp_sv, report, report.work_directory / "dsim_work",
+                                               report.sv_log_path)
             if self.cloud_mode:
                 self._cloud_sim_task_cmp_elab.commands.append(str(job_cmp_sv))
                 self._cloud_sim_task_cmp_elab.outputs.artifacts.append(
@@ -1401,31 +1466,29 @@ class SimulatorMetricsDSim(LogicSimulator):
                 report.jobs.append(job_cmp_sv)
                 if request.log_sv_cmd:
                     job_cmp_sv.write_to_file(report.sv_cmd_log_file_path)
-                results_cmp_sv = scheduler.dispatch_job(job_cmp_sv, scheduler_config)
-                report.sv_compilation_success = (results_cmp_sv.return_code == 0)
-                if not report.has_vhdl_files_to_compile:
-                    report.timestamp_start = results_cmp_sv.timestamp_start
-                report.timestamp_end = results_cmp_sv.timestamp_end
         else:
             report.sv_compilation_success = True
+        if not self.cloud_mode:
+            self.dispatch_compilation_jobs(report, job_cmp_vhdl, job_cmp_sv, scheduler, scheduler_config)
 
     def do_elaborate(self, ip: Ip, request: LogicSimulatorElaborationRequest, report: LogicSimulatorElaborationReport, scheduler: JobScheduler, scheduler_config: JobSchedulerConfiguration):
-        top_str = ""
+        top_args: List[str] = []
         for top in ip.hdl_src.top:
-            top_str = f"{top_str} -top {top}"
+            top_args += ["-top", top]
         if request.use_relative_paths:
             log_path = os.path.relpath(report.log_path, request.start_path)
         else:
             log_path = report.log_path
-        args = self.rmh.configuration.logic_simulation.altair_dsim_default_elaboration_arguments + [
-            f"-genimage {ip.lib_name}",
-            f"-uvm {self.rmh.configuration.logic_simulation.uvm_version.value}",
-            top_str,
-            f"-lib {ip.lib_name}",
-            f"-l {log_path}",
+        args = self.split_arguments(self.rmh.configuration.logic_simulation.altair_dsim_default_elaboration_arguments) + [
+            "-genimage", ip.lib_name,
+            "-uvm", self.rmh.configuration.logic_simulation.uvm_version.value,
+            *top_args,
+            "-lib", ip.lib_name,
+            "-l", str(log_path),
         ]
         job_elaborate = Job(self.rmh, report.work_directory, f"dsim_elaboration_{ip.lib_name}",
                             Path(os.path.join(self.installation_path, "bin", "dsim")), args)
+        job_elaborate.use_shell = False
         self.set_job_env(job_elaborate)
         if self.cloud_mode:
             self._cloud_sim_task_cmp_elab.commands.append(str(job_elaborate))
@@ -1442,18 +1505,18 @@ class SimulatorMetricsDSim(LogicSimulator):
 
     def do_compile_and_elaborate(self, ip: Ip, request: LogicSimulatorCompilationAndElaborationRequest, report: LogicSimulatorCompilationAndElaborationReport, scheduler: JobScheduler, scheduler_config: JobSchedulerConfiguration):
         if not ip.has_vhdl_content:
-            defines_str = ""
+            defines_args: List[str] = []
             for define in report.user_defines_boolean:
-                defines_str += f" +define+{define}"
+                defines_args.append(f"+define+{define}")
             for define in report.user_defines_value:
-                defines_str += f" +define+{define}={report.user_defines_value[define]}"
-            top_str = ""
+                defines_args.append(f"+define+{define}={report.user_defines_value[define]}")
+            top_args: List[str] = []
             for top in ip.hdl_src.top:
-                top_str = f"{top_str} -top {top}"
-            so_str = ""
+                top_args += ["-top", top]
+            so_args: List[str] = []
             if os.name == 'nt':  # DSim for Windows requires SOs at compile time
                 for so in report.shared_objects:
-                    so_str += f" -sv_lib {so}"
+                    so_args += ["-sv_lib", str(so)]
             if request.use_relative_paths:
                 log_path = str(os.path.relpath(report.log_path, request.start_path))
             else:
@@ -1462,20 +1525,23 @@ class SimulatorMetricsDSim(LogicSimulator):
                 file_list_path = str(os.path.relpath(report.file_list_path, request.start_path))
             else:
                 file_list_path = str(report.file_list_path)
-            args = self.rmh.configuration.logic_simulation.altair_dsim_default_compilation_and_elaboration_arguments + [
-                f"-genimage {ip.lib_name}",
-                defines_str,
-                so_str,
-                f"-f {file_list_path}",
-                f"-uvm {self.rmh.configuration.logic_simulation.uvm_version.value}",
-                top_str,
-                f"-lib {ip.lib_name}",
-                f"-l {log_path}"
+            args = self.split_arguments(self.rmh.configuration.logic_simulation.altair_dsim_default_compilation_and_elaboration_arguments) + [
+                "-genimage", ip.lib_name,
+                *defines_args,
+                *so_args,
+                "-f", file_list_path,
+                "-uvm", self.rmh.configuration.logic_simulation.uvm_version.value,
+                *top_args,
+                "-lib", ip.lib_name,
+                "-l", log_path
             ]
             job_compile_and_elaborate = Job(self.rmh, report.work_directory,
                                       f"dsim_compilation_and_elaboration_{ip.lib_name}",
                                             Path(os.path.join(self.installation_path, "bin", "dsim")), args)
+            job_compile_and_elaborate.use_shell = False
             self.set_job_env(job_compile_and_elaborate)
+            self.declare_compilation_job_files(job_compile_and_elaborate, report, report.work_directory / "dsim_work",
+                                               report.log_path)
             if self.cloud_mode:
                 self._cloud_sim_task_cmp_elab.commands.append(str(job_compile_and_elaborate))
                 self._cloud_sim_task_cmp_elab.outputs.artifacts.append(
@@ -1492,47 +1558,48 @@ class SimulatorMetricsDSim(LogicSimulator):
             raise Exception(f"Cannot perform Compilation+Elaboration with DSim for IPs containing VHDL content: IP '{ip}'")
 
     def do_simulate(self, ip: Ip, request: LogicSimulatorSimulationRequest, report: LogicSimulatorSimulationReport, scheduler: JobScheduler, scheduler_config: JobSchedulerConfiguration):
-        args_str = ""
+        plus_args: List[str] = []
         for arg in report.args_boolean:
-            args_str += f" +{arg}"
+            plus_args.append(f"+{arg}")
         for arg in report.args_value:
-            args_str += f" +{arg}={report.args_value[arg]}"
-        so_str = ""
+            plus_args.append(f"+{arg}={report.args_value[arg]}")
+        so_args: List[str] = []
         if self.cloud_mode or (os.name != 'nt'):  # DSim for Linux requires SOs at runtime
             for so in report.shared_objects:
-                so_str += f" -sv_lib {so}"
+                so_args += ["-sv_lib", str(so)]
         if request.use_relative_paths:
             log_path = os.path.relpath(report.log_path, request.start_path)
         else:
             log_path = report.log_path
-        args = self.rmh.configuration.logic_simulation.altair_dsim_default_simulation_arguments + [
-            f"-image {ip.lib_name}",
-            args_str,
-            so_str,
-            f"-sv_seed {request.seed}",
-            f"-uvm {self.rmh.configuration.logic_simulation.uvm_version.value}",
-            #f"-sv_lib libcurl.so",
-            f"-timescale {self.rmh.configuration.logic_simulation.timescale}",
-            f"-l {log_path}"
+        args = self.split_arguments(self.rmh.configuration.logic_simulation.altair_dsim_default_simulation_arguments) + [
+            "-image", ip.lib_name,
+            *plus_args,
+            *so_args,
+            "-sv_seed", str(request.seed),
+            "-uvm", self.rmh.configuration.logic_simulation.uvm_version.value,
+            #"-sv_lib", "libcurl.so",
+            "-timescale", self.rmh.configuration.logic_simulation.timescale,
+            "-l", str(log_path)
         ]
         if request.enable_waveform_capture:
             if request.use_relative_paths:
                 waveform_file_path = os.path.relpath(report.waveform_file_path, request.start_path)
             else:
                 waveform_file_path = report.waveform_file_path
-            args.append(f"-waves {waveform_file_path}.mxd")
+            args += ["-waves", f"{waveform_file_path}.mxd"]
         if request.enable_coverage:
             coverage_directory: Path = report.coverage_directory / "dsim.db"
             if request.use_relative_paths:
                 coverage_directory = os.path.relpath(coverage_directory, request.start_path)
             else:
                 coverage_directory = coverage_directory
-            args.append(f"-code-cov a")
-            args.append(f"-cov-db {coverage_directory}")
+            args += ["-code-cov", "a"]
+            args += ["-cov-db", str(coverage_directory)]
         else:
-            args.append(f"-no-fcov")
+            args.append("-no-fcov")
         job_simulate: Job = Job(self.rmh, report.work_directory, f"dsim_simulation_{ip.lib_name}",
                                 Path(os.path.join(self.installation_path, "bin", "dsim")), args)
+        job_simulate.use_shell = False
         self.set_job_env(job_simulate)
         if self.cloud_mode:
             sim_task = min(self._cloud_sim_tasks_simulate, key=lambda task: len(task.commands), default=None)
@@ -1547,6 +1614,7 @@ class SimulatorMetricsDSim(LogicSimulator):
             report.simulation_success = (results_simulate.return_code == 0)
             report.timestamp_start = results_simulate.timestamp_start
             report.timestamp_end = results_simulate.timestamp_end
+            report.resource_usage = results_simulate.resource_usage
 
     def get_view_waves_command(self, request: LogicSimulatorSimulationRequest, report: LogicSimulatorSimulationReport):
         viewer_bin_path: Path = Path(os.path.join(self.rmh.configuration.logic_simulation.vscode_installation_path, "code"))
@@ -1779,7 +1847,8 @@ class SimulatorMetricsDSim(LogicSimulator):
 
     def dsim_cloud_init_workspace(self, ip: Ip, request: DSimCloudSimulationRequest, report: DSimCloudSimulationReport, scheduler: JobScheduler):
         scheduler_config: JobSchedulerConfiguration = JobSchedulerConfiguration(self.rmh)
-        scheduler_config.output_to_terminal = self.rmh.print_trace
+        scheduler_config.output_to_terminal = False
+        scheduler_config.tee_output_to_terminal = self.rmh.print_trace
         args: List[str] = [
             "init",
             "--local-only"
@@ -1797,7 +1866,8 @@ class SimulatorMetricsDSim(LogicSimulator):
 
     def dsim_cloud_workspace_status(self, ip: Ip, request: DSimCloudSimulationRequest, report: DSimCloudSimulationReport, scheduler: JobScheduler) -> DSimCloudWorkspaceStatus:
         scheduler_config: JobSchedulerConfiguration = JobSchedulerConfiguration(self.rmh)
-        scheduler_config.output_to_terminal = self.rmh.print_trace
+        scheduler_config.output_to_terminal = False
+        scheduler_config.tee_output_to_terminal = self.rmh.print_trace
         args: List[str] = [
             "status"
         ]
@@ -1825,7 +1895,8 @@ class SimulatorMetricsDSim(LogicSimulator):
 
     def dsim_cloud_submit_job(self, ip: Ip, request: DSimCloudSimulationRequest, report: DSimCloudSimulationReport, scheduler: JobScheduler) -> str:
         scheduler_config: JobSchedulerConfiguration = JobSchedulerConfiguration(self.rmh)
-        scheduler_config.output_to_terminal = self.rmh.print_trace
+        scheduler_config.output_to_terminal = False
+        scheduler_config.tee_output_to_terminal = self.rmh.print_trace
         scheduler_config.kill_job_on_termination = False
         verbosity_str: str = ""
         if self.rmh.print_trace:
@@ -1846,7 +1917,7 @@ class SimulatorMetricsDSim(LogicSimulator):
         else:
             stdout: str = results.stdout.lower()
             if "job submitted." in stdout:
-                job_id_match: re.Match[str] = re.search(r'job id:\s*(\S+)$', stdout)
+                job_id_match: re.Match[str] = re.search(r'job id:\s*(\S+)\s*$', stdout, re.MULTILINE)
                 if job_id_match:
                     job_id: str = job_id_match.group(1).replace("\\n", "").strip()
                     return job_id
@@ -2125,7 +2196,7 @@ class SimulatorXilinxVivado(LogicSimulator):
     def do_compile(self, ip: Ip, request: LogicSimulatorCompilationRequest,
                    report: LogicSimulatorCompilationReport, scheduler: JobScheduler,
                    scheduler_config: JobSchedulerConfiguration):
-        defines_str: str = ""
+        defines_args: List[str] = []
         # Getting around Vivado bug where it ignores defines within filelists
         target_defines_boolean: List[str] = []
         for define_boolean in report.target_defines_boolean:
@@ -2133,12 +2204,14 @@ class SimulatorXilinxVivado(LogicSimulator):
                 target_defines_boolean.append(define_boolean)
         all_defines_boolean = target_defines_boolean + report.user_defines_boolean
         for define in all_defines_boolean:
-            defines_str += f" -d {define}"
+            defines_args += ["-d", define]
         all_defines_value: Dict[str, str] = {}
         all_defines_value.update(report.target_defines_value)
         all_defines_value.update(report.user_defines_value)
         for define in all_defines_value:
-            defines_str += f" -d {define}={all_defines_value[define]}"
+            defines_args += ["-d", f"{define}={all_defines_value[define]}"]
+        job_cmp_vhdl: Job = None
+        job_cmp_sv: Job = None
         if report.has_vhdl_files_to_compile:
             if request.use_relative_paths:
                 vhdl_file_list_path: str = str(os.path.relpath(report.vhdl_file_list_path, request.start_path))
@@ -2146,27 +2219,25 @@ class SimulatorXilinxVivado(LogicSimulator):
             else:
                 vhdl_file_list_path: str = str(report.vhdl_file_list_path)
                 vhdl_log_path: str = str(report.vhdl_log_path)
-            args = self.rmh.configuration.logic_simulation.xilinx_vivado_default_compilation_vhdl_arguments + [
-                defines_str,
-                f"-f {vhdl_file_list_path}",
-                f"-L uvm",
-                f"--uvm_version {self.rmh.configuration.logic_simulation.uvm_version.value}",
-                f"--work {ip.lib_name}",
-                f"--log {vhdl_log_path}"
+            args = self.split_arguments(self.rmh.configuration.logic_simulation.xilinx_vivado_default_compilation_vhdl_arguments) + [
+                *defines_args,
+                "-f", vhdl_file_list_path,
+                "-L", "uvm",
+                "--uvm_version", self.rmh.configuration.logic_simulation.uvm_version.value,
+                "--work", ip.lib_name,
+                "--log", vhdl_log_path
             ]
             # Adding verbosity to Vivado for compilation causes it to hang! (Code below)
             #if self.rmh.print_trace:
-            #    args.append(f"--verbose 2")
+            #    args += ["--verbose", "2"]
             job_cmp_vhdl = Job(self.rmh, report.work_directory, f"vivado_vhdl_compilation_{ip.lib_name}",
                                Path(os.path.join(self.installation_path, "bin", "xvhdl")), args)
+            job_cmp_vhdl.use_shell = False
+            self.declare_compilation_job_files(job_cmp_vhdl, report, report.work_directory / "xsim.dir",
+                                               report.vhdl_log_path)
             report.jobs.append(job_cmp_vhdl)
             if request.log_vhdl_cmd:
                 job_cmp_vhdl.write_to_file(report.vhdl_cmd_log_file_path)
-            results_cmp_vhdl = scheduler.dispatch_job(job_cmp_vhdl, scheduler_config)
-            report.vhdl_compilation_success = (results_cmp_vhdl.return_code == 0)
-            report.timestamp_start = results_cmp_vhdl.timestamp_start
-            if not report.has_sv_files_to_compile:
-                report.timestamp_end = results_cmp_vhdl.timestamp_end
         else:
             report.vhdl_compilation_success = True
         if report.has_sv_files_to_compile:
@@ -2176,57 +2247,57 @@ class SimulatorXilinxVivado(LogicSimulator):
             else:
                 sv_file_list_path: str = str(report.sv_file_list_path)
                 sv_log_path: str = str(report.sv_log_path)
-            args = self.rmh.configuration.logic_simulation.xilinx_vivado_default_compilation_sv_arguments + [
-                defines_str,
-                f"-sv",
-                f"-f {sv_file_list_path}",
-                f"-L uvm",
-                f"--uvm_version {self.rmh.configuration.logic_simulation.uvm_version.value}",
-                f"--work {ip.lib_name}",
-                f"--log {sv_log_path}"
+            args = self.split_arguments(self.rmh.configuration.logic_simulation.xilinx_vivado_default_compilation_sv_arguments) + [
+                *defines_args,
+                "-sv",
+                "-f", sv_file_list_path,
+                "-L", "uvm",
+                "--uvm_version", self.rmh.configuration.logic_simulation.uvm_version.value,
+                "--work", ip.lib_name,
+                "--log", sv_log_path
             ]
             # Adding verbosity to Vivado for compilation causes it to hang! (Code below)
             #if self.rmh.print_trace:
-            #    args.append(f"--verbose 2")
+            #    args += ["--verbose", "2"]
             job_cmp_sv = Job(self.rmh, report.work_directory, f"vivado_sv_compilation_{ip.lib_name}",
                              Path(os.path.join(self.installation_path, "bin", "xvlog")), args)
+            job_cmp_sv.use_shell = False
+            self.declare_compilation_job_files(job_cmp_sv, report, report.work_directory / "xsim.dir",
+                                               report.sv_log_path)
             report.jobs.append(job_cmp_sv)
             if request.log_sv_cmd:
                 job_cmp_sv.write_to_file(report.sv_cmd_log_file_path)
-            results_cmp_sv = scheduler.dispatch_job(job_cmp_sv, scheduler_config)
-            report.sv_compilation_success = (results_cmp_sv.return_code == 0)
-            if not report.has_vhdl_files_to_compile:
-                report.timestamp_start = results_cmp_sv.timestamp_start
-            report.timestamp_end = results_cmp_sv.timestamp_end
         else:
             report.sv_compilation_success = True
+        self.dispatch_compilation_jobs(report, job_cmp_vhdl, job_cmp_sv, scheduler, scheduler_config)
 
     def do_elaborate(self, ip: Ip, request: LogicSimulatorElaborationRequest,
                      report: LogicSimulatorElaborationReport, scheduler: JobScheduler,
                      scheduler_config: JobSchedulerConfiguration):
-        so_str = ""
+        so_args: List[str] = []
         for so in report.shared_objects:
             so_local_copy_path: Path = self.work_path / so.name
             self.rmh.copy_file(so, so_local_copy_path)
-            so_str += f" -sv_lib {so_local_copy_path.name}"
-        top_str = ""
+            so_args += ["-sv_lib", so_local_copy_path.name]
+        top_args: List[str] = []
         for top in ip.hdl_src.top:
-            top_str = f"{top_str} {ip.lib_name}.{top}"
+            top_args.append(f"{ip.lib_name}.{top}")
         if request.use_relative_paths:
             log_path = os.path.relpath(report.log_path, request.start_path)
         else:
             log_path = report.log_path
-        args = self.rmh.configuration.logic_simulation.xilinx_vivado_default_elaboration_arguments + [
-            f"-timescale {self.rmh.configuration.logic_simulation.timescale}",
-            f"--log {log_path}",
-            f"-s {ip.lib_name}",
-            f"-L {ip.lib_name}",
-            top_str,
-            f"-sv_root {self.work_path}",
-            so_str,
+        args = self.split_arguments(self.rmh.configuration.logic_simulation.xilinx_vivado_default_elaboration_arguments) + [
+            "-timescale", self.rmh.configuration.logic_simulation.timescale,
+            "--log", str(log_path),
+            "-s", ip.lib_name,
+            "-L", ip.lib_name,
+            *top_args,
+            "-sv_root", str(self.work_path),
+            *so_args,
         ]
         job_elaborate = Job(self.rmh, report.work_directory, f"vivado_elaboration_{ip.lib_name}",
                             Path(os.path.join(self.installation_path, "bin", "xelab")), args)
+        job_elaborate.use_shell = False
         report.jobs.append(job_elaborate)
         if request.log_cmd:
             job_elaborate.write_to_file(report.cmd_log_file_path)
@@ -2244,21 +2315,21 @@ class SimulatorXilinxVivado(LogicSimulator):
     def do_simulate(self, ip: Ip, request: LogicSimulatorSimulationRequest,
                     report: LogicSimulatorSimulationReport, scheduler: JobScheduler,
                     scheduler_config: JobSchedulerConfiguration):
-        args_str = ""
+        plus_args: List[str] = []
         for arg in report.args_boolean:
-            args_str += f" -testplusarg {arg}"
+            plus_args += ["-testplusarg", arg]
         for arg in report.args_value:
-            args_str += f" -testplusarg {arg}={report.args_value[arg]}"
+            plus_args += ["-testplusarg", f"{arg}={report.args_value[arg]}"]
         if request.use_relative_paths:
             log_path = os.path.relpath(report.log_path, request.start_path)
         else:
             log_path = report.log_path
-        args = self.rmh.configuration.logic_simulation.xilinx_vivado_default_simulation_arguments + [
-            args_str,
-            f"--log {log_path}"
+        args = self.split_arguments(self.rmh.configuration.logic_simulation.xilinx_vivado_default_simulation_arguments) + [
+            *plus_args,
+            "--log", str(log_path)
         ]
         if request.gui_mode:
-            args.append(f"--gui")
+            args.append("--gui")
         if (not request.gui_mode) and request.enable_waveform_capture:
             waves_tcl_script_path: Path = report.test_results_path / "waves.vivado.tcl"
             with open(waves_tcl_script_path, 'w') as file:
@@ -2269,24 +2340,26 @@ class SimulatorXilinxVivado(LogicSimulator):
             else:
                 waveform_file_path = report.waveform_file_path
                 waves_tcl_script_path_str: str = str(waves_tcl_script_path)
-            args.append(f"-wdb {waveform_file_path}.wdb")
-            args.append(f"--tclbatch {waves_tcl_script_path_str}")
+            args += ["-wdb", f"{waveform_file_path}.wdb"]
+            args += ["--tclbatch", waves_tcl_script_path_str]
         else:
             args.append("--runall")
-            args.append("--onerror quit")
+            args += ["--onerror", "quit"]
         if request.enable_coverage:
             if request.use_relative_paths:
                 coverage_directory = os.path.relpath(report.coverage_directory, request.start_path)
             else:
                 coverage_directory = report.coverage_directory
-            args.append(f"-cov_db_name {ip.lib_name}")
-            args.append(f"-cov_db_dir {coverage_directory}")
+            args += ["-cov_db_name", ip.lib_name]
+            args += ["-cov_db_dir", str(coverage_directory)]
         else:
             args.append("-ignore_coverage")
-        args.append(f"{ip.lib_name}")
-        args.append(f"-sv_seed {request.seed}")
+        args.append(ip.lib_name)
+        args += ["-sv_seed", str(request.seed)]
         job_simulate: Job = Job(self.rmh, report.work_directory, f"vivado_simulation_{ip.lib_name}",
                                 Path(os.path.join(self.installation_path, "bin", "xsim")), args)
+        job_simulate.use_shell = False
+        job_simulate.license_tokens["xsim"] = 1
         report.jobs.append(job_simulate)
         if request.log_cmd:
             job_simulate.write_to_file(report.cmd_log_file_path)
@@ -2294,6 +2367,7 @@ class SimulatorXilinxVivado(LogicSimulator):
         report.simulation_success = (results_simulate.return_code == 0)
         report.timestamp_start = results_simulate.timestamp_start
         report.timestamp_end = results_simulate.timestamp_end
+        report.resource_usage = results_simulate.resource_usage
 
     def get_view_waves_command(self, request: LogicSimulatorSimulationRequest, report: LogicSimulatorSimulationReport):
         viewer_bin_path: Path = Path(os.path.join(self.installation_path, "bin", "xsim"))
@@ -2329,6 +2403,7 @@ class SimulatorXilinxVivado(LogicSimulator):
             job_encrypt_vhdl = Job(self.rmh, report.work_directory,
                                    f"vivado_encryption_vhdl_{ip.lib_name}",
                                    Path(os.path.join(self.installation_path, "bin", "vivado")), vhdl_args)
+            job_encrypt_vhdl.license_tokens["vivado-enc"] = 1
             results_encrypt_vhdl = scheduler.dispatch_job(job_encrypt_vhdl, scheduler_config)
             report.vhdl_encryption_success &= (results_encrypt_vhdl.return_code == 0)
             if report.vhdl_encryption_success:
@@ -2372,6 +2447,7 @@ class SimulatorXilinxVivado(LogicSimulator):
             job_encrypt_sv = Job(self.rmh, report.work_directory,
                                  f"vivado_encryption_sv_{ip.lib_name}",
                                  Path(os.path.join(self.installation_path, "bin", "vivado")), sv_args)
+            job_encrypt_sv.license_tokens["vivado-enc"] = 1
             results_encrypt_sv = scheduler.dispatch_job(job_encrypt_sv, scheduler_config)
             report.sv_encryption_success &= (results_encrypt_sv.return_code == 0)
             if report.sv_encryption_success:
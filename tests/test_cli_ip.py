@@ -40,6 +40,24 @@ class TestCliIp(TestBase):
         assert result.return_code == 0
         assert "Found 3" in result.text
 
+    @pytest.mark.core
+    def test_cli_list_ip_index(self, capsys, tmp_path):
+        test_project_path = tmp_path / "project"
+        shutil.copytree(Path(os.path.dirname(__file__)) / "data" / "project" / "valid_local_simplest", test_project_path,
+                        ignore=shutil.ignore_patterns(".mio"))
+        result = self.run_cmd(capsys, [f'--wd={test_project_path}', 'list'])
+        assert result.return_code == 0
+        assert "Found 3" in result.text
+        assert (test_project_path / ".mio" / "ip_index.json").exists()
+        next(test_project_path.rglob("ip.yml")).unlink()
+        result = self.run_cmd(capsys, [f'--wd={test_project_path}', 'list'])
+        assert result.return_code == 0
+        assert "Found 2" in result.text
+        result = self.run_cmd(capsys, [f'--wd={test_project_path}', '--rescan', 'list'])
+        assert result.return_code == 0
+        assert "Found 2" in result.text
+        assert mio_client.cli.root_manager.ip_index.num_listed_directories > 0
+
     @pytest.mark.core_single
     def test_cli_package_ip(self, capsys):
         self.reset_workspace()
@@ -1,12 +1,18 @@
 # Copyright 2020-2024 Datum Technology Corporation
 # All rights reserved.
 #######################################################################################################################
+import importlib
 import os
+import shutil
+import subprocess
+import sys
 from pathlib import Path
 
 import pytest
 
 import mio_client.cli
+import mio_client.commands.misc
+from mio_client.core.plugin_cache import PluginCache
 from .test_common import OutputCapture, TestBase
 
 
@@ -43,6 +49,98 @@ class TestCliMisc(TestBase):
         assert "Moore.io Client" in result.text
         assert mio_client.cli.VERSION in result.text
 
+    @pytest.mark.core
+    def test_cli_version_imports(self):
+        # Command modules and their dependencies must only be imported once their command has been selected
+        code = "import sys, mio_client.cli; mio_client.cli.main(['--version']); print(' '.join(sys.modules))"
+        env = {**os.environ, "PYTHONPATH": str(Path(os.path.dirname(__file__)).parent), "MIO_NO_DAEMON": "1"}
+        result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+        modules = result.stdout.split()
+        for module in ["fusesoc", "mio_client.commands.sim", "mio_client.core.root_manager", "pydantic", "requests"]:
+            assert module not in modules
+
+    @pytest.mark.core
+    def test_cli_custom_command_plugin_cache(self, tmp_path, monkeypatch):
+        plugins_path: Path = tmp_path / "mio_test_plugins"
+        plugins_path.mkdir()
+        for name in ["cmd_a", "cmd_b"]:
+            (plugins_path / f"{name}.py").write_text(
+                "from mio_client.core.command import Command\n"
+                f"class {name.upper()}(Command):\n"
+                "    @staticmethod\n"
+                f"    def name() -> str: return '{name}'\n"
+                f"def get_commands(): return [{name.upper()}]\n")
+            os.utime(plugins_path / f"{name}.py", ns=(0, 0))
+        monkeypatch.setenv("MIO_CUSTOM_COMMANDS", str(plugins_path))
+        plugin_cache = PluginCache(tmp_path / "command_plugins.json")
+        commands = mio_client.cli._discover_commands_in_paths("MIO_CUSTOM_COMMANDS", "cmd_b", plugin_cache)
+        assert sorted(command.name() for command in commands) == ["cmd_a", "cmd_b"]
+        # Only the module providing the command is imported once the modules have been recorded
+        self.forget_modules("mio_test_plugins")
+        plugin_cache = PluginCache(tmp_path / "command_plugins.json")
+        commands = mio_client.cli._discover_commands_in_paths("MIO_CUSTOM_COMMANDS", "cmd_b", plugin_cache)
+        assert [command.name() for command in commands] == ["cmd_b"]
+        assert "mio_test_plugins.cmd_a" not in sys.modules
+        self.forget_modules("mio_test_plugins")
+
+    def forget_modules(self, package_name: str):
+        for module_name in [name for name in sys.modules if name.split(".")[0] == package_name]:
+            del sys.modules[module_name]
+
+    @pytest.mark.core
+    def test_cli_command_modules(self):
+        for command_name, module_name in mio_client.cli.COMMAND_MODULES.items():
+            module = importlib.import_module(f"mio_client.commands.{module_name}")
+            assert command_name in [command.name().lower() for command in module.get_commands()]
+        assert sorted(mio_client.cli.COMMAND_MODULES) == sorted(mio_client.commands.misc.ALL_COMMANDS)
+
+    @pytest.mark.core
+    def test_cli_perf(self, capsys, tmp_path):
+        test_project_path = tmp_path / "project"
+        shutil.copytree(Path(os.path.dirname(__file__)) / "data" / "project" / "valid_local_simplest", test_project_path,
+                        ignore=shutil.ignore_patterns(".mio"))
+        result = self.run_cmd(capsys, [f'--wd={test_project_path}', 'list'])
+        assert result.return_code == 0
+        # Test runs are not recorded
+        phase_history = mio_client.cli.root_manager.phase_history
+        assert not phase_history.path.exists()
+        for index in range(2):
+            phase_history.append({"timestamp": "2025-01-01T00:00:00", "version": mio_client.cli.VERSION,
+                                  "command": "list", "success": True, "duration": 100 + index,
+                                  "phases": {"init": 1.5, "ip_discovery": 40 + index, "main": 20}})
+        result = self.run_cmd(capsys, [f'--wd={test_project_path}', 'perf', '-c', 'list'])
+        assert result.return_code == 0
+        assert "mio list: 2 run(s)" in result.text
+        assert f"v{mio_client.cli.VERSION}" in result.text
+        assert "Phase (ms)" in result.text
+        result = self.run_cmd(capsys, [f'--wd={test_project_path}', 'perf', '-c', 'sim'])
+        assert result.return_code == 0
+        assert "No runs recorded" in result.text
+
+    @pytest.mark.core
+    def test_cli_profile(self, capsys, tmp_path):
+        test_project_path = tmp_path / "project"
+        shutil.copytree(Path(os.path.dirname(__file__)) / "data" / "project" / "valid_local_simplest", test_project_path,
+                        ignore=shutil.ignore_patterns(".mio"))
+        assert mio_client.cli.attach_profile_option_value(['-C', 'wd', '--profile', 'list', '--profile']) == \
+               ['-C', 'wd', '--profile=', 'list', '--profile']
+        result = self.run_cmd(capsys, [f'--wd={test_project_path}', '--profile', 'list'])
+        assert result.return_code == 0
+        assert "Found 3" in result.text
+        profiles_path: Path = mio_client.cli.root_manager.profiler.path
+        assert profiles_path.parent == test_project_path / ".mio" / "temp" / "profiles"
+        assert (profiles_path / "run.pstats").exists()
+        assert len(list(profiles_path.glob("[0-9][0-9]_ip_discovery.pstats"))) == 1
+        assert not mio_client.cli.root_manager.phase_history.path.exists()
+        profiles_path = tmp_path / "profiles"
+        result = self.run_cmd(capsys, [f'--wd={test_project_path}', f'--profile={profiles_path}', 'list'])
+        assert result.return_code == 0
+        assert (profiles_path / "run.pstats").exists()
+        assert mio_client.cli.root_manager.profiler.path == profiles_path
+        result = self.run_cmd(capsys, [f'--wd={test_project_path}', 'list'])
+        assert result.return_code == 0
+        assert mio_client.cli.root_manager.profiler is None
+
     @pytest.mark.core
     def test_cli_help_command_help(self, capsys):
         result = self.run_cmd(capsys, ['help', 'help'])
@@ -170,6 +268,17 @@ class TestCliMisc(TestBase):
         assert "Examples" in result.text
         assert "Reference documentation" in result.text
 
+    @pytest.mark.core
+    def test_cli_help_command_perf(self, capsys):
+        result = self.run_cmd(capsys, ['help', 'perf'])
+        assert result.return_code == 0
+        assert "Moore.io" in result.text
+        assert "Performance Report Command" in result.text
+        assert "Usage" in result.text
+        assert "Options" in result.text
+        assert "Examples" in result.text
+        assert "Reference documentation" in result.text
+
     @pytest.mark.core
     def test_cli_help_command_siarx(self, capsys):
         result = self.run_cmd(capsys, ['help', 'x'])
@@ -2,6 +2,7 @@
 # All rights reserved.
 #######################################################################################################################
 import os
+from pathlib import Path
 from typing import Dict
 
 import pytest
@@ -10,6 +11,7 @@ import toml
 from .test_common import TestBase
 import mio_client.cli
 from mio_client.core.configuration import Configuration
+from mio_client.core.configuration_cache import ConfigurationCache
 
 
 def get_fixture_data(file: str) -> Dict:
@@ -38,6 +40,27 @@ class TestConfiguration(TestBase):
         config_instance = self.model_creation(Configuration, self.valid_local_1_data)
         assert isinstance(config_instance, Configuration)
 
+    @pytest.mark.core
+    def test_configuration_cache(self, tmp_path):
+        source_path: Path = tmp_path / "mio.toml"
+        source_path.write_text(toml.dumps(self.valid_local_1_data))
+        cache = ConfigurationCache(tmp_path / "configuration.cache", mio_client.cli.VERSION)
+        key = cache.get_key([source_path, None])
+        assert cache.load(key) is None
+        config_instance = self.model_creation(Configuration, self.valid_local_1_data)
+        cache.save(key, config_instance)
+        cached_config_instance = cache.load(cache.get_key([source_path, None]))
+        assert cached_config_instance == config_instance
+        # Editing, creating or deleting a source file invalidates the entry, as does a new client version
+        source_path.write_text(source_path.read_text() + "\n# Edited\n")
+        assert cache.load(cache.get_key([source_path, None])) is None
+        key = cache.get_key([source_path, None])
+        cache.save(key, config_instance)
+        assert cache.load(cache.get_key([source_path, tmp_path / "user.toml"])) is None
+        other_version_cache = ConfigurationCache(cache.path, "0.0.0")
+        assert other_version_cache.load(other_version_cache.get_key([source_path, None])) is None
+        assert cache.load(key) == config_instance
+
     @pytest.mark.core
     def test_configuration_instance_required_fields(self):
         config_instance = self.model_creation(Configuration, self.valid_sync_1_data)
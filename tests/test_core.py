@@ -2,6 +2,7 @@
 # All rights reserved.
 #######################################################################################################################
 import os
+import shutil
 from pathlib import Path
 from typing import List
 
@@ -9,8 +10,11 @@ import pytest
 from semantic_version import Version
 
 from mio_client.core.command import Command
-from mio_client.core.phase import Phase
+from mio_client.core.directory_sync import DirectorySync
+from mio_client.core.phase import Phase, PhaseHistory, get_percentile
 from mio_client.core.root_manager import RootManager
+from mio_client.core.service import ServiceType
+from mio_client.core.startup import StartupEngine
 from mio_client.services.simulation import SimulatorMetricsDSim
 from mio_client.services.simulation import SimulatorXilinxVivado
 from .test_common import OutputCapture, TestBase
@@ -201,7 +205,7 @@ class TestSimulatorDSimCommand(Command):
         self.rmh.configuration.logic_simulation.altair_dsim_installation_path = str(installation_dir)
         dsim_simulator: SimulatorMetricsDSim = SimulatorMetricsDSim(self.rmh)
         dsim_simulator.init()
-        assert dsim_simulator.is_available
+        assert dsim_simulator.is_available()
 
 
 class TestSimulatorVivadoCommand(Command):
@@ -229,7 +233,7 @@ class TestSimulatorVivadoCommand(Command):
         self.rmh.configuration.logic_simulation.xilinx_vivado_installation_path = str(installation_dir)
         vivado_simulator: SimulatorXilinxVivado = SimulatorXilinxVivado(self.rmh)
         vivado_simulator.init()
-        assert vivado_simulator.is_available
+        assert vivado_simulator.is_available()
 
 
 #######################################################################################################################
@@ -254,6 +258,149 @@ class TestCore(TestBase):
         user_home: Path = Path(os.path.join(os.path.dirname(__file__), "data", "user", "home_dirs", "valid_local_1"))
         self.run_command(TestCommand, wd, user_home)
         assert self.rmh.command.numbers == list(range(1, 45))
+        assert "main" in self.rmh.phase_durations
+
+    @pytest.mark.core
+    def test_startup_engine(self):
+        startup_engine = StartupEngine()
+        startup_engine.add_task("a", lambda: 1)
+        startup_engine.add_task("b", lambda: startup_engine.get_result("a") + 1, ["a", "phase_b"])
+        startup_engine.add_task("c", lambda: 1 / 0)
+        startup_engine.add_task("d", lambda: 4, ["c"])
+        startup_engine.add_task("e", lambda: 5, ["phase_e"])
+        startup_engine.start()
+        assert startup_engine.get_result("a") == 1
+        # Tasks are only started once all of their dependencies have finished
+        assert startup_engine.get_result("b") is None
+        startup_engine.set_finished("phase_b")
+        assert startup_engine.get_result("b") == 2
+        with pytest.raises(ZeroDivisionError):
+            startup_engine.get_result("c")
+        assert startup_engine.get_result("d") is None
+        assert startup_engine.get_result("f") is None
+        startup_engine.shutdown()
+        startup_engine.set_finished("phase_e")
+        assert startup_engine.get_result("e") is None
+
+    @pytest.mark.core
+    def test_root_manager_concurrent_startup(self):
+        wd: Path = Path(os.path.join(os.path.dirname(__file__), "data", "project", "valid_local_simplest"))
+        user_home: Path = Path(os.path.join(os.path.dirname(__file__), "data", "user", "home_dirs", "valid_local_1"))
+        results = []
+        for concurrent_startup in [False, True]:
+            self.create_root_manager(wd, user_home)
+            self.rmh.concurrent_startup = concurrent_startup
+            assert self.rmh.run(TestCommand) == 0
+            assert self.rmh.command.numbers == list(range(1, 45))
+            assert (self.rmh.startup_engine is not None) == concurrent_startup
+            results.append((self.rmh.configuration, self.rmh.user, [str(ip) for ip in self.rmh.ip_database.get_all_ip()],
+                            self.rmh.scheduler_database.get_default_scheduler().name))
+        assert results[0] == results[1]
+        # Startup tasks were consumed by their phase
+        for name in ["user_data", "configuration", "scheduler_discovery", "ip_discovery"]:
+            assert self.rmh.startup_engine.tasks[name].future.done()
+
+    @pytest.mark.core
+    def test_root_manager_concurrent_startup_cold_cache(self, capsys, tmp_path):
+        # Without a plugin cache, every scheduler is constructed during startup: this must happen on the main thread
+        wd: Path = tmp_path / "project"
+        shutil.copytree(Path(os.path.join(os.path.dirname(__file__), "data", "project", "valid_local_simplest")), wd,
+                        ignore=shutil.ignore_patterns(".mio"))
+        user_home: Path = Path(os.path.join(os.path.dirname(__file__), "data", "user", "home_dirs", "valid_local_1"))
+        self.create_root_manager(wd, user_home)
+        self.rmh.concurrent_startup = True
+        assert self.rmh.run(TestCommand) == 0
+        assert self.rmh.startup_engine.tasks["scheduler_discovery"].future.done()
+        assert self.rmh.scheduler_database.get_default_scheduler().name == "sub_process"
+        assert "has errors" not in capsys.readouterr().err
+
+    @pytest.mark.core
+    def test_root_manager_home_directory_steady_state(self, tmp_path):
+        wd: Path = Path(os.path.join(os.path.dirname(__file__), "data", "project", "valid_local_simplest"))
+        user_home: Path = tmp_path / "home"
+        self.run_command(TestCommand, wd, user_home)
+        # New users are saved, the optional user configuration file is not created
+        assert sorted(path.name for path in user_home.iterdir()) == ["user.yml"]
+        user_data_stat = os.stat(user_home / "user.yml")
+        self.run_command(TestCommand, wd, user_home)
+        assert os.stat(user_home / "user.yml").st_mtime_ns == user_data_stat.st_mtime_ns
+        assert sorted(path.name for path in user_home.iterdir()) == ["user.yml"]
+
+    @pytest.mark.core
+    def test_phase_history(self, tmp_path):
+        history = PhaseHistory(tmp_path / "phase_history.jsonl", max_file_size=1024)
+        assert history.load() == []
+        for index in range(20):
+            history.append({"command": "list", "duration": index, "phases": {"main": index}})
+        with open(history.path, "a") as file:
+            file.write('{"command": "partial\n')
+        runs = history.load()
+        # The oldest runs are dropped once the file grows too large; partially written runs are skipped
+        assert 0 < len(runs) < 20
+        assert runs[-1]["duration"] == 19
+        assert [run["duration"] for run in runs] == sorted(run["duration"] for run in runs)
+        assert get_percentile([5, 1, 3, 2, 4], 50) == 3
+        assert get_percentile([5, 1, 3, 2, 4], 90) == 5
+        assert get_percentile([7], 0) == 7
+
+    @pytest.mark.core
+    @pytest.mark.parametrize("use_hardlinks", [True, False])
+    def test_directory_sync(self, tmp_path, use_hardlinks):
+        src: Path = tmp_path / "src"
+        dst: Path = tmp_path / "dst"
+        (src / "sub").mkdir(parents=True)
+        (src / "a.txt").write_text("a")
+        (src / "sub" / "b.txt").write_text("b")
+        (src / "sub" / "c.txt").write_text("c")
+        directory_sync = DirectorySync(src, dst, use_hardlinks=use_hardlinks)
+        directory_sync.sync()
+        assert directory_sync.num_copied_files == 3
+        assert (dst / "sub" / "b.txt").read_text() == "b"
+        directory_sync.sync()
+        assert (directory_sync.num_copied_files, directory_sync.num_unchanged_files) == (0, 3)
+        # Touched but identical files are not copied again
+        os.utime(src / "a.txt")
+        directory_sync.sync()
+        assert (directory_sync.num_copied_files, directory_sync.num_unchanged_files) == (0, 3)
+        # Replaced files are copied again, removed files and directories are removed
+        os.remove(src / "a.txt")
+        (src / "a.txt").write_text("new a")
+        os.remove(src / "sub" / "c.txt")
+        (dst / "extra").mkdir()
+        (dst / "extra" / "d.txt").write_text("d")
+        directory_sync.sync()
+        assert (directory_sync.num_copied_files, directory_sync.num_removed_files) == (1, 2)
+        assert (dst / "a.txt").read_text() == "new a"
+        assert sorted(str(path.relative_to(dst)) for path in dst.rglob("*")) == ["a.txt", "sub", "sub/b.txt"]
+        # Copies edited behind the sync's back are restored
+        (src / "sub" / "b.txt").write_text("b2")
+        if not use_hardlinks:
+            (dst / "a.txt").write_text("edited")
+        directory_sync.sync()
+        assert (dst / "a.txt").read_text() == "new a"
+        assert (dst / "sub" / "b.txt").read_text() == "b2"
+
+    @pytest.mark.core
+    def test_service_database_lazy_loading(self):
+        wd: Path = Path(os.path.join(os.path.dirname(__file__), "data", "project", "valid_local_simplest"))
+        user_home: Path = Path(os.path.join(os.path.dirname(__file__), "data", "user", "home_dirs", "valid_local_1"))
+        self.run_command(TestCommand, wd, user_home)
+        service_database = self.rmh.service_database
+        assert service_database.num_loaded_services == 0
+        assert service_database.find_service(ServiceType.CODE_GENERATION, "init").name == "init"
+        assert service_database.num_loaded_services == 1
+        assert service_database.find_default_service(ServiceType.REGRESSION).name == "regression_database"
+        assert service_database.num_loaded_services == 2
+        # Explicitly requested services are returned even without a local installation (e.g. for DSim Cloud)
+        dsim = service_database.find_service(ServiceType.LOGIC_SIMULATION, "dsim")
+        assert not dsim.is_available()
+        assert self.rmh.directory_exists(dsim.work_path)
+        assert service_database.num_loaded_services == 3
+        assert [service.name for service in service_database.find_all_services_by_type(ServiceType.LOGIC_SIMULATION)] == \
+               ["dsim", "vivado"]
+        assert service_database.num_loaded_services == 4
+        with pytest.raises(Exception, match="could not be found"):
+            service_database.find_service(ServiceType.LOGIC_SIMULATION, "unknown")
 
     @pytest.mark.core
     def test_simulator_dsim_init(self):
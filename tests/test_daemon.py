@@ -0,0 +1,96 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from mio_client.core import daemon
+from mio_client.core.daemon import WarmFileCache
+from .test_common import TestBase
+
+
+@pytest.mark.skipif(not daemon.is_supported(), reason="The daemon requires a POSIX operating system")
+class TestDaemon(TestBase):
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.wd: Path = tmp_path / "project"
+        shutil.copytree(Path(os.path.dirname(__file__)) / "data" / "project" / "valid_local_simplest", self.wd,
+                        ignore=shutil.ignore_patterns(".mio"))
+        self.home: Path = tmp_path / "home"
+        self.home.mkdir()
+        self.loads: int = 0
+
+    def count_loads(self, path: str) -> str:
+        self.loads += 1
+        return Path(path).read_text()
+
+    def start_daemon(self) -> subprocess.Popen:
+        env = {**os.environ, "HOME": str(self.home), "PYTHONPATH": str(Path(os.path.dirname(__file__)).parent)}
+        process = subprocess.Popen([sys.executable, "-m", "mio_client", "-C", str(self.wd), "serve", "-t", "1"], env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 30
+        while not daemon.is_daemon_running(self.wd):
+            assert process.poll() is None
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+        return process
+
+    def run_in_daemon(self, args: [str]) -> (int, str):
+        output_path: Path = self.wd / "output.txt"
+        with open(os.devnull, "r") as stdin, open(output_path, "w") as output:
+            return_code = daemon.run_in_daemon(self.wd, ["-C", str(self.wd)] + args,
+                                               [stdin.fileno(), output.fileno(), output.fileno()])
+        return return_code, output_path.read_text()
+
+    @pytest.mark.core
+    def test_warm_file_cache(self):
+        cache = WarmFileCache()
+        file_path: Path = self.wd / "mio.toml"
+        contents = cache.load(file_path, self.count_loads)
+        assert cache.load(file_path, self.count_loads) == contents
+        assert self.loads == 1
+        file_path.write_text(contents + "\n# Edited\n")
+        assert cache.load(file_path, self.count_loads).endswith("# Edited\n")
+        assert self.loads == 2
+        # Files added to tracked directories are loaded ahead of time, deleted ones are forgotten
+        cache.track_directory(self.wd, "new.txt", self.count_loads)
+        (self.wd / "dir_a" / "new.txt").write_text("new")
+        cache.refresh()
+        assert self.loads == 3
+        assert cache.load(self.wd / "dir_a" / "new.txt", self.count_loads) == "new"
+        assert self.loads == 3
+        (self.wd / "dir_a" / "new.txt").unlink()
+        cache.refresh()
+        assert cache.num_entries == 1
+
+    @pytest.mark.core
+    def test_daemon(self):
+        assert daemon.run_in_daemon(self.wd, ["list"]) is None
+        process = self.start_daemon()
+        try:
+            return_code, text = self.run_in_daemon(["list"])
+            assert return_code == 0
+            assert "Found 3 IP(s)" in text
+            assert "ABC Block" in text
+            # Edits are picked up by the next invocation
+            ip_file_path: Path = next(self.wd.rglob("ip.yml"))
+            ip_file_contents = ip_file_path.read_text()
+            for name in ["ABC Block", "DEF Sub-System TB", "DEF Sub-System"]:
+                ip_file_contents = ip_file_contents.replace(name, "Edited IP")
+            ip_file_path.write_text(ip_file_contents)
+            return_code, text = self.run_in_daemon(["list"])
+            assert return_code == 0
+            assert "Edited IP" in text
+            return_code, text = self.run_in_daemon(["not_a_command"])
+            assert return_code != 0
+        finally:
+            assert daemon.stop_daemon(self.wd)
+            process.wait(timeout=10)
+        assert not daemon.get_socket_path(self.wd).exists()
+        assert daemon.run_in_daemon(self.wd, ["list"]) is None
@@ -1,7 +1,10 @@
 # Copyright 2020-2024 Datum Technology Corporation
 # All rights reserved.
 #######################################################################################################################
+import copy
 import os
+from pathlib import Path
+from types import SimpleNamespace
 from typing import Dict
 
 import pytest
@@ -9,7 +12,9 @@ import yaml
 from semantic_version import SimpleSpec
 
 from .test_common import TestBase
-from mio_client.core.ip import Ip
+import mio_client.core.ip
+from mio_client.core.ip import Ip, IpDataBase
+from mio_client.core.ip_index import IpIndex
 
 
 def get_fixture_data(file: str) -> Dict:
@@ -33,6 +38,96 @@ class TestIp(TestBase):
         self.valid_local_dv_agent_1_data = valid_local_dv_agent_1_data
         self.valid_local_dv_tb_fsoc_1_data = valid_local_dv_tb_fsoc_1_data
 
+    def walk_ip_files(self, path: Path) -> [str]:
+        return [os.path.join(root, "ip.yml") for root, dirs, files in os.walk(path) if "ip.yml" in files]
+
+    def age_directories(self, path: Path):
+        for root, dirs, files in os.walk(path):
+            os.utime(root, ns=(0, 0))
+
+    @pytest.mark.core
+    def test_ip_index(self, tmp_path):
+        root: Path = tmp_path / "ip"
+        for directory in ["a", "a/b", "c", "c/d/e"]:
+            (root / directory).mkdir(parents=True)
+            (root / directory / "ip.yml").write_text("")
+        (root / "a" / "other.yml").write_text("")
+        (root / "link").symlink_to(root / "c")
+        self.age_directories(root)
+        index = IpIndex(tmp_path / "ip_index.json")
+        assert index.find_ip_files(root) == self.walk_ip_files(root)
+        assert index.num_listed_directories == 6
+        index.save()
+        # Unchanged directories are not listed again
+        index = IpIndex(tmp_path / "ip_index.json")
+        assert index.find_ip_files(root) == self.walk_ip_files(root)
+        assert index.num_listed_directories == 0
+        # Only directories with added/removed entries are listed again
+        (root / "c" / "d" / "e" / "ip.yml").unlink()
+        (root / "a" / "f").mkdir()
+        (root / "a" / "f" / "ip.yml").write_text("")
+        assert index.find_ip_files(root) == self.walk_ip_files(root)
+        assert index.num_listed_directories == 3
+        # Recently modified directories are listed again on the next run
+        index.save()
+        index = IpIndex(tmp_path / "ip_index.json")
+        assert index.find_ip_files(root) == self.walk_ip_files(root)
+        assert index.num_listed_directories == 3
+        index.clear()
+        self.age_directories(root)
+        assert index.find_ip_files(root) == self.walk_ip_files(root)
+        assert index.num_listed_directories == 10
+        assert index.find_ip_files(tmp_path / "missing") == []
+
+    @pytest.mark.core
+    def test_load_ip_files_parallel(self, monkeypatch):
+        ip_files = [str(path) for path in sorted((Path(os.path.dirname(__file__)) / "data").rglob("ip.yml"))]
+        serial_results = IpDataBase(None).load_ip_files(ip_files)
+        monkeypatch.setattr(mio_client.core.ip, "MIN_IP_FILES_PER_WORKER", 1)
+        monkeypatch.setattr(os, "cpu_count", lambda: 2)
+        parallel_results = IpDataBase(None).load_ip_files(ip_files)
+        assert len(parallel_results) == len(ip_files)
+        assert parallel_results == serial_results
+        assert [str(ip_model.file_path) for ip_model, errors in parallel_results if ip_model] == \
+               [file for file, (ip_model, errors) in zip(ip_files, serial_results) if ip_model]
+
+    def create_agent(self, vendor: str, version: str, sync_id: int=0) -> Ip:
+        data = copy.deepcopy(self.valid_local_dv_agent_1_data)
+        data["ip"]["vendor"] = vendor
+        data["ip"]["version"] = version
+        if sync_id:
+            data["ip"]["sync"] = True
+            data["ip"]["sync_id"] = sync_id
+        return self.model_creation(Ip, data)
+
+    @pytest.mark.core
+    def test_ip_database_lookups(self):
+        ip_database = IpDataBase(SimpleNamespace(debug=lambda message: None))
+        ip_1_0_0 = self.create_agent("acme", "1.0.0")
+        ip_2_1_0 = self.create_agent("acme", "2.1.0", sync_id=7)
+        ip_1_5_0 = self.create_agent("acme", "1.5.0")
+        ip_other_2_1_0 = self.create_agent("other", "2.1.0+build.1")
+        for ip in [ip_1_0_0, ip_2_1_0, ip_1_5_0, ip_other_2_1_0]:
+            ip_database.add_ip(ip)
+        # The highest matching version is returned, the earliest added one among identical versions
+        assert ip_database.find_ip("uvma_abc") is ip_2_1_0
+        assert ip_database.find_ip("uvma_abc", "other") is ip_other_2_1_0
+        assert ip_database.find_ip("uvma_abc", "acme", SimpleSpec("<2.0.0")) is ip_1_5_0
+        assert ip_database.find_ip("uvma_abc", "acme", SimpleSpec(">3.0.0"), raise_exception_if_not_found=False) is None
+        with pytest.raises(ValueError):
+            ip_database.find_ip("uvma_xyz")
+        assert ip_database.find_ip_version("uvma_abc", "*", ip_1_5_0.ip.version) is ip_1_5_0
+        assert ip_database.find_ip_version("uvma_abc", "other", ip_2_1_0.ip.version) is ip_other_2_1_0
+        assert ip_database.find_ip_version("uvma_abc", "acme", ip_other_2_1_0.ip.version) is ip_2_1_0
+        assert ip_database.find_ip_version("uvma_abc", "other", ip_1_0_0.ip.version) is None
+        assert ip_database.find_ip_by_sync_id(7) is ip_2_1_0
+        # Removed IPs are no longer found
+        ip_database.remove_ip(ip_2_1_0)
+        assert ip_database.find_ip("uvma_abc") is ip_other_2_1_0
+        assert ip_database.find_ip("uvma_abc", "acme") is ip_1_5_0
+        assert ip_database.find_ip_by_sync_id(7, raise_exception_if_not_found=False) is None
+        assert ip_database.num_ips == 3
+
     @pytest.mark.core
     def test_agent_instance_creation(self):
         ip_instance = self.model_creation(Ip, self.valid_local_dv_agent_1_data)
@@ -0,0 +1,62 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+from typing import List
+
+import pytest
+
+from mio_client.services.regression import SimulationDurationHistory
+from mio_client.services.simulation import LogicSimulatorSimulationRequest
+from .test_common import TestBase
+
+
+class TestRegression(TestBase):
+    def create_sim_request(self, test_name: str, args_boolean: List[str]=None) -> LogicSimulatorSimulationRequest:
+        request = LogicSimulatorSimulationRequest()
+        request.target = "default"
+        request.test_name = test_name
+        request.args_boolean = args_boolean if args_boolean else []
+        request.args_value = {"SEED": "1"}
+        return request
+
+    @pytest.mark.core
+    def test_duration_history_key(self):
+        key_a = SimulationDurationHistory.get_key("uvmt_a", self.create_sim_request("smoke", ["B", "A"]))
+        key_b = SimulationDurationHistory.get_key("uvmt_a", self.create_sim_request("smoke", ["A", "B"]))
+        key_c = SimulationDurationHistory.get_key("uvmt_a", self.create_sim_request("smoke", ["A"]))
+        assert key_a == key_b
+        assert key_a != key_c
+
+    @pytest.mark.core
+    def test_duration_history_record(self):
+        history = SimulationDurationHistory()
+        history.record("a", 10)
+        assert history.predict("a", 0) == 10
+        history.record("a", 20)
+        assert history.predict("a", 0) == 15
+        assert history.predict("b", 3) == 3
+
+    @pytest.mark.core
+    def test_duration_history_order_longest_first(self):
+        history = SimulationDurationHistory()
+        short = self.create_sim_request("short")
+        long = self.create_sim_request("long")
+        medium = self.create_sim_request("medium")
+        unseen = self.create_sim_request("unseen")
+        history.record(SimulationDurationHistory.get_key("ip", short), 10)
+        history.record(SimulationDurationHistory.get_key("ip", long), 100)
+        history.record(SimulationDurationHistory.get_key("ip", medium), 30)
+        ordered = history.order_longest_first("ip", [short, unseen, medium, long])
+        # Unseen simulations are predicted at the average (~46s)
+        assert ordered == [long, unseen, medium, short]
+
+    @pytest.mark.core
+    def test_duration_history_persistence(self, tmp_path):
+        file_path = tmp_path / "regression_durations.yml"
+        history = SimulationDurationHistory.load(file_path)
+        assert history.durations == {}
+        history.record("a", 12.5)
+        history.save()
+        assert SimulationDurationHistory.load(file_path).durations == {"a": 12.5}
+        file_path.write_text("{not yaml")
+        assert SimulationDurationHistory.load(file_path).durations == {}
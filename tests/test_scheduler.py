@@ -0,0 +1,662 @@
+# Copyright 2020-2025 Datum Technology Corporation
+# All rights reserved.
+#######################################################################################################################
+import os
+import stat
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from mio_client.core.root_manager import RootManager
+from mio_client.core.scheduler import Job, JobSet, JobSchedulerConfiguration, JobResults, JobSchedulerDatabase, \
+    JobOutputSink, JobAdmissionController, JobResultCache, JobGraph, \
+    JobResourceUsage
+from mio_client.schedulers.async_process import AsyncProcessScheduler
+from mio_client.schedulers.batch import SlurmScheduler
+from mio_client.schedulers.ssh import SshScheduler
+from mio_client.schedulers.sub_process import SubProcessScheduler
+from .test_common import TestBase
+
+
+#######################################################################################################################
+# Stand-in SLURM commands
+#######################################################################################################################
+FAKE_SBATCH = """#!/bin/sh
+# Runs the job (or every task of the job array) in the background and reports job ID 4242
+script=""
+array=""
+for arg in "$@"; do
+    case "$arg" in
+        --array=*) array="${arg#--array=}" ;;
+        --*) ;;
+        *) script="$arg" ;;
+    esac
+done
+echo "$@" > "$FAKE_SLURM_DIR/sbatch_args"
+touch "$FAKE_SLURM_DIR/4242.running"
+(
+    if [ -n "$array" ]; then
+        last="${array#1-}"
+        last="${last%%%*}"
+        i=1
+        while [ "$i" -le "$last" ]; do
+            SLURM_ARRAY_TASK_ID=$i /bin/sh "$script"
+            i=$((i + 1))
+        done
+    else
+        /bin/sh "$script"
+    fi
+    rm "$FAKE_SLURM_DIR/4242.running"
+) > /dev/null 2>&1 &
+echo "4242;cluster"
+"""
+
+FAKE_SQUEUE = """#!/bin/sh
+if [ -e "$FAKE_SLURM_DIR/4242.running" ]; then
+    echo "RUNNING"
+fi
+"""
+
+FAKE_SCANCEL = """#!/bin/sh
+echo "$1" >> "$FAKE_SLURM_DIR/scancel_args"
+"""
+
+
+#######################################################################################################################
+# Stand-in SSH transport: runs the remote command locally and records per-host concurrency
+#######################################################################################################################
+FAKE_SSH = """#!/bin/sh
+while [ "$1" = "-o" ]; do
+    shift 2
+done
+host="$1"
+shift
+if [ "$1" = "-O" ]; then
+    echo "$host" >> "$FAKE_SSH_DIR/closed"
+    exit 0
+fi
+mkdir "$FAKE_SSH_DIR/active.$host.$$"
+ls -d "$FAKE_SSH_DIR"/active."$host".* | wc -l >> "$FAKE_SSH_DIR/concurrency.$host"
+# Like sshd, run the command in a new session
+setsid -w /bin/sh -c "$1"
+code=$?
+rmdir "$FAKE_SSH_DIR/active.$host.$$"
+exit $code
+"""
+
+
+#######################################################################################################################
+# Tests
+#######################################################################################################################
+class TestScheduler(TestBase):
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.wd: Path = tmp_path
+        user_home: Path = Path(os.path.join(os.path.dirname(__file__), "data", "user", "home_dirs", "valid_local_1"))
+        self.rmh: RootManager = RootManager("Test Root Manager", self.wd, True, user_home)
+
+    def install_fake_slurm(self, monkeypatch) -> Path:
+        bin_path: Path = self.wd / "fake_slurm"
+        bin_path.mkdir()
+        for name, contents in [("sbatch", FAKE_SBATCH), ("squeue", FAKE_SQUEUE), ("scancel", FAKE_SCANCEL)]:
+            file_path = bin_path / name
+            file_path.write_text(contents)
+            file_path.chmod(file_path.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv("PATH", f"{bin_path}:{os.environ['PATH']}")
+        monkeypatch.setenv("FAKE_SLURM_DIR", str(bin_path))
+        return bin_path
+
+    def create_slurm_scheduler(self) -> SlurmScheduler:
+        scheduler = SlurmScheduler(self.rmh)
+        scheduler.poll_interval = 0.1
+        return scheduler
+
+    def install_fake_ssh(self, monkeypatch) -> Path:
+        bin_path: Path = self.wd / "fake_ssh"
+        bin_path.mkdir()
+        file_path = bin_path / "ssh"
+        file_path.write_text(FAKE_SSH)
+        file_path.chmod(file_path.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv("PATH", f"{bin_path}:{os.environ['PATH']}")
+        monkeypatch.setenv("FAKE_SSH_DIR", str(bin_path))
+        return bin_path
+
+    def create_job_set(self, name: str, commands: List[str]) -> JobSet:
+        job_set = JobSet(self.rmh, name)
+        for index, command in enumerate(commands):
+            job = Job(self.rmh, self.wd, f"{name}_{index}", Path("/bin/sh"), ["-c", f"'{command}'"])
+            job_set.add_task(job)
+        return job_set
+
+    def create_configuration(self, max_number_of_parallel_processes: int) -> JobSchedulerConfiguration:
+        configuration = JobSchedulerConfiguration(self.rmh)
+        configuration.output_to_terminal = False
+        configuration.max_number_of_parallel_processes = max_number_of_parallel_processes
+        return configuration
+
+    @pytest.mark.core
+    def test_sub_process_job_set_results_in_order(self):
+        scheduler = SubProcessScheduler(self.rmh)
+        job_set = self.create_job_set("codes", [f"exit {code}" for code in range(4)])
+        results: List[JobResults] = scheduler.dispatch_job_set(job_set, self.create_configuration(2))
+        assert len(results) == 4
+        assert [result.return_code for result in results] == [0, 1, 2, 3]
+        assert all(job.is_part_of_set for job in job_set.tasks)
+        assert len(scheduler.jobs_dispatched) == 4
+        assert len(scheduler.jobs_in_progress) == 0
+
+    @pytest.mark.core
+    def test_sub_process_job_set_parallel(self):
+        scheduler = SubProcessScheduler(self.rmh)
+        job_set = self.create_job_set("sleep", ["sleep 1"] * 4)
+        start = datetime.now()
+        results: List[JobResults] = scheduler.dispatch_job_set(job_set, self.create_configuration(4))
+        duration = (datetime.now() - start).total_seconds()
+        assert all(result.return_code == 0 for result in results)
+        assert duration < 3
+
+    @pytest.mark.core
+    def test_sub_process_job_set_bounded(self):
+        scheduler = SubProcessScheduler(self.rmh)
+        job_set = self.create_job_set("sleep", ["sleep 1"] * 2)
+        start = datetime.now()
+        scheduler.dispatch_job_set(job_set, self.create_configuration(1))
+        duration = (datetime.now() - start).total_seconds()
+        assert duration >= 2
+
+    @pytest.mark.core
+    def test_async_process_job(self):
+        scheduler = AsyncProcessScheduler(self.rmh)
+        job = Job(self.rmh, self.wd, "echo", Path("/bin/sh"), ["-c", "'echo hello; exit 3'"])
+        results: JobResults = scheduler.dispatch_job(job, self.create_configuration(1))
+        assert results.return_code == 3
+        assert "hello" in results.stdout
+        assert len(scheduler.jobs_in_progress) == 0
+
+    @pytest.mark.core
+    def test_async_process_job_set_parallel(self):
+        scheduler = AsyncProcessScheduler(self.rmh)
+        job_set = self.create_job_set("sleep", ["sleep 1; exit 1"] + ["sleep 1"] * 7)
+        start = datetime.now()
+        results: List[JobResults] = scheduler.dispatch_job_set(job_set, self.create_configuration(8))
+        duration = (datetime.now() - start).total_seconds()
+        assert [result.return_code for result in results] == [1] + [0] * 7
+        assert duration < 3
+        assert len(scheduler.jobs_dispatched) == 8
+        assert len(scheduler.jobs_in_progress) == 0
+
+    @pytest.mark.core
+    def test_scheduler_discovery(self):
+        database = JobSchedulerDatabase(self.rmh)
+        database.discover_schedulers()
+        assert database.find_scheduler("sub_process").name == "sub_process"
+        assert database.find_scheduler("async_process").name == "async_process"
+        assert database.get_default_scheduler().name == "sub_process"
+
+    @pytest.mark.core
+    def test_scheduler_discovery_cache(self):
+        self.rmh.md.mkdir()
+        database = JobSchedulerDatabase(self.rmh)
+        database.discover_schedulers()
+        assert database.num_loaded_schedulers >= 2
+        assert (self.rmh.md / "scheduler_plugins.json").exists()
+        # Cached schedulers are only constructed once they are looked up
+        database = JobSchedulerDatabase(self.rmh)
+        database.discover_schedulers()
+        assert database.num_loaded_schedulers == 0
+        assert database.find_scheduler("async_process").name == "async_process"
+        assert database.num_loaded_schedulers == 1
+        assert database.get_default_scheduler().name == "sub_process"
+        assert database.num_loaded_schedulers == 2
+        with pytest.raises(Exception):
+            database.find_scheduler("not_a_scheduler")
+
+    @pytest.mark.core
+    def test_sub_process_large_output_is_streamed(self):
+        scheduler = SubProcessScheduler(self.rmh)
+        # Far more than a pipe buffer on both streams: must not deadlock
+        job = Job(self.rmh, self.wd, "chatty", Path("/bin/sh"),
+                  ["-c", "'yes a | head -c 1000000; yes b | head -c 1000000 1>&2; echo done'"])
+        configuration = self.create_configuration(1)
+        configuration.output_tail_size = 1024
+        results: JobResults = scheduler.dispatch_job(job, configuration)
+        assert results.return_code == 0
+        assert len(results.stdout) == 1024
+        assert results.stdout.endswith("a\ndone\n")
+        assert len(results.stderr) == 1024
+        assert set(results.stderr) == {"b", "\n"}
+        assert results.stdout_log_path.stat().st_size == 1000005
+        assert results.stderr_log_path.stat().st_size == 1000000
+
+    @pytest.mark.core
+    def test_async_process_large_output_is_streamed(self):
+        scheduler = AsyncProcessScheduler(self.rmh)
+        job = Job(self.rmh, self.wd, "chatty", Path("/bin/sh"), ["-c", "'head -c 1000000 /dev/zero; echo done'"])
+        configuration = self.create_configuration(1)
+        configuration.output_tail_size = 16
+        results: JobResults = scheduler.dispatch_job(job, configuration)
+        assert results.return_code == 0
+        assert len(results.stdout) == 16
+        assert results.stdout.endswith("done\n")
+        assert results.stdout_log_path.stat().st_size == 1000005
+
+    @pytest.mark.core
+    def test_output_sink_rotation(self):
+        log_path: Path = self.wd / "sink.log"
+        sink = JobOutputSink(log_path, max_log_size=10, max_log_count=2, tail_size=4)
+        for chunk in [b"0123456789", b"abcdefghij", b"ABCDEFGHIJ", b"xyz"]:
+            sink.write(chunk)
+        sink.close()
+        assert sink.tail == "Jxyz"
+        assert log_path.read_bytes() == b"xyz"
+        assert (self.wd / "sink.log.1").read_bytes() == b"ABCDEFGHIJ"
+        assert (self.wd / "sink.log.2").read_bytes() == b"abcdefghij"
+        assert not (self.wd / "sink.log.3").exists()
+
+    @pytest.mark.core
+    def test_slurm_availability(self, monkeypatch):
+        monkeypatch.setenv("PATH", str(self.wd))
+        assert not SlurmScheduler(self.rmh).is_available()
+        self.install_fake_slurm(monkeypatch)
+        assert SlurmScheduler(self.rmh).is_available()
+        database = JobSchedulerDatabase(self.rmh)
+        database.discover_schedulers()
+        assert database.find_scheduler("slurm").name == "slurm"
+
+    @pytest.mark.core
+    def test_slurm_job(self, monkeypatch):
+        fake_slurm_path: Path = self.install_fake_slurm(monkeypatch)
+        scheduler = self.create_slurm_scheduler()
+        job = Job(self.rmh, self.wd, "slurm_job", Path("/bin/sh"), ["-c", "'sleep 0.5; echo $MY_VAR; exit 5'"])
+        job.env_vars = {"MY_VAR": "hello from slurm"}
+        results: JobResults = scheduler.dispatch_job(job, self.create_configuration(1))
+        assert results.return_code == 5
+        assert "hello from slurm" in results.stdout
+        assert results.stdout_log_path.exists()
+        sbatch_args: str = (fake_slurm_path / "sbatch_args").read_text()
+        assert "--job-name=slurm_job" in sbatch_args
+        assert "--array" not in sbatch_args
+
+    @pytest.mark.core
+    def test_slurm_job_set_array(self, monkeypatch):
+        fake_slurm_path: Path = self.install_fake_slurm(monkeypatch)
+        scheduler = self.create_slurm_scheduler()
+        job_set = self.create_job_set("slurm_array", [f"echo task{code}; exit {code}" for code in range(3)])
+        results: List[JobResults] = scheduler.dispatch_job_set(job_set, self.create_configuration(2))
+        assert [result.return_code for result in results] == [0, 1, 2]
+        assert [result.stdout.strip() for result in results] == ["task0", "task1", "task2"]
+        assert "--array=1-3%2" in (fake_slurm_path / "sbatch_args").read_text()
+        assert len(scheduler.jobs_dispatched) == 3
+        assert len(scheduler.jobs_in_progress) == 0
+
+    @pytest.mark.core
+    def test_slurm_job_lost(self, monkeypatch):
+        fake_slurm_path: Path = self.install_fake_slurm(monkeypatch)
+        # Job leaves the queue without writing its exit code (ex: killed by the cluster)
+        (fake_slurm_path / "squeue").write_text("#!/bin/sh\nexit 1\n")
+        scheduler = self.create_slurm_scheduler()
+        job = Job(self.rmh, self.wd, "lost", Path("/bin/sh"), ["-c", "'sleep 5'"])
+        results: JobResults = scheduler.dispatch_job(job, self.create_configuration(1))
+        assert results.return_code != 0
+
+    @pytest.mark.core
+    def test_ssh_job(self, monkeypatch):
+        self.install_fake_ssh(monkeypatch)
+        scheduler = SshScheduler(self.rmh)
+        assert not scheduler.is_available()
+        scheduler.hosts = {"ws01": 2}
+        assert scheduler.is_available()
+        job = Job(self.rmh, self.wd, "ssh_job", Path("/bin/sh"), ["-c", "'echo $MY_VAR in $(pwd); exit 4'"])
+        job.env_vars = {"MY_VAR": "hello"}
+        results: JobResults = scheduler.dispatch_job(job, self.create_configuration(1))
+        assert results.return_code == 4
+        assert f"hello in {self.wd}" in results.stdout
+
+    @pytest.mark.core
+    def test_ssh_job_set_slots(self, monkeypatch):
+        fake_ssh_path: Path = self.install_fake_ssh(monkeypatch)
+        scheduler = SshScheduler(self.rmh)
+        scheduler.hosts = {"ws01": 1, "ws02": 2}
+        job_set = self.create_job_set("spread", ["sleep 0.5"] * 6)
+        start = datetime.now()
+        results: List[JobResults] = scheduler.dispatch_job_set(job_set, self.create_configuration(10))
+        duration = (datetime.now() - start).total_seconds()
+        assert all(result.return_code == 0 for result in results)
+        assert duration < 2.5
+        for host, slots in scheduler.hosts.items():
+            concurrency = [int(line) for line in (fake_ssh_path / f"concurrency.{host}").read_text().split()]
+            assert max(concurrency) <= slots
+        scheduler.cleanup()
+        assert sorted((fake_ssh_path / "closed").read_text().split()) == ["ws01", "ws02"]
+
+    @pytest.mark.core
+    def test_ssh_job_pinned_to_host(self, monkeypatch):
+        fake_ssh_path: Path = self.install_fake_ssh(monkeypatch)
+        scheduler = SshScheduler(self.rmh)
+        scheduler.hosts = {"ws01": 4, "ws02": 4}
+        job = Job(self.rmh, self.wd, "pinned", Path("/bin/true"), [])
+        job.hostname = "ws02"
+        results: JobResults = scheduler.dispatch_job(job, self.create_configuration(1))
+        assert results.return_code == 0
+        assert (fake_ssh_path / "concurrency.ws02").exists()
+        assert not (fake_ssh_path / "concurrency.ws01").exists()
+
+    @pytest.mark.core
+    def test_ssh_job_timeout_terminates_remote_job(self, monkeypatch):
+        self.install_fake_ssh(monkeypatch)
+        scheduler = SshScheduler(self.rmh)
+        scheduler.hosts = {"ws01": 1}
+        job = Job(self.rmh, self.wd, "hung", Path("/bin/sh"), ["-c", "'sleep 60 & echo $! > child.pid; wait'"])
+        configuration = self.create_configuration(1)
+        configuration.timeout = 0.02
+        start = datetime.now()
+        results: JobResults = scheduler.dispatch_job(job, configuration)
+        assert (datetime.now() - start).total_seconds() < 10
+        assert "timed out" in results.termination_reason
+        assert results.return_code != 0
+        assert not self.is_process_alive(int((self.wd / "child.pid").read_text()))
+        assert len(scheduler._results_in_progress) == 0
+        # Interrupted jobs are terminated as well
+        (self.wd / "child.pid").unlink()
+        dispatch = threading.Thread(target=scheduler.dispatch_job, args=(job, self.create_configuration(1)))
+        dispatch.start()
+        self.wait_for_file(self.wd / "child.pid")
+        scheduler.cleanup()
+        dispatch.join(timeout=10)
+        assert not dispatch.is_alive()
+        assert not self.is_process_alive(int((self.wd / "child.pid").read_text()))
+
+    @pytest.mark.core
+    def test_admission_controller(self):
+        controller = JobAdmissionController(cpu_slots=4, memory=16, license_tokens={"dsim": 2})
+        job_a = Job(self.rmh, self.wd, "a", Path("/bin/true"), [])
+        job_a.cpu_slots = 2
+        job_a.memory = 8
+        job_a.license_tokens = {"dsim": 1}
+        job_b = Job(self.rmh, self.wd, "b", Path("/bin/true"), [])
+        job_b.memory = 10
+        job_c = Job(self.rmh, self.wd, "c", Path("/bin/true"), [])
+        job_c.license_tokens = {"dsim": 2, "unlimited": 100}
+        controller.acquire(job_a)
+        assert not controller.fits(job_b)
+        assert controller.fits(job_b, local_resources=False)
+        assert not controller.fits(job_c)
+        controller.release(job_a)
+        assert controller.fits(job_b)
+        assert controller.fits(job_c)
+        job_d = Job(self.rmh, self.wd, "d", Path("/bin/true"), [])
+        job_d.license_tokens = {"dsim": 3}
+        with pytest.raises(Exception):
+            controller.acquire(job_d)
+
+    @pytest.mark.core
+    @pytest.mark.parametrize("scheduler_class", [SubProcessScheduler, AsyncProcessScheduler])
+    def test_license_tokens_limit_concurrency(self, scheduler_class):
+        scheduler = scheduler_class(self.rmh)
+        scheduler.admission_controller = JobAdmissionController(license_tokens={"dsim": 2})
+        job_set = self.create_job_set("licensed", ["sleep 0.5"] * 4)
+        for job in job_set.tasks:
+            job.license_tokens = {"dsim": 1}
+        start = datetime.now()
+        results: List[JobResults] = scheduler.dispatch_job_set(job_set, self.create_configuration(4))
+        duration = (datetime.now() - start).total_seconds()
+        assert all(result.return_code == 0 for result in results)
+        assert duration >= 1
+        assert duration < 1.9
+
+    def create_cached_job(self, command: str) -> Job:
+        job = Job(self.rmh, self.wd, "cached", Path("/bin/sh"), ["-c", f"'echo run >> runs.txt; {command}'"])
+        job.input_file_lists = [Path("src.flist")]
+        job.output_files = [Path("lib")]
+        return job
+
+    def count_runs(self) -> int:
+        return len((self.wd / "runs.txt").read_text().split())
+
+    @pytest.mark.core
+    def test_job_result_cache(self):
+        (self.wd / "src" / "inc").mkdir(parents=True)
+        (self.wd / "src" / "a.sv").write_text("module a; endmodule")
+        (self.wd / "src" / "inc" / "defs.svh").write_text("`define A 1")
+        (self.wd / "src.flist").write_text("# Comment\n+define+B=2\n+incdir+src/inc\nsrc/a.sv\n")
+        scheduler = SubProcessScheduler(self.rmh)
+        scheduler.job_result_cache = JobResultCache(self.wd / "cache")
+        configuration = self.create_configuration(1)
+        configuration.use_job_cache = True
+        command = "mkdir -p lib; cat src/a.sv > lib/a.o; echo compiled"
+        results: JobResults = scheduler.dispatch_job(self.create_cached_job(command), configuration)
+        assert results.return_code == 0
+        # Unchanged inputs: replayed
+        results = scheduler.dispatch_job(self.create_cached_job(command), configuration)
+        assert results.return_code == 0
+        assert "compiled" in results.stdout
+        assert self.count_runs() == 1
+        # Missing outputs are restored from the cache
+        (self.wd / "lib" / "a.o").unlink()
+        scheduler.dispatch_job(self.create_cached_job(command), configuration)
+        assert self.count_runs() == 1
+        assert (self.wd / "lib" / "a.o").read_text() == "module a; endmodule"
+        # Files referenced by the file list are inputs, including those in include directories
+        (self.wd / "src" / "inc" / "defs.svh").write_text("`define A 2")
+        scheduler.dispatch_job(self.create_cached_job(command), configuration)
+        assert self.count_runs() == 2
+        (self.wd / "src" / "a.sv").write_text("module b; endmodule")
+        scheduler.dispatch_job(self.create_cached_job(command), configuration)
+        assert self.count_runs() == 3
+        assert (self.wd / "lib" / "a.o").read_text() == "module b; endmodule"
+        # Command line is part of the key
+        scheduler.dispatch_job(self.create_cached_job(f"{command}; true"), configuration)
+        assert self.count_runs() == 4
+        # Cache is opt-in
+        configuration.use_job_cache = False
+        scheduler.dispatch_job(self.create_cached_job(command), configuration)
+        assert self.count_runs() == 5
+
+    @pytest.mark.core
+    def test_job_result_cache_skips_failures(self):
+        (self.wd / "src.flist").write_text("")
+        scheduler = SubProcessScheduler(self.rmh)
+        scheduler.job_result_cache = JobResultCache(self.wd / "cache", max_entries=1)
+        configuration = self.create_configuration(1)
+        configuration.use_job_cache = True
+        for _ in range(2):
+            results: JobResults = scheduler.dispatch_job(self.create_cached_job("exit 2"), configuration)
+            assert results.return_code == 2
+        assert self.count_runs() == 2
+        # Jobs with missing inputs are run, not cached
+        job = self.create_cached_job("true")
+        job.input_files = [Path("missing.sv")]
+        assert scheduler.dispatch_job(job, configuration).return_code == 0
+        assert not (self.wd / "cache").exists()
+        scheduler.dispatch_job(self.create_cached_job("true"), configuration)
+        scheduler.dispatch_job(self.create_cached_job("true; true"), configuration)
+        assert len(list((self.wd / "cache").iterdir())) == 1
+
+    def create_graph_job(self, name: str, command: str) -> Job:
+        return Job(self.rmh, self.wd, name, Path("/bin/sh"), ["-c", f"'{command}; echo {name} >> order.txt'"])
+
+    @pytest.mark.core
+    @pytest.mark.parametrize("scheduler_class", [SubProcessScheduler, AsyncProcessScheduler])
+    def test_job_graph(self, scheduler_class):
+        scheduler = scheduler_class(self.rmh)
+        # Compilation of two libraries, then their elaboration, then two simulations per image
+        job_graph = JobGraph(self.rmh, "pipeline")
+        compile_a = self.create_graph_job("compile_a", "sleep 0.2")
+        compile_b = self.create_graph_job("compile_b", "sleep 1")
+        elaborate_a = self.create_graph_job("elaborate_a", "sleep 0.2")
+        elaborate_b = self.create_graph_job("elaborate_b", "sleep 0.2")
+        simulations = [self.create_graph_job(f"simulate_{name}", "sleep 0.2") for name in ["a0", "a1", "b0", "b1"]]
+        job_graph.add_task(compile_a)
+        job_graph.add_task(compile_b)
+        job_graph.add_task(elaborate_a, [compile_a])
+        job_graph.add_task(elaborate_b, [compile_b])
+        for simulation in simulations[:2]:
+            job_graph.add_task(simulation, [elaborate_a])
+        for simulation in simulations[2:]:
+            job_graph.add_task(simulation, [elaborate_b])
+        results: List[JobResults] = scheduler.dispatch_job_graph(job_graph, self.create_configuration(4))
+        assert all(result.return_code == 0 for result in results)
+        order: List[str] = (self.wd / "order.txt").read_text().split()
+        # Image 'a' is simulated while library 'b' is still compiling
+        assert order.index("simulate_a0") < order.index("compile_b")
+        assert order.index("simulate_a1") < order.index("compile_b")
+        for simulation in ["simulate_b0", "simulate_b1"]:
+            assert order.index("elaborate_b") < order.index(simulation)
+        assert len(scheduler.jobs_in_progress) == 0
+
+    @pytest.mark.core
+    def test_job_graph_failure_skips_dependents(self):
+        scheduler = SubProcessScheduler(self.rmh)
+        job_graph = JobGraph(self.rmh, "failing")
+        compile_job = self.create_graph_job("compile", "exit 1")
+        unrelated_job = self.create_graph_job("unrelated", "true")
+        elaborate_job = self.create_graph_job("elaborate", "true")
+        simulate_job = self.create_graph_job("simulate", "true")
+        job_graph.add_task(compile_job)
+        job_graph.add_task(unrelated_job)
+        job_graph.add_task(elaborate_job, [compile_job])
+        job_graph.add_task(simulate_job, [elaborate_job, unrelated_job])
+        results: List[JobResults] = scheduler.dispatch_job_graph(job_graph, self.create_configuration(2))
+        assert results[0].return_code == 1
+        assert results[1].return_code == 0
+        assert results[2] is None
+        assert results[3] is None
+        assert sorted((self.wd / "order.txt").read_text().split()) == ["unrelated"]
+
+    @pytest.mark.core
+    def test_job_graph_dependencies_must_be_added_first(self):
+        job_graph = JobGraph(self.rmh, "invalid")
+        compile_job = self.create_graph_job("compile", "true")
+        elaborate_job = self.create_graph_job("elaborate", "true")
+        with pytest.raises(Exception):
+            job_graph.add_task(elaborate_job, [compile_job])
+
+    @pytest.mark.core
+    def test_sub_process_resource_usage(self):
+        scheduler = SubProcessScheduler(self.rmh)
+        # Busy for ~0.3s and holding 64MiB
+        script = "import time; b = bytearray(64 * 1024 * 1024); end = time.process_time() + 0.3\nwhile time.process_time() < end: pass"
+        job = Job(self.rmh, self.wd, "busy", Path(sys.executable), ["-c", f"'{script}'"])
+        results: JobResults = scheduler.dispatch_job(job, self.create_configuration(1))
+        assert results.return_code == 0
+        assert results.resource_usage.cpu_time >= 0.25
+        assert results.resource_usage.max_rss >= 64 * 1024
+        assert results.resource_usage.voluntary_context_switches + results.resource_usage.involuntary_context_switches > 0
+
+    @pytest.mark.core
+    def test_resource_usage_aggregation(self):
+        total = JobResourceUsage()
+        for user_cpu_time, max_rss in [(1.5, 1000), (2.5, 3000), (1, 2000)]:
+            usage = JobResourceUsage()
+            usage.user_cpu_time = user_cpu_time
+            usage.system_cpu_time = 0.5
+            usage.max_rss = max_rss
+            usage.block_output_operations = 10
+            total.add(usage)
+        assert total.cpu_time == 6.5
+        assert total.max_rss == 3000
+        assert total.as_dict()["block_output_operations"] == 30
+
+    def is_process_alive(self, pid: int) -> bool:
+        # Orphans may linger as zombies if nothing reaps them: those count as dead
+        try:
+            with open(f"/proc/{pid}/stat") as stat_file:
+                return stat_file.read().split(")")[-1].split()[0] not in ["Z", "X"]
+        except FileNotFoundError:
+            return False
+
+    def wait_for_file(self, path: Path, timeout: float=5):
+        deadline = time.monotonic() + timeout
+        while (not path.exists()) or (path.read_text().strip() == ""):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+    @pytest.mark.core
+    @pytest.mark.parametrize("scheduler_class", [SubProcessScheduler, AsyncProcessScheduler])
+    def test_timeout_terminates_process_tree(self, scheduler_class):
+        scheduler = scheduler_class(self.rmh)
+        # The shell waits on a grandchild, as it does for simulators started from a script
+        job = Job(self.rmh, self.wd, "hung", Path("/bin/sh"), ["-c", "'sleep 60 & echo $! > child.pid; wait'"])
+        configuration = self.create_configuration(1)
+        configuration.timeout = 0.02
+        start = datetime.now()
+        results: JobResults = scheduler.dispatch_job(job, configuration)
+        assert (datetime.now() - start).total_seconds() < 10
+        assert results.was_terminated
+        assert "timed out" in results.termination_reason
+        assert results.return_code != 0
+        assert not self.is_process_alive(int((self.wd / "child.pid").read_text()))
+
+    @pytest.mark.core
+    @pytest.mark.parametrize("scheduler_class", [SubProcessScheduler, AsyncProcessScheduler])
+    def test_idle_watchdog(self, scheduler_class):
+        scheduler = scheduler_class(self.rmh)
+        configuration = self.create_configuration(1)
+        configuration.idle_timeout = 0.02
+        job = Job(self.rmh, self.wd, "silent", Path("/bin/sh"), ["-c", "'echo started; sleep 60'"])
+        start = datetime.now()
+        results: JobResults = scheduler.dispatch_job(job, configuration)
+        assert (datetime.now() - start).total_seconds() < 10
+        assert "no output" in results.termination_reason
+        assert results.return_code != 0
+        assert "started" in results.stdout
+        # Output that keeps growing is not idle, even if the job outlives the idle timeout
+        job = Job(self.rmh, self.wd, "chatty", Path("/bin/sh"),
+                  ["-c", "'for i in 1 2 3 4 5 6 7 8; do echo $i; sleep 0.25; done'"])
+        results = scheduler.dispatch_job(job, configuration)
+        assert not results.was_terminated
+        assert results.return_code == 0
+
+    @pytest.mark.core
+    def test_cleanup_terminates_process_tree(self):
+        scheduler = SubProcessScheduler(self.rmh)
+        job = Job(self.rmh, self.wd, "hung", Path("/bin/sh"), ["-c", "'sleep 60 & echo $! > child.pid; wait'"])
+        dispatch = threading.Thread(target=scheduler.dispatch_job, args=(job, self.create_configuration(1)))
+        dispatch.start()
+        self.wait_for_file(self.wd / "child.pid")
+        scheduler.cleanup()
+        dispatch.join(timeout=10)
+        assert not dispatch.is_alive()
+        assert not self.is_process_alive(int((self.wd / "child.pid").read_text()))
+        assert len(scheduler._results_in_progress) == 0
+
+    def create_direct_job(self) -> Job:
+        bin_path: Path = self.wd / "bin"
+        bin_path.mkdir(exist_ok=True)
+        script_path = bin_path / "print_args"
+        script_path.write_text("#!/bin/sh\nfor arg in \"$@\"; do echo \"[$arg]\"; done\n")
+        script_path.chmod(script_path.stat().st_mode | stat.S_IEXEC)
+        job = Job(self.rmh, self.wd, "direct", Path("print_args"), ["a b", "$HOME", "'quoted'", "+define+X=\"1\""])
+        job.use_shell = False
+        job.pre_path = str(bin_path)
+        return job
+
+    @pytest.mark.core
+    @pytest.mark.parametrize("scheduler_class", [SubProcessScheduler, AsyncProcessScheduler])
+    def test_direct_job(self, scheduler_class):
+        scheduler = scheduler_class(self.rmh)
+        job = self.create_direct_job()
+        results: JobResults = scheduler.dispatch_job(job, self.create_configuration(1))
+        assert results.return_code == 0
+        # Arguments reach the binary untouched: no word splitting, expansion or quote removal
+        assert results.stdout.splitlines() == ["[a b]", "[$HOME]", "['quoted']", "[+define+X=\"1\"]"]
+
+    @pytest.mark.core
+    def test_direct_job_command_line(self, monkeypatch):
+        job = self.create_direct_job()
+        assert str(job) == "print_args 'a b' '$HOME' ''\"'\"'quoted'\"'\"'' '+define+X=\"1\"'"
+        with pytest.raises(Exception):
+            job.get_argv("/nonexistent")
+        # Remote schedulers still go through a shell: the quoted command line must survive it
+        self.install_fake_ssh(monkeypatch)
+        scheduler = SshScheduler(self.rmh)
+        scheduler.hosts = {"ws01": 1}
+        job = Job(self.rmh, self.wd, "direct_ssh", self.wd / "bin" / "print_args", job.arguments)
+        job.use_shell = False
+        results: JobResults = scheduler.dispatch_job(job, self.create_configuration(1))
+        assert results.stdout.splitlines() == ["[a b]", "[$HOME]", "['quoted']", "[+define+X=\"1\"]"]
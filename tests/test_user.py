@@ -50,3 +50,18 @@ class TestUser(TestBase):
         assert hasattr(config_instance, 'authenticated')
         assert hasattr(config_instance, 'username')
 
+
+    @pytest.mark.core
+    def test_user_save_only_when_dirty(self, tmp_path):
+        file_path = tmp_path / "home" / "user.yml"
+        user = User.new()
+        assert user.dirty
+        user.save(file_path)
+        assert not user.dirty
+        assert list(file_path.parent.iterdir()) == [file_path]
+        user = User.load(file_path)
+        assert not user.dirty
+        user.session_cookies["csrftoken"] = "abc"
+        assert user.dirty
+        user.save(file_path)
+        assert User.load(file_path).session_cookies == {"csrftoken": "abc"}